@@ -619,11 +619,9 @@ def run(
                         )
 
                 console.print("[cyan]...다음 단계를 계획합니다...[/cyan]")
-                endpoint = "/agent/decide_and_act"
+                endpoint = "/agent/replan"
                 request_data = {
                     "conversation_id": convo_id,
-                    "history": history,
-                    "user_input": None,
                     "model_preference": model_pref,
                     "system_prompts": prompt_contents,
                 }
@@ -1699,7 +1697,7 @@ def prompt_list():
     """등록된 시스템 프롬프트 목록 표시."""
     from orchestrator import agent_config_manager as acm
 
-    prompts = acm.list_system_prompts()
+    prompts = acm.list_system_prompts(include_content=False)
     if not prompts:
         console.print("[yellow]등록된 시스템 프롬프트가 없습니다.[/yellow]")
         return
@@ -2047,7 +2045,7 @@ def workflow_add_step(
     except json.JSONDecodeError as e:
         console.print(f"[bold red]오류: --args JSON 파싱 실패: {e}[/bold red]")
         raise typer.Exit(code=1)
-    steps = wf["steps"]
+    steps = list(wf["steps"])
     new_step = {
         "order": len(steps) + 1,
         "type": step_type,
@@ -3,26 +3,186 @@
 # orchestrator/agent_config_manager.py
 """에이전트 설정 관리 모듈 — 시스템 프롬프트, 스킬, 매크로, 워크플로우, 페르소나."""
 
-import json
 import logging
+import os
 import re
-from datetime import datetime
-from .constants import utcnow
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from .constants import CONFIG_VERSION_CHECK_SEC, utcnow
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
-from .graph_manager import DB_PATH, get_db
+from .graph_manager import DB_PATH
+from .json_codec import dumps as _dumps, loads as _loads
 
+try:  # 선택 의존성 — 설치 시 키워드 매칭을 단일 패스로 수행
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # ── 인메모리 프롬프트 캐시 ────────────────────────────────────────
 _PROMPT_CACHE: dict[str, str] = {}
 
 
+# ── 영속 연결 캐시 ────────────────────────────────────────────────
+# 설정 조회는 요청마다 반복되므로 경로별 연결 1개를 재사용한다.
+# sqlite3.Connection은 스레드 안전하지 않으므로 연결마다 RLock으로 직렬화.
+# 읽기 캐시 적중은 이 잠금을 거치지 않으므로 직렬화되는 것은 캐시 미스와 쓰기뿐이다.
+_CONN_CACHE: Dict[str, sqlite3.Connection] = {}
+_CONN_LOCKS: Dict[str, threading.RLock] = {}
+_CONN_CACHE_LOCK = threading.Lock()
+_SCHEMA_READY: set = set()
+
+
+def _conn(path: Path) -> sqlite3.Connection:
+    """경로별 캐시된 연결을 반환합니다. 최초 1회만 연결·PRAGMA 설정."""
+    key = str(path)
+    conn = _CONN_CACHE.get(key)
+    if conn is not None:
+        return conn
+    with _CONN_CACHE_LOCK:
+        conn = _CONN_CACHE.get(key)
+        if conn is None:
+            # 문장 캐시 확장 — 반복되는 조회/갱신 SQL의 재파싱 방지
+            conn = sqlite3.connect(key, check_same_thread=False, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-64000")
+            conn.row_factory = sqlite3.Row
+            _CONN_LOCKS[key] = threading.RLock()
+            _CONN_CACHE[key] = conn
+    return conn
+
+
+def close_all() -> None:
+    """캐시된 연결을 모두 닫고 같은 경로로 키잉된 캐시를 비웁니다 (서버 종료·테스트 정리용)."""
+    with _CONN_CACHE_LOCK:
+        conns = list(_CONN_CACHE.items())
+        _CONN_CACHE.clear()
+    for key, conn in conns:
+        lock = _CONN_LOCKS.pop(key, None)
+        if lock is not None:
+            with lock:
+                conn.close()
+        else:
+            conn.close()
+        _SCHEMA_READY.discard(key)
+        _READ_CACHE.pop(key, None)
+        _DATA_VERSION.pop(key, None)
+        _VERSION_CHECKED_AT.pop(key, None)
+
+
+@contextmanager
+def _get_db(path: Path = DB_PATH):
+    """graph_manager.get_db와 같은 커밋/롤백 의미를 갖되 연결을 닫지 않는다."""
+    conn = _conn(path)
+    key = str(path)
+    with _CONN_LOCKS[key]:
+        if key not in _SCHEMA_READY:
+            # 재귀 방지를 위해 먼저 표시한 뒤 스키마 확인 (실패 시 _ensure_schema가 해제)
+            _SCHEMA_READY.add(key)
+            _ensure_schema(conn, path)
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+# ── 설정 읽기 캐시 ────────────────────────────────────────────────
+# 페르소나·매크로 등은 읽기 위주이므로 경로별로 파싱 결과를 보관한다.
+# 이 모듈의 변경 함수는 _invalidate()로, 다른 연결(CLI 등)의 커밋은
+# config_version 행 변화로 감지하여 무효화한다. 설정 테이블의 트리거만 이 값을
+# 올리므로, 같은 DB 파일의 대화·사용 로그 쓰기로는 캐시가 비워지지 않는다.
+# 버전 확인은 CONFIG_VERSION_CHECK_SEC 간격으로만 하므로 적중 시에는 SQL을 실행하지 않는다.
+_READ_CACHE: Dict[str, Dict[tuple, Any]] = {}
+_DATA_VERSION: Dict[str, int] = {}
+_VERSION_CHECKED_AT: Dict[str, float] = {}
+_READ_CACHE_MAX = 128
+_MISS = object()
+
+
+def _invalidate(db_path: Path = DB_PATH) -> None:
+    """해당 DB 경로의 읽기 캐시를 비웁니다."""
+    path_key = str(db_path)
+    _READ_CACHE.pop(path_key, None)
+    # 방금 변경으로 오른 버전을 다음 조회에서 다시 읽는다 (캐시를 한 번 더 비우지 않도록)
+    _DATA_VERSION.pop(path_key, None)
+
+
+def _freeze(value: Any) -> Any:
+    """캐시 보관용 읽기 전용 사본 — dict는 MappingProxyType, list는 tuple로."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _cached(key: tuple, db_path: Path, loader) -> Any:
+    """캐시 적중 시 저장된 값을, 미스 시 loader(conn) 결과를 저장 후 반환.
+
+    값은 _freeze()로 읽기 전용이 되므로 호출자가 캐시를 오염시킬 수 없다.
+    """
+    path_key = str(db_path)
+    cache = _READ_CACHE.get(path_key)
+    if (
+        cache is not None
+        and time.monotonic() - _VERSION_CHECKED_AT.get(path_key, 0.0) < CONFIG_VERSION_CHECK_SEC
+    ):
+        value = cache.get(key, _MISS)
+        if value is not _MISS:
+            return value
+    with _get_db(db_path) as conn:
+        row = conn.execute("SELECT version FROM config_version WHERE id=1").fetchone()
+        version = row[0] if row else None
+        _VERSION_CHECKED_AT[path_key] = time.monotonic()
+        if _DATA_VERSION.get(path_key) != version:
+            _DATA_VERSION[path_key] = version
+            _READ_CACHE.pop(path_key, None)
+        cache = _READ_CACHE.setdefault(path_key, {})
+        value = cache.get(key, _MISS)
+        if value is _MISS:
+            value = _freeze(loader(conn))
+            if len(cache) >= _READ_CACHE_MAX:
+                cache.pop(next(iter(cache)))
+            cache[key] = value
+    return value
+
+
+@lru_cache(maxsize=64)
+def _update_sql(table: str, fields: tuple) -> str:
+    """필드 조합별 UPDATE 문을 한 번만 만들어 동일 문자열을 재사용합니다."""
+    return f"UPDATE {table} SET {', '.join(fields)} WHERE name=?"
+
+
 # ── DB 초기화 ─────────────────────────────────────────────────────
 
+def _replace_persona_keywords(conn, persona_id: int, keywords: List[str]) -> None:
+    """persona_keywords를 소문자 키워드로 교체합니다 (personas.keywords와 동기)."""
+    conn.execute("DELETE FROM persona_keywords WHERE persona_id=?", (persona_id,))
+    conn.executemany(
+        "INSERT INTO persona_keywords (persona_id, kw) VALUES (?, ?)",
+        [(persona_id, kw.lower()) for kw in keywords],
+    )
+
+
+# 읽기 캐시 대상 테이블 — 변경 트리거가 config_version을 올린다
+_CONFIG_TABLES = (
+    "system_prompts", "skills", "skill_macros", "workflows", "personas", "persona_keywords",
+)
+
+
 def init_db(path: Path = DB_PATH) -> None:
-    """에이전트 설정 5개 테이블을 IF NOT EXISTS로 생성."""
-    with get_db(path) as conn:
+    """에이전트 설정 6개 테이블을 IF NOT EXISTS로 생성."""
+    with _get_db(path) as conn:
         conn.executescript("""
         CREATE TABLE IF NOT EXISTS system_prompts (
             id          INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -85,13 +245,69 @@ def init_db(path: Path = DB_PATH) -> None:
             created_at        TEXT    NOT NULL,
             updated_at        TEXT    NOT NULL
         );
+
+        CREATE TABLE IF NOT EXISTS persona_keywords (
+            persona_id  INTEGER NOT NULL REFERENCES personas(id) ON DELETE CASCADE,
+            kw          TEXT    NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_persona_keywords_pid ON persona_keywords(persona_id);
+        """)
+        # 기본값은 최대 1개 — 부분 UNIQUE 인덱스 생성 전에 중복 기본값을 정리한다
+        conn.execute(
+            """
+            UPDATE system_prompts SET is_default=0
+            WHERE is_default=1
+              AND id != (SELECT MIN(id) FROM system_prompts WHERE is_default=1)
+            """
+        )
+        conn.execute(
+            """
+            UPDATE personas SET is_default=0
+            WHERE is_default=1
+              AND name != (SELECT MIN(name) FROM personas WHERE is_default=1)
+            """
+        )
+        conn.executescript("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_system_prompts_default
+            ON system_prompts(is_default) WHERE is_default=1;
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_personas_default
+            ON personas(is_default) WHERE is_default=1;
+
+        CREATE TABLE IF NOT EXISTS config_version (
+            id      INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0
+        );
+        INSERT OR IGNORE INTO config_version (id, version) VALUES (1, 0);
         """)
+        # 설정 테이블 변경 시에만 config_version을 올린다 (읽기 캐시 무효화 기준)
+        for table in _CONFIG_TABLES:
+            for op in ("INSERT", "UPDATE", "DELETE"):
+                conn.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_cfgver_{table}_{op.lower()}
+                    AFTER {op} ON {table}
+                    BEGIN
+                        UPDATE config_version SET version = version + 1 WHERE id = 1;
+                    END
+                    """
+                )
+        # 기존 personas.keywords JSON → persona_keywords 백필 (키워드 행이 없는 페르소나만)
+        missing = conn.execute(
+            """
+            SELECT id, keywords FROM personas
+            WHERE keywords != '[]'
+              AND id NOT IN (SELECT DISTINCT persona_id FROM persona_keywords)
+            """
+        ).fetchall()
+        for r in missing:
+            _replace_persona_keywords(conn, r["id"], _loads(r["keywords"]))
 
 
 # ── 프롬프트 시드 데이터 ─────────────────────────────────────────
 
 _DEFAULT_PROMPTS: List[tuple] = [
     # (name, prompt_type, description, content)
+    # 템플릿은 고정 부분을 앞에, 턴마다 바뀌는 이력은 끝에 두어 LLM 측 프롬프트 접두사 캐시가 재사용되게 한다
     (
         "react_planner_system",
         "system",
@@ -111,9 +327,6 @@ _DEFAULT_PROMPTS: List[tuple] = [
 ## 사용 가능한 도구 목록:
 {tool_descriptions}
 
-## 이전 대화 요약 (매우 중요!):
-{formatted_history}
-
 ## 지시사항 (필독!):
 1. '최종 목표'와 '이전 대화 요약'을 면밀히 분석합니다.
 2. '이전 대화 요약'에 "실행 결과"가 있다면, 그 결과를 **입력으로 사용**하여 **다음에 실행할 논리적인 1개의 '실행 그룹(ExecutionGroup)'**을 만드세요.
@@ -144,6 +357,9 @@ _DEFAULT_PROMPTS: List[tuple] = [
 # 예시 2: 모든 작업 완료 시
 []
 
+## 이전 대화 요약 (매우 중요!):
+{formatted_history}
+
 ## 다음 실행 계획 (JSON):""",
     ),
     (
@@ -426,7 +642,7 @@ Python 코드만 반환하세요:""",
 def _seed_default_prompts(db_path: Path = DB_PATH) -> None:
     """기본 프롬프트 22개를 INSERT OR IGNORE로 삽입합니다 (멱등성 보장)."""
     now = utcnow()
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         for name, prompt_type, description, content in _DEFAULT_PROMPTS:
             conn.execute(
                 """
@@ -436,6 +652,7 @@ def _seed_default_prompts(db_path: Path = DB_PATH) -> None:
                 """,
                 (name, content, description, prompt_type, now, now),
             )
+        _invalidate(db_path)
 
 
 def get_prompt(name: str, db_path: Path = DB_PATH) -> str:
@@ -455,16 +672,31 @@ def render_prompt(name: str, db_path: Path = DB_PATH, **kwargs) -> str:
     return content.format_map(kwargs)
 
 
-# ── 자동 초기화 ──────────────────────────────────────────────────
-try:
-    init_db()
-except Exception as _e:
-    logging.warning(f"agent_config_manager DB 자동 초기화 실패: {_e}")
+# ── 지연 초기화 ──────────────────────────────────────────────────
+# 임포트 시점이 아니라 경로별 첫 _get_db() 사용 시 1회 실행된다.
+# 프로브 대상은 init_db가 마지막으로 만드는 스키마 객체 — 스키마 추가 시 함께 갱신.
+_SCHEMA_PROBE = "trg_cfgver_persona_keywords_delete"
+
 
-try:
-    _seed_default_prompts()
-except Exception as _e:
-    logging.warning(f"agent_config_manager 프롬프트 시드 실패: {_e}")
+def _ensure_schema(conn: sqlite3.Connection, path: Path) -> None:
+    """스키마가 없거나 구버전이면 init_db를, 기본 DB면 프롬프트 시드를 실행합니다."""
+    try:
+        present = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name=?", (_SCHEMA_PROBE,)
+        ).fetchone()
+        if not present:
+            init_db(path)
+    except Exception as e:
+        # 일시적 실패(database is locked 등)가 영구화되지 않도록 다음 호출에서 재시도
+        _SCHEMA_READY.discard(str(path))
+        logging.warning(f"agent_config_manager DB 자동 초기화 실패: {e}")
+        return
+
+    if str(path) == str(DB_PATH):
+        try:
+            _seed_default_prompts(path)
+        except Exception as e:
+            logging.warning(f"agent_config_manager 프롬프트 시드 실패: {e}")
 
 
 # ── 시스템 프롬프트 CRUD ─────────────────────────────────────────
@@ -478,7 +710,7 @@ def create_system_prompt(
 ) -> int:
     """시스템 프롬프트 생성. is_default=True면 기존 기본값 해제 후 설정."""
     now = utcnow()
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         if is_default:
             conn.execute("UPDATE system_prompts SET is_default=0 WHERE is_default=1")
         cur = conn.execute(
@@ -488,30 +720,39 @@ def create_system_prompt(
             """,
             (name, content, description, int(is_default), now, now),
         )
+        _invalidate(db_path)
         return cur.lastrowid
 
 
-def get_system_prompt(name: str, db_path: Path = DB_PATH) -> Optional[Dict]:
-    with get_db(db_path) as conn:
+def get_system_prompt(name: str, db_path: Path = DB_PATH) -> Optional[Mapping[str, Any]]:
+    def _load(conn):
         row = conn.execute(
             "SELECT * FROM system_prompts WHERE name=?", (name,)
         ).fetchone()
         return dict(row) if row else None
+    return _cached(("system_prompt", name), db_path, _load)
 
 
-def get_default_system_prompt(db_path: Path = DB_PATH) -> Optional[Dict]:
-    with get_db(db_path) as conn:
+def get_default_system_prompt(db_path: Path = DB_PATH) -> Optional[Mapping[str, Any]]:
+    def _load(conn):
         row = conn.execute(
             "SELECT * FROM system_prompts WHERE is_default=1 LIMIT 1"
         ).fetchone()
         return dict(row) if row else None
+    return _cached(("default_system_prompt",), db_path, _load)
 
 
-def list_system_prompts(db_path: Path = DB_PATH) -> List[Dict]:
-    with get_db(db_path) as conn:
-        rows = conn.execute(
-            "SELECT * FROM system_prompts ORDER BY is_default DESC, name"
-        ).fetchall()
+def list_system_prompts(db_path: Path = DB_PATH, include_content: bool = True) -> List[Dict]:
+    """시스템 프롬프트 목록. include_content=False면 큰 content 컬럼을 읽지 않는다."""
+    if include_content:
+        sql = "SELECT * FROM system_prompts ORDER BY is_default DESC, name"
+    else:
+        sql = (
+            "SELECT id, name, description, is_default, prompt_type, created_at, updated_at "
+            "FROM system_prompts ORDER BY is_default DESC, name"
+        )
+    with _get_db(db_path) as conn:
+        rows = conn.execute(sql).fetchall()
         return [dict(r) for r in rows]
 
 
@@ -523,13 +764,16 @@ def update_system_prompt(
     db_path: Path = DB_PATH,
 ) -> bool:
     now = utcnow()
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         existing = conn.execute(
             "SELECT id FROM system_prompts WHERE name=?", (name,)
         ).fetchone()
         if not existing:
             return False
         if is_default is True:
+            # 해제 → 설정 순서 필수: 부분 UNIQUE 인덱스는 행 단위로 검사되므로
+            # CASE 한 문장으로 뒤집으면 새 기본값이 먼저 갱신될 때 충돌한다.
+            # 해제는 idx_system_prompts_default 인덱스로 한 행만 찾는다.
             conn.execute("UPDATE system_prompts SET is_default=0 WHERE is_default=1")
         fields = ["updated_at=?"]
         params: List[Any] = [now]
@@ -542,18 +786,23 @@ def update_system_prompt(
         if is_default is not None:
             fields.append("is_default=?")
             params.append(int(is_default))
+        if len(fields) == 1:
+            # 변경 필드 없음 — updated_at만 바꾸는 UPDATE는 생략
+            return True
         params.append(name)
         conn.execute(
-            f"UPDATE system_prompts SET {', '.join(fields)} WHERE name=?", params
+            _update_sql("system_prompts", tuple(fields)), params
         )
         _PROMPT_CACHE.pop(name, None)
+        _invalidate(db_path)
         return True
 
 
 def delete_system_prompt(name: str, db_path: Path = DB_PATH) -> bool:
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         cur = conn.execute("DELETE FROM system_prompts WHERE name=?", (name,))
         _PROMPT_CACHE.pop(name, None)
+        _invalidate(db_path)
         return cur.rowcount > 0
 
 
@@ -563,27 +812,36 @@ def migrate_prompts_from_files(
 ) -> int:
     """system_prompts/*.txt → system_prompts 테이블. INSERT OR IGNORE (멱등). 마이그레이션 수 반환."""
     imported = 0
+    now = utcnow()
     prompts_path = Path(prompts_dir)
     if not prompts_path.exists():
         logging.warning(f"프롬프트 디렉토리가 없습니다: {prompts_dir}")
         return 0
 
-    for txt_file in sorted(prompts_path.glob("*.txt")):
-        name = txt_file.stem
+    # os.scandir — DirEntry의 캐시된 타입 정보로 추가 stat 없이 필터링
+    with os.scandir(prompts_path) as it:
+        entries = sorted(
+            (e for e in it if e.name.endswith(".txt") and e.is_file()),
+            key=lambda e: e.name,
+        )
+
+    files = []
+    for entry in entries:
         try:
-            content = txt_file.read_text(encoding="utf-8")
+            with open(entry.path, "rb") as f:
+                content = f.read().decode("utf-8")
         except Exception as e:
-            logging.warning(f"파일 읽기 실패 {txt_file}: {e}")
+            logging.warning(f"파일 읽기 실패 {entry.path}: {e}")
             continue
+        files.append((entry.name[:-len(".txt")], entry.name, content))
 
-        is_default = name == "default"
-        now = utcnow()
-        with get_db(db_path) as conn:
-            existing = conn.execute(
-                "SELECT id FROM system_prompts WHERE name=?", (name,)
-            ).fetchone()
-            if existing:
+    # 전체 파일을 단일 트랜잭션으로 임포트
+    with _get_db(db_path) as conn:
+        existing = {name for (name,) in conn.execute("SELECT name FROM system_prompts")}
+        for name, filename, content in files:
+            if name in existing:
                 continue
+            is_default = name == "default"
             if is_default:
                 conn.execute("UPDATE system_prompts SET is_default=0 WHERE is_default=1")
             conn.execute(
@@ -591,9 +849,11 @@ def migrate_prompts_from_files(
                 INSERT INTO system_prompts (name, content, description, is_default, created_at, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                (name, content, f"파일에서 임포트: {txt_file.name}", int(is_default), now, now),
+                (name, content, f"파일에서 임포트: {filename}", int(is_default), now, now),
             )
-        imported += 1
+            imported += 1
+        if imported:
+            _invalidate(db_path)
 
     return imported
 
@@ -607,31 +867,26 @@ def sync_skills_from_registry(db_path: Path = DB_PATH) -> int:
     _load_local_modules()
 
     now = utcnow()
-    added = 0
-    updated = 0
+    rows = [(name, desc, now, now) for name, desc in TOOL_DESCRIPTIONS.items()]
 
-    for tool_name, description in TOOL_DESCRIPTIONS.items():
-        with get_db(db_path) as conn:
-            existing = conn.execute(
-                "SELECT id FROM skills WHERE name=?", (tool_name,)
-            ).fetchone()
-            if existing:
-                conn.execute(
-                    "UPDATE skills SET description=?, synced_at=? WHERE name=?",
-                    (description, now, tool_name),
-                )
-                updated += 1
-            else:
-                conn.execute(
-                    """
-                    INSERT INTO skills (name, source, description, is_active, created_at, synced_at)
-                    VALUES (?, 'local', ?, 1, ?, ?)
-                    """,
-                    (tool_name, description, now, now),
-                )
-                added += 1
+    # 단일 트랜잭션 UPSERT — 도구 수와 무관하게 커밋 1회
+    with _get_db(db_path) as conn:
+        existing = {name for (name,) in conn.execute("SELECT name FROM skills")}
+        conn.executemany(
+            """
+            INSERT INTO skills (name, source, description, is_active, created_at, synced_at)
+            VALUES (?, 'local', ?, 1, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                description=excluded.description,
+                synced_at=excluded.synced_at
+            """,
+            rows,
+        )
+        _invalidate(db_path)
 
-    total = len(TOOL_DESCRIPTIONS)
+    total = len(rows)
+    updated = sum(1 for name in TOOL_DESCRIPTIONS if name in existing)
+    added = total - updated
     logging.info(
         f"스킬 동기화 완료: 신규 {added}개 추가, 기존 {updated}개 갱신 "
         f"(전체 {total}개 처리)"
@@ -640,7 +895,7 @@ def sync_skills_from_registry(db_path: Path = DB_PATH) -> int:
 
 
 def list_skills(active_only: bool = True, db_path: Path = DB_PATH) -> List[Dict]:
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         if active_only:
             rows = conn.execute(
                 "SELECT * FROM skills WHERE is_active=1 ORDER BY name"
@@ -653,21 +908,32 @@ def list_skills(active_only: bool = True, db_path: Path = DB_PATH) -> List[Dict]
 
 
 def get_skill(name: str, db_path: Path = DB_PATH) -> Optional[Dict]:
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         row = conn.execute("SELECT * FROM skills WHERE name=?", (name,)).fetchone()
         return dict(row) if row else None
 
 
 def set_skill_active(name: str, active: bool, db_path: Path = DB_PATH) -> bool:
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         cur = conn.execute(
             "UPDATE skills SET is_active=? WHERE name=?", (int(active), name)
         )
+        _invalidate(db_path)
         return cur.rowcount > 0
 
 
 # ── 스킬 매크로 CRUD ─────────────────────────────────────────────
 
+_VAR_RE = re.compile(r'\{\{(\w+)\}\}')
+
+
+def _extract_variables(template: str) -> List[str]:
+    """템플릿에서 {{var}} 변수명을 추출합니다. '{{'가 없으면 정규식 생략."""
+    if "{{" not in template:
+        return []
+    return _VAR_RE.findall(template)
+
+
 def create_macro(
     name: str,
     template: str,
@@ -677,36 +943,38 @@ def create_macro(
 ) -> int:
     """스킬 매크로 생성. variables 미제공 시 {{var}} 패턴으로 자동 추출."""
     if variables is None:
-        variables = re.findall(r'\{\{(\w+)\}\}', template)
+        variables = _extract_variables(template)
     now = utcnow()
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         cur = conn.execute(
             """
             INSERT INTO skill_macros (name, description, template, variables, created_at, updated_at)
             VALUES (?, ?, ?, ?, ?, ?)
             """,
-            (name, description, template, json.dumps(variables, ensure_ascii=False), now, now),
+            (name, description, template, _dumps(variables), now, now),
         )
+        _invalidate(db_path)
         return cur.lastrowid
 
 
-def get_macro(name: str, db_path: Path = DB_PATH) -> Optional[Dict]:
-    with get_db(db_path) as conn:
+def get_macro(name: str, db_path: Path = DB_PATH) -> Optional[Mapping[str, Any]]:
+    def _load(conn):
         row = conn.execute("SELECT * FROM skill_macros WHERE name=?", (name,)).fetchone()
         if not row:
             return None
         d = dict(row)
-        d["variables"] = json.loads(d["variables"])
+        d["variables"] = _loads(d["variables"])
         return d
+    return _cached(("macro", name), db_path, _load)
 
 
 def list_macros(db_path: Path = DB_PATH) -> List[Dict]:
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         rows = conn.execute("SELECT * FROM skill_macros ORDER BY name").fetchall()
         result = []
         for r in rows:
             d = dict(r)
-            d["variables"] = json.loads(d["variables"])
+            d["variables"] = _loads(d["variables"])
             result.append(d)
         return result
 
@@ -719,7 +987,7 @@ def update_macro(
     db_path: Path = DB_PATH,
 ) -> bool:
     now = utcnow()
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         existing = conn.execute(
             "SELECT id, template FROM skill_macros WHERE name=?", (name,)
         ).fetchone()
@@ -731,23 +999,28 @@ def update_macro(
             fields.append("template=?")
             params.append(template)
             if variables is None:
-                variables = re.findall(r'\{\{(\w+)\}\}', template)
+                variables = _extract_variables(template)
         if description is not None:
             fields.append("description=?")
             params.append(description)
         if variables is not None:
             fields.append("variables=?")
-            params.append(json.dumps(variables, ensure_ascii=False))
+            params.append(_dumps(variables))
+        if len(fields) == 1:
+            # 변경 필드 없음 — updated_at만 바꾸는 UPDATE는 생략
+            return True
         params.append(name)
         conn.execute(
-            f"UPDATE skill_macros SET {', '.join(fields)} WHERE name=?", params
+            _update_sql("skill_macros", tuple(fields)), params
         )
+        _invalidate(db_path)
         return True
 
 
 def delete_macro(name: str, db_path: Path = DB_PATH) -> bool:
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         cur = conn.execute("DELETE FROM skill_macros WHERE name=?", (name,))
+        _invalidate(db_path)
         return cur.rowcount > 0
 
 
@@ -761,10 +1034,10 @@ def render_macro(name: str, bindings: Dict[str, str], db_path: Path = DB_PATH) -
     for var in variables:
         if var not in bindings:
             raise KeyError(f"매크로 '{name}': 변수 '{var}'가 bindings에 없습니다.")
-    result = template
-    for key, value in bindings.items():
-        result = result.replace(f"{{{{{key}}}}}", value)
-    return result
+    if "{{" not in template:
+        return template
+    # 단일 패스 치환 — bindings에 없는 {{x}}는 그대로 둔다
+    return _VAR_RE.sub(lambda m: bindings.get(m.group(1), m.group(0)), template)
 
 
 # ── 워크플로우 CRUD ──────────────────────────────────────────────
@@ -776,34 +1049,36 @@ def create_workflow(
     db_path: Path = DB_PATH,
 ) -> int:
     now = utcnow()
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         cur = conn.execute(
             """
             INSERT INTO workflows (name, description, steps, created_at, updated_at)
             VALUES (?, ?, ?, ?, ?)
             """,
-            (name, description, json.dumps(steps, ensure_ascii=False), now, now),
+            (name, description, _dumps(steps), now, now),
         )
+        _invalidate(db_path)
         return cur.lastrowid
 
 
-def get_workflow(name: str, db_path: Path = DB_PATH) -> Optional[Dict]:
-    with get_db(db_path) as conn:
+def get_workflow(name: str, db_path: Path = DB_PATH) -> Optional[Mapping[str, Any]]:
+    def _load(conn):
         row = conn.execute("SELECT * FROM workflows WHERE name=?", (name,)).fetchone()
         if not row:
             return None
         d = dict(row)
-        d["steps"] = json.loads(d["steps"])
+        d["steps"] = _loads(d["steps"])
         return d
+    return _cached(("workflow", name), db_path, _load)
 
 
 def list_workflows(db_path: Path = DB_PATH) -> List[Dict]:
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         rows = conn.execute("SELECT * FROM workflows ORDER BY name").fetchall()
         result = []
         for r in rows:
             d = dict(r)
-            d["steps"] = json.loads(d["steps"])
+            d["steps"] = _loads(d["steps"])
             result.append(d)
         return result
 
@@ -815,7 +1090,7 @@ def update_workflow(
     db_path: Path = DB_PATH,
 ) -> bool:
     now = utcnow()
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         existing = conn.execute(
             "SELECT id FROM workflows WHERE name=?", (name,)
         ).fetchone()
@@ -825,20 +1100,25 @@ def update_workflow(
         params: List[Any] = [now]
         if steps is not None:
             fields.append("steps=?")
-            params.append(json.dumps(steps, ensure_ascii=False))
+            params.append(_dumps(steps))
         if description is not None:
             fields.append("description=?")
             params.append(description)
+        if len(fields) == 1:
+            # 변경 필드 없음 — updated_at만 바꾸는 UPDATE는 생략
+            return True
         params.append(name)
         conn.execute(
-            f"UPDATE workflows SET {', '.join(fields)} WHERE name=?", params
+            _update_sql("workflows", tuple(fields)), params
         )
+        _invalidate(db_path)
         return True
 
 
 def delete_workflow(name: str, db_path: Path = DB_PATH) -> bool:
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         cur = conn.execute("DELETE FROM workflows WHERE name=?", (name,))
+        _invalidate(db_path)
         return cur.rowcount > 0
 
 
@@ -860,7 +1140,7 @@ def create_persona(
         allowed_skills = []
     if keywords is None:
         keywords = []
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         if is_default:
             conn.execute("UPDATE personas SET is_default=0 WHERE is_default=1")
         cur = conn.execute(
@@ -875,36 +1155,43 @@ def create_persona(
                 display_name,
                 system_prompt,
                 system_prompt_ref,
-                json.dumps(allowed_skills, ensure_ascii=False),
-                json.dumps(keywords, ensure_ascii=False),
+                _dumps(allowed_skills),
+                _dumps(keywords),
                 description,
                 int(is_default),
                 now,
                 now,
             ),
         )
+        _replace_persona_keywords(conn, cur.lastrowid, keywords)
+        _invalidate(db_path)
         return cur.lastrowid
 
 
 def _parse_persona_row(row) -> Dict:
     d = dict(row)
-    d["allowed_skills"] = json.loads(d["allowed_skills"])
-    d["keywords"] = json.loads(d["keywords"])
+    # 빈 배열은 디코딩하지 않는다 (대부분의 페르소나가 해당)
+    skills = d["allowed_skills"]
+    d["allowed_skills"] = _loads(skills) if skills != "[]" else []
+    keywords = d["keywords"]
+    d["keywords"] = _loads(keywords) if keywords != "[]" else []
     return d
 
 
-def get_persona(name: str, db_path: Path = DB_PATH) -> Optional[Dict]:
-    with get_db(db_path) as conn:
+def get_persona(name: str, db_path: Path = DB_PATH) -> Optional[Mapping[str, Any]]:
+    def _load(conn):
         row = conn.execute("SELECT * FROM personas WHERE name=?", (name,)).fetchone()
         return _parse_persona_row(row) if row else None
+    return _cached(("persona", name), db_path, _load)
 
 
-def list_personas(db_path: Path = DB_PATH) -> List[Dict]:
-    with get_db(db_path) as conn:
+def list_personas(db_path: Path = DB_PATH) -> Sequence[Mapping[str, Any]]:
+    def _load(conn):
         rows = conn.execute(
             "SELECT * FROM personas ORDER BY is_default DESC, name"
         ).fetchall()
         return [_parse_persona_row(r) for r in rows]
+    return _cached(("personas",), db_path, _load)
 
 
 def update_persona(
@@ -919,13 +1206,16 @@ def update_persona(
     db_path: Path = DB_PATH,
 ) -> bool:
     now = utcnow()
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         existing = conn.execute(
             "SELECT id FROM personas WHERE name=?", (name,)
         ).fetchone()
         if not existing:
             return False
         if is_default is True:
+            # 해제 → 설정 순서 필수: 부분 UNIQUE 인덱스는 행 단위로 검사되므로
+            # CASE 한 문장으로 뒤집으면 새 기본값이 먼저 갱신될 때 충돌한다.
+            # 해제는 idx_personas_default 인덱스로 한 행만 찾는다.
             conn.execute("UPDATE personas SET is_default=0 WHERE is_default=1")
         fields = ["updated_at=?"]
         params: List[Any] = [now]
@@ -934,10 +1224,10 @@ def update_persona(
             params.append(system_prompt)
         if allowed_skills is not None:
             fields.append("allowed_skills=?")
-            params.append(json.dumps(allowed_skills, ensure_ascii=False))
+            params.append(_dumps(allowed_skills))
         if keywords is not None:
             fields.append("keywords=?")
-            params.append(json.dumps(keywords, ensure_ascii=False))
+            params.append(_dumps(keywords))
         if description is not None:
             fields.append("description=?")
             params.append(description)
@@ -950,30 +1240,105 @@ def update_persona(
         if is_default is not None:
             fields.append("is_default=?")
             params.append(int(is_default))
+        if len(fields) == 1:
+            # 변경 필드 없음 — updated_at만 바꾸는 UPDATE는 생략
+            return True
         params.append(name)
         conn.execute(
-            f"UPDATE personas SET {', '.join(fields)} WHERE name=?", params
+            _update_sql("personas", tuple(fields)), params
         )
+        if keywords is not None:
+            _replace_persona_keywords(conn, existing["id"], keywords)
+        _invalidate(db_path)
         return True
 
 
 def delete_persona(name: str, db_path: Path = DB_PATH) -> bool:
-    with get_db(db_path) as conn:
+    with _get_db(db_path) as conn:
         cur = conn.execute("DELETE FROM personas WHERE name=?", (name,))
+        _invalidate(db_path)
         return cur.rowcount > 0
 
 
+def _match_persona_sql(conn, query_lower: str) -> Optional[str]:
+    """부분 문자열 매칭(instr)을 SQLite C 계층에서 수행 — JSON 디코딩 없음."""
+    best = conn.execute(
+        """
+        SELECT p.name,
+               SUM(instr(?, k.kw) > 0) AS score,
+               COUNT(*)                AS kw_count
+        FROM persona_keywords k
+        JOIN personas p ON p.id = k.persona_id
+        GROUP BY p.id
+        HAVING score >= 1
+        ORDER BY score DESC, kw_count DESC, p.is_default DESC, p.name
+        LIMIT 1
+        """,
+        (query_lower,),
+    ).fetchone()
+    return best["name"] if best else None
+
+
+def _match_persona_automaton(conn, db_path: Path, query_lower: str) -> Optional[str]:
+    """전체 키워드 Aho-Corasick 오토마톤으로 쿼리를 한 번만 스캔합니다.
+
+    오토마톤은 읽기 캐시에 함께 보관되어 페르소나 변경 시 같이 무효화된다.
+    호출자가 _get_db 잠금을 잡고 있어야 한다.
+    """
+    cache = _READ_CACHE.setdefault(str(db_path), {})
+    entry = cache.get(("keyword_automaton",))
+    if entry is None:
+        personas: Dict[str, Dict] = {}
+        # Row를 튜플로 언패킹 — 행마다 dict를 만들지 않는다
+        for name, is_default, kw in conn.execute(
+            """
+            SELECT p.name, p.is_default, k.kw
+            FROM persona_keywords k
+            JOIN personas p ON p.id = k.persona_id
+            """
+        ):
+            p = personas.get(name)
+            if p is None:
+                p = personas[name] = {"is_default": is_default, "keywords": []}
+            p["keywords"].append(kw)
+        words = {kw for p in personas.values() for kw in p["keywords"] if kw}
+        automaton = None
+        if words:
+            automaton = ahocorasick.Automaton()
+            for kw in words:
+                automaton.add_word(kw, kw)
+            automaton.make_automaton()
+        entry = (automaton, personas)
+        cache[("keyword_automaton",)] = entry
+
+    automaton, personas = entry
+    found = {""}  # 빈 키워드는 instr와 동일하게 항상 일치로 취급
+    if automaton is not None:
+        found.update(kw for _, kw in automaton.iter(query_lower))
+
+    best_key = None
+    best_name = None
+    for name, p in personas.items():
+        score = sum(1 for kw in p["keywords"] if kw in found)
+        if score < 1:
+            continue
+        key = (-score, -len(p["keywords"]), -p["is_default"], name)
+        if best_key is None or key < best_key:
+            best_key, best_name = key, name
+    return best_name
+
+
 def get_effective_persona(
     query: str = "",
     explicit_name: Optional[str] = None,
     db_path: Path = DB_PATH,
-) -> Optional[Dict]:
+) -> Optional[Mapping[str, Any]]:
     """
     페르소나 자동 감지 알고리즘:
     1. explicit_name 있음 → get_persona(explicit_name). 없으면 WARNING 후 Step 2로
-    2. 모든 페르소나 로드 → keywords 있는 것만 스코어링
+    2. persona_keywords 테이블에서 SQL로 스코어링 (keywords 있는 것만)
        score = sum(1 for kw in keywords if kw.lower() in query.lower())
-       동점 → keywords 개수 많은 쪽(더 구체적) 우선
+       동점 → keywords 개수 많은 쪽(더 구체적) 우선 → is_default, 이름 순
     3. best_score >= 1 → 해당 페르소나 반환
     4. 매치 없음 → is_default=1인 페르소나 반환
     5. 기본도 없음 → None 반환
@@ -984,30 +1349,21 @@ def get_effective_persona(
             return persona
         logging.warning(f"페르소나 '{explicit_name}'을 찾을 수 없습니다. 자동 감지로 대체합니다.")
 
-    personas = list_personas(db_path)
     query_lower = query.lower()
 
-    best_persona = None
-    best_score = 0
-    best_kw_count = 0
-
-    for persona in personas:
-        keywords = persona.get("keywords", [])
-        if not keywords:
-            continue
-        score = sum(1 for kw in keywords if kw.lower() in query_lower)
-        kw_count = len(keywords)
-        if score > best_score or (score == best_score and score >= 1 and kw_count > best_kw_count):
-            best_score = score
-            best_kw_count = kw_count
-            best_persona = persona
-
-    if best_score >= 1:
-        return best_persona
-
-    # is_default 페르소나 반환
-    for persona in personas:
-        if persona.get("is_default"):
-            return persona
+    def _load(conn) -> Optional[str]:
+        if ahocorasick is not None:
+            best_name = _match_persona_automaton(conn, db_path, query_lower)
+        else:
+            best_name = _match_persona_sql(conn, query_lower)
+        if best_name is None:
+            # is_default 페르소나 반환
+            row = conn.execute(
+                "SELECT name FROM personas WHERE is_default=1 ORDER BY name LIMIT 1"
+            ).fetchone()
+            best_name = row["name"] if row else None
+        return best_name
 
-    return None
+    # 결정(페르소나 이름)만 쿼리별로 캐시 — 페르소나 변경 시 읽기 캐시와 함께 무효화
+    best_name = _cached(("effective_persona", query_lower), db_path, _load)
+    return get_persona(best_name, db_path) if best_name else None
@@ -5,7 +5,10 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from .models import AgentRequest, AgentResponse, ExecutionGroup, WisdomEntry, PlanValidation
+from .models import (
+    AgentRequest, AgentResponse, ExecutionGroup, ReplanRequest, ToolCall, WisdomEntry, PlanValidation,
+    BatchAgentRequest, BatchAgentResponse, BatchItemResponse,
+)
 from .llm_client import (
     generate_execution_plan,
     generate_final_answer,
@@ -21,6 +24,7 @@ from .llm_client import (
 from .constants import PLAN_VALIDATION_MIN_SCORE
 
 from . import tool_registry
+from .http_client import close_http_clients
 from . import history_manager
 from . import graph_manager
 from . import agent_config_manager
@@ -29,17 +33,103 @@ from . import pipeline_db
 from . import pipeline_manager
 import asyncio
 import inspect
+import json
 import logging
 import os
 import re
+import stat
+import threading
 import time
+import traceback
+import uuid
+import weakref
+from collections import OrderedDict
 from datetime import datetime
+from typing import Optional
 from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
 from . import issue_tracker
 from . import token_tracker
 
+try:  # 선택 의존성 — 설치 시 dict/list 도구 결과 직렬화를 C 구현으로 처리
+    import orjson
+except ImportError:
+    orjson = None
+
+
+from .constants import (
+    MAX_HISTORY_ENTRIES,
+    MAX_TOOL_RESULT_LENGTH,
+    ARTIFACTS_MAX_FILES,
+    MAX_REQUIREMENT_FILE_SIZE,
+    SPECULATIVE_FINAL_MIN_RESULTS,
+    PLAN_CACHE_TTL_SEC,
+    PLAN_CACHE_MAX_ENTRIES,
+    CONV_CACHE_MAX_ENTRIES,
+    ISSUE_CAPTURE_MAX_PENDING,
+    HISTORY_USER_REQ_PREFIX,
+    HISTORY_GROUP_START_PREFIX,
+    HISTORY_GROUP_DONE_PREFIX,
+    HISTORY_TOOL_RUN_PREFIX,
+    HISTORY_RESULT_PREFIX,
+    HISTORY_ERROR_LABEL,
+    HISTORY_ERROR_PREFIX,
+    HISTORY_FINAL_ANSWER_PREFIX,
+)
+
+# 계획 직렬화용 — 그룹마다 model_dump()를 호출하는 대신 컴파일된 직렬화기로 한 번에 변환
+_PLAN_ADAPTER = TypeAdapter(list[ExecutionGroup])
+
+
+def _construct_group(group: dict) -> ExecutionGroup:
+    """저장된 계획 dict를 검증 없이 ExecutionGroup으로 복원합니다.
+
+    계획은 생성 시점에 이미 검증된 뒤 저장되므로 로드 시 validator를 다시 돌리지 않는다.
+    """
+    tasks = [ToolCall.model_construct(**t) for t in group.get("tasks", [])]
+    return ExecutionGroup.model_construct(**{**group, "tasks": tasks})
+
+
+# ── 백그라운드 작업 ──────────────────────────────────────────────
+# 응답 경로에 영향이 없는 로깅성 DB 쓰기는 워커 스레드로 넘기고 기다리지 않는다.
+# 태스크 참조를 보관하지 않으면 완료 전에 GC될 수 있어 집합에 유지한다.
+_BACKGROUND_TASKS: set = set()
+
+
+def _on_background_done(task: asyncio.Task) -> None:
+    _BACKGROUND_TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logging.warning(f"백그라운드 작업 실패: {task.exception()}")
 
-from .constants import MAX_HISTORY_ENTRIES, MAX_TOOL_RESULT_LENGTH, MAX_REQUIREMENT_FILE_SIZE
+
+def _run_in_background(func, *args, **kwargs) -> asyncio.Task:
+    """동기 함수를 워커 스레드에서 실행하도록 예약하고 완료를 기다리지 않습니다."""
+    task = asyncio.create_task(asyncio.to_thread(func, *args, **kwargs))
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_on_background_done)
+    return task
+
+
+# 기록 대기 중인 이슈 태스크 — 오류 폭주 시 워커 스레드와 메모리 사용을 제한
+_PENDING_ISSUES: set = set()
+
+
+def _capture_issue(exc: Exception, context: str, source: str) -> None:
+    """예외를 이슈로 기록합니다. traceback은 호출 시점에 문자열로 만들어 두고 DB 쓰기만 백그라운드로 보냅니다."""
+    if len(_PENDING_ISSUES) >= ISSUE_CAPTURE_MAX_PENDING:
+        logging.warning(f"이슈 기록 대기열이 가득 차 생략합니다 ({source}: {type(exc).__name__}: {exc})")
+        return
+    task = _run_in_background(
+        issue_tracker.capture,
+        error_message=str(exc),
+        error_type=type(exc).__name__,
+        traceback="".join(traceback.format_exception(type(exc), exc, exc.__traceback__)),
+        context=context,
+        source=source,
+        severity="error",
+    )
+    _PENDING_ISSUES.add(task)
+    task.add_done_callback(_PENDING_ISSUES.discard)
 
 
 def _resp(**kwargs) -> AgentResponse:
@@ -73,35 +163,427 @@ def _validate_requirement_path(path: str) -> str:
         ValueError: 파일이 존재하지 않거나 일반 파일이 아니거나 너무 큰 경우
     """
     real = os.path.realpath(path)
-    if not os.path.isfile(real):
+    # 존재/종류/크기를 stat 1회로 확인
+    try:
+        st = os.stat(real)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         raise ValueError(f"요구사항 경로가 일반 파일이 아닙니다: {path}")
-    if os.path.getsize(real) > MAX_REQUIREMENT_FILE_SIZE:
+    if st.st_size > MAX_REQUIREMENT_FILE_SIZE:
         raise ValueError(f"요구사항 파일이 너무 큽니다 (최대 1MB): {path}")
     return real
 
 
+def _read_requirement(path: str) -> str:
+    """요구사항 파일 1개를 검증 후 읽어 구분선과 함께 반환합니다 (동기, 스레드에서 실행)."""
+    real_path = _validate_requirement_path(path)
+    with open(real_path, 'r', encoding='utf-8') as f:
+        return (
+            f"--- {os.path.basename(real_path)} ---\n"
+            + f.read()
+            + "\n-----------------------------------\n\n"
+        )
+
+
+async def _read_requirements(paths: list, history: list) -> str:
+    """요구사항 파일들을 스레드풀에서 동시에 읽어 요청 순서대로 이어 붙입니다.
+
+    읽기 실패한 파일은 건너뛰고 history에 경고를 남깁니다.
+    """
+    results = await asyncio.gather(
+        *[asyncio.to_thread(_read_requirement, path) for path in paths],
+        return_exceptions=True,
+    )
+    parts = []
+    for path, res in zip(paths, results):
+        if isinstance(res, Exception):
+            history.append(f"경고: 요구사항 파일 '{path}' 읽기 실패: {res}")
+        else:
+            parts.append(res)
+    return "".join(parts)
+
+
 def _prune_history(history: list) -> list:
-    """대화 이력이 MAX_HISTORY_ENTRIES를 초과하면 오래된 항목을 제거합니다."""
+    """대화 이력이 MAX_HISTORY_ENTRIES를 초과하면 오래된 항목을 제거합니다.
+
+    새 리스트를 만들지 않고 제자리에서 앞부분을 삭제한 뒤 같은 객체를 반환한다.
+    """
     if len(history) > MAX_HISTORY_ENTRIES:
         logging.info(
             f"대화 이력이 {MAX_HISTORY_ENTRIES}개를 초과하여 오래된 항목을 제거합니다. "
             f"(현재: {len(history)}개)"
         )
-        return history[-MAX_HISTORY_ENTRIES:]
+        del history[:-MAX_HISTORY_ENTRIES]
     return history
 
 
+# ── 대화 로드 캐시 ────────────────────────────────────────────────
+# decide_and_act ↔ execute_group 왕복마다 같은 대화를 다시 읽고 JSON을 파싱하지 않도록
+# (revision, created_at) 토큰이 같으면 메모리 사본을 사용한다.
+# 저장 시에는 저장한 내용을 revision+1로 기록(write-through)한다. 다른 경로에서의
+# 저장이 끼어들면 DB revision이 더 커지므로 다음 로드에서 자동으로 다시 읽는다.
+# 항목 수는 CONV_CACHE_MAX_ENTRIES로 제한 — 사용(로드/저장)할 때마다 맨 뒤로 옮기고
+# 넘치면 맨 앞(가장 오래 쓰이지 않은 대화)을 버린다. 버려진 대화는 다음 로드에서 DB를 읽는다.
+# 로드/저장은 to_thread 워커에서 동시에 실행되므로 캐시 변경은 모두 _CONV_CACHE_LOCK 안에서 한다
+# (DB 입출력은 잠금 밖). _CONV_SAVE_LOCK은 저장 전체(캐시 확인 → DB 저장 → 갱신)를 직렬화한다.
+_CONV_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_CONV_CACHE_LOCK = threading.Lock()
+_CONV_SAVE_LOCK = threading.Lock()
+
+
+def _remember_conversation(convo_id: str, cached: tuple) -> None:
+    """캐시 항목을 가장 최근 위치에 넣고, 상한을 넘으면 가장 오래된 항목을 제거합니다.
+
+    호출자가 _CONV_CACHE_LOCK을 잡고 있어야 한다.
+    """
+    _CONV_CACHE[convo_id] = cached
+    _CONV_CACHE.move_to_end(convo_id)
+    while len(_CONV_CACHE) > CONV_CACHE_MAX_ENTRIES:
+        _CONV_CACHE.popitem(last=False)
+
+
+def _copy_conversation(data: dict) -> dict:
+    """엔드포인트가 history/plan을 수정해도 캐시가 오염되지 않도록 얕은 사본을 만든다."""
+    return {**data, "history": list(data.get("history", [])), "plan": list(data.get("plan", []))}
+
+
+def _load_conversation(convo_id: str):
+    """캐시 우선으로 대화를 불러옵니다 (동기, 스레드에서 실행)."""
+    token = history_manager.get_revision(convo_id)
+    if token is None:
+        with _CONV_CACHE_LOCK:
+            _CONV_CACHE.pop(convo_id, None)
+        return None
+    with _CONV_CACHE_LOCK:
+        cached = _CONV_CACHE.get(convo_id)
+    if cached is None or cached[0] != token:
+        data = history_manager.load_conversation(convo_id)
+        if data is None:
+            with _CONV_CACHE_LOCK:
+                _CONV_CACHE.pop(convo_id, None)
+            return None
+        # 읽은 행 자체의 revision으로 기록 — 조회 사이에 저장이 끼어들어도 일관됨
+        cached = ((data.get("revision", 0), data.get("created_at")), data)
+    with _CONV_CACHE_LOCK:
+        _remember_conversation(convo_id, cached)
+    return _copy_conversation(cached[1])
+
+
+def _save_conversation(
+    convo_id: str,
+    history: list,
+    title: str = "Untitled",
+    plan: list = None,
+    current_group_index: int = 0,
+    is_final: bool = False,
+    first_user_query: str = None,
+    plan_groups: list = None,
+) -> str:
+    """history_manager.save_conversation 후 캐시를 저장 내용으로 갱신합니다.
+
+    plan_groups를 주면 plan과 같은 내용의 ExecutionGroup 객체를 캐시에 함께 보관해
+    이어지는 execute_group이 계획을 다시 복원하지 않도록 한다.
+    """
+    with _CONV_SAVE_LOCK:
+        result = history_manager.save_conversation(
+            convo_id, history, title, plan, current_group_index, is_final,
+            first_user_query=first_user_query,
+        )
+        with _CONV_CACHE_LOCK:
+            cached = _CONV_CACHE.pop(convo_id, None)
+        if cached is not None:
+            (revision, created_at), data = cached
+            entry = ((revision + 1, created_at), {
+                **data,
+                "title": title,
+                "history": list(history),
+                "plan": list(plan or []),
+                "current_group_index": current_group_index,
+                "status": "final" if is_final else "active",
+                "revision": revision + 1,
+                # DB와 동일하게 최초 값 유지
+                "first_user_query": data.get("first_user_query") or first_user_query,
+                # plan과 항상 짝으로 갱신 — 이전 저장의 객체가 남지 않도록 없으면 None
+                "plan_groups": tuple(plan_groups) if plan_groups else None,
+            })
+            with _CONV_CACHE_LOCK:
+                _remember_conversation(convo_id, entry)
+    return result
+
+
+# ── 재계획 결과 캐시 ──────────────────────────────────────────────
+# 입력(대화·이력·질의·지식·모델·프롬프트·스킬)이 완전히 같을 때만 적중한다.
+# 값은 (만료 시각, 계획 dict 목록) — 적중 시 새 ExecutionGroup으로 복원해 공유 객체 변경을 막는다.
+_PLAN_CACHE: dict[tuple, tuple] = {}
+
+
+def _get_cached_plan(key: tuple) -> Optional[list]:
+    entry = _PLAN_CACHE.get(key)
+    if entry is None:
+        return None
+    expires_at, plan_dicts = entry
+    if expires_at < time.monotonic():
+        _PLAN_CACHE.pop(key, None)
+        return None
+    return [_construct_group(d) for d in plan_dicts]
+
+
+def _store_cached_plan(key: tuple, plan_dicts: list) -> None:
+    if key not in _PLAN_CACHE and len(_PLAN_CACHE) >= PLAN_CACHE_MAX_ENTRIES:
+        _PLAN_CACHE.pop(next(iter(_PLAN_CACHE)))
+    _PLAN_CACHE[key] = (time.monotonic() + PLAN_CACHE_TTL_SEC, plan_dicts)
+
+
+# 최초 요청을 찾지 못했을 때 계획 수립에 쓰는 기본 질의
+_DEFAULT_QUERY = "이전 작업을 계속하세요."
+
+
+# 길이 상한 직렬화용 — iterencode는 조각 단위로 내보내므로 상한에 닿으면 중단할 수 있다
+_BOUNDED_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _bounded_json(result, limit: int) -> str:
+    """result를 압축 JSON으로 직렬화하되 limit+1자를 넘기면 즉시 멈춥니다."""
+    chunks = []
+    size = 0
+    for chunk in _BOUNDED_ENCODER.iterencode(result):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            break
+    return "".join(chunks)[:limit + 1]
+
+
+def _stringify_result(result, limit: Optional[int] = None) -> str:
+    """도구 결과를 이력 기록용 문자열로 변환합니다.
+
+    dict/list는 repr 대신 압축 JSON으로 직렬화한다 (orjson이 있으면 사용).
+    JSON으로 표현할 수 없는 값은 str()로 대체.
+    limit이 주어지면 최대 limit+1자까지만 만든다 — 호출 측은 len() > limit으로 잘림을 판단한다.
+    이때 큰 dict/list/bytes는 전체를 문자열로 만들지 않고 상한에서 멈춘다.
+    """
+    if isinstance(result, str):
+        return result if limit is None else result[:limit + 1]
+    if limit is not None and isinstance(result, (bytes, bytearray)):
+        return str(result[:limit + 1])[:limit + 1]
+    if isinstance(result, (dict, list)):
+        try:
+            if limit is not None:
+                return _bounded_json(result, limit)
+            if orjson is not None:
+                return orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS).decode()
+            return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+        except (TypeError, ValueError):
+            pass
+    text = str(result)
+    return text if limit is None else text[:limit + 1]
+
+
+def _summarize_tool_result(tool_name: str, result) -> str:
+    """도구 결과를 MAX_TOOL_RESULT_LENGTH 이내의 이력 기록용 문자열로 만듭니다.
+
+    넘치면 잘림 표시를 붙이고 경고를 남긴다. 큰 결과는 상한까지만 직렬화한다.
+    """
+    result_str = _stringify_result(result, MAX_TOOL_RESULT_LENGTH)
+    if len(result_str) <= MAX_TOOL_RESULT_LENGTH:
+        return result_str
+    # 문자열 결과만 원래 길이를 알 수 있다 (나머지는 상한에서 직렬화를 멈춤)
+    orig_len = f"{len(result)}자" if isinstance(result, str) else "알 수 없음"
+    logging.warning(
+        f"도구 '{tool_name}' 결과가 {MAX_TOOL_RESULT_LENGTH}자를 초과하여 잘렸습니다. "
+        f"(원래 길이: {orig_len})"
+    )
+    return result_str[:MAX_TOOL_RESULT_LENGTH] + "... (결과가 너무 길어 잘림)"
+
+
+# ── 대용량 도구 결과 보관 ─────────────────────────────────────────
+# 이력에는 잘린 요약만 남기고 전체 결과는 파일로 보관한다. 경로는 프로젝트 루트 기준
+# 상대 경로로 기록하므로 이후 계획에서 filesystem 서버의 read_file로 다시 읽을 수 있다.
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ARTIFACTS_DIR = os.path.join(_BASE_DIR, "artifacts")
+_UNSAFE_PATH_CHARS = re.compile(r"[^\w-]")
+
+# 보관 파일 수 — 시작 시(또는 첫 저장 시) 한 번 세고 이후 저장마다 1씩 올린다.
+# 디렉토리 전체를 훑는 정리는 이 값이 ARTIFACTS_MAX_FILES를 넘을 때만 실행한다.
+_ARTIFACT_COUNT: Optional[int] = None
+_ARTIFACT_LOCK = threading.Lock()
+
+
+def _prune_artifacts() -> None:
+    """artifacts/의 파일 수를 다시 세고, ARTIFACTS_MAX_FILES를 넘으면 오래된 파일부터 삭제합니다.
+
+    정리 후에는 상한의 90%만 남겨 상한 근처에서 저장마다 다시 훑지 않게 한다.
+    """
+    global _ARTIFACT_COUNT
+    files = []
+    for root, _dirs, names in os.walk(_ARTIFACTS_DIR):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                files.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+    remaining = len(files)
+    if remaining > ARTIFACTS_MAX_FILES:
+        files.sort()
+        for _mtime, path in files[:remaining - (ARTIFACTS_MAX_FILES - ARTIFACTS_MAX_FILES // 10)]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logging.warning(f"오래된 결과 파일 삭제 실패 ({path}): {e}")
+                continue
+            remaining -= 1
+            # 비게 된 대화 디렉토리도 정리
+            directory = os.path.dirname(path)
+            if directory != _ARTIFACTS_DIR:
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    pass
+    with _ARTIFACT_LOCK:
+        _ARTIFACT_COUNT = remaining
+
+
+def _count_spilled_artifact() -> None:
+    """저장 1건을 계수하고, 상한을 넘었을 때(또는 아직 세지 않았을 때)만 정리합니다."""
+    global _ARTIFACT_COUNT
+    with _ARTIFACT_LOCK:
+        if _ARTIFACT_COUNT is not None:
+            _ARTIFACT_COUNT += 1
+            if _ARTIFACT_COUNT <= ARTIFACTS_MAX_FILES:
+                return
+    _prune_artifacts()
+
+
+def _spill_tool_result(convo_id: str, tool_name: str, result) -> Optional[str]:
+    """전체 도구 결과를 artifacts/{대화}/ 아래 파일로 저장하고 상대 경로를 반환합니다 (동기, 스레드에서 실행)."""
+    try:
+        directory = os.path.join(_ARTIFACTS_DIR, _UNSAFE_PATH_CHARS.sub("_", convo_id))
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(
+            directory, f"{_UNSAFE_PATH_CHARS.sub('_', tool_name)}_{uuid.uuid4().hex[:8]}.txt"
+        )
+        if isinstance(result, bytes):
+            with open(path, "wb") as f:
+                f.write(result)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(_stringify_result(result))
+        _count_spilled_artifact()
+        return os.path.relpath(path, _BASE_DIR)
+    except Exception as e:
+        logging.warning(f"도구 '{tool_name}' 전체 결과 저장 실패: {e}")
+        return None
+
+
+async def _summarize_or_spill(convo_id: str, tool_name: str, result) -> str:
+    """_summarize_tool_result와 같되, 잘린 경우 전체 결과 파일 경로를 덧붙입니다."""
+    summary = _summarize_tool_result(tool_name, result)
+    if len(summary) <= MAX_TOOL_RESULT_LENGTH:
+        return summary
+    path = await asyncio.to_thread(_spill_tool_result, convo_id, tool_name, result)
+    if path:
+        summary += f" (전체 결과: {path})"
+    return summary
+
+
+# 도구 함수 객체별 코루틴 여부 캐시 — 도구가 교체/해제되면 항목도 함께 사라진다
+_COROUTINE_CACHE: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _is_coroutine_tool(tool_function) -> bool:
+    """inspect.iscoroutinefunction 결과를 도구 함수 객체 단위로 캐시합니다."""
+    try:
+        return _COROUTINE_CACHE[tool_function]
+    except (KeyError, TypeError):
+        pass
+    result = inspect.iscoroutinefunction(tool_function)
+    try:
+        _COROUTINE_CACHE[tool_function] = result
+    except TypeError:
+        # 약한 참조를 지원하지 않는 호출 객체는 캐시하지 않음
+        pass
+    return result
+
+
+def _likely_final_turn(history: list) -> bool:
+    """재계획 결과가 '완료'([])일 가능성이 높은지 이력으로 추정합니다.
+
+    직전 실행 구간(마지막 '그룹 실행 완료'와 그 그룹의 '그룹 실행 시작' 사이)에
+    오류 줄 없이 성공 결과가 SPECULATIVE_FINAL_MIN_RESULTS개 이상 있으면 True.
+    오류는 줄 접두어로만 판단한다 — 결과 본문에 '실행 오류'가 들어 있어도 실패가 아니다.
+    """
+    if not history or not str(history[-1]).startswith(HISTORY_GROUP_DONE_PREFIX):
+        return False
+    results = 0
+    for entry in reversed(history[:-1]):
+        if not isinstance(entry, str):
+            continue
+        if entry.startswith(
+            (HISTORY_GROUP_START_PREFIX, HISTORY_GROUP_DONE_PREFIX, HISTORY_USER_REQ_PREFIX)
+        ):
+            break
+        if entry.startswith(HISTORY_ERROR_PREFIX):
+            return False
+        if entry.startswith(HISTORY_RESULT_PREFIX):
+            results += 1
+    return results >= SPECULATIVE_FINAL_MIN_RESULTS
+
+
+def _start_title_task(history: list, model_preference) -> Optional[asyncio.Task]:
+    """제목 생성을 최종 답변과 동시에 시작합니다.
+
+    모든 프로바이더의 제목 생성은 이력의 앞 두 항목만 사용하므로, 두 항목이 이미 있으면
+    최종 답변을 기다릴 필요가 없다. 두 항목이 안 되면 None을 반환한다.
+    """
+    if len(history) < 2:
+        return None
+    return asyncio.create_task(generate_title_for_conversation(history[:2], model_preference))
+
+
 def _extract_first_query(history: list) -> str:
     """대화 이력에서 첫 번째 사용자 요청을 추출합니다.
 
     '사용자 요청: ' 접두어로 시작하는 첫 번째 항목에서 내용을 반환합니다.
     찾지 못하면 기본 문자열을 반환합니다.
     """
-    prefix = "사용자 요청:"
     for entry in history:
-        if isinstance(entry, str) and entry.startswith(prefix):
-            return entry[len(prefix):].strip()
-    return "이전 작업을 계속하세요."
+        if type(entry) is str:
+            # 접두어가 없으면 removeprefix는 같은 객체를 그대로 반환한다
+            stripped = entry.removeprefix(HISTORY_USER_REQ_PREFIX)
+            if stripped is not entry:
+                return stripped.strip()
+    return _DEFAULT_QUERY
+
+
+# 도구 함수 객체별 허용 인자 집합 캐시 (None = 검증 생략 대상)
+_TOOL_SPEC_CACHE: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _get_tool_spec(tool_function) -> Optional[frozenset]:
+    """도구 함수의 허용 인자 이름 집합을 반환합니다.
+
+    **kwargs를 받거나 서명 조회가 불가능하면 None. 결과는 함수 객체 단위로 캐시한다.
+    """
+    try:
+        return _TOOL_SPEC_CACHE[tool_function]
+    except (KeyError, TypeError):
+        pass
+    try:
+        params = inspect.signature(tool_function).parameters.values()
+    except (ValueError, TypeError):
+        spec = None
+    else:
+        if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params):
+            spec = None
+        else:
+            spec = frozenset(p.name for p in params)
+    try:
+        _TOOL_SPEC_CACHE[tool_function] = spec
+    except TypeError:
+        pass
+    return spec
 
 
 def _validate_tool_arguments(tool_function, tool_name: str, arguments: dict) -> None:
@@ -110,21 +592,13 @@ def _validate_tool_arguments(tool_function, tool_name: str, arguments: dict) ->
     허용되지 않은 인자가 있으면 ValueError를 발생시킵니다.
     **kwargs를 받는 함수나 서명 조회가 불가능한 경우에는 검증을 생략합니다.
     """
-    try:
-        sig = inspect.signature(tool_function)
-    except (ValueError, TypeError):
+    allowed = _get_tool_spec(tool_function)
+    if allowed is None:
         return
-    # **kwargs 파라미터가 있으면 모든 keyword 인자를 허용
-    if any(
-        p.kind == inspect.Parameter.VAR_KEYWORD
-        for p in sig.parameters.values()
-    ):
-        return
-    allowed = set(sig.parameters.keys())
-    unknown = set(arguments.keys()) - allowed
+    unknown = arguments.keys() - allowed
     if unknown:
         raise ValueError(
-            f"도구 '{tool_name}'에 허용되지 않은 인자: {unknown}. 허용된 인자: {allowed}"
+            f"도구 '{tool_name}'에 허용되지 않은 인자: {unknown}. 허용된 인자: {set(allowed)}"
         )
 
 
@@ -135,8 +609,13 @@ async def lifespan(app: FastAPI):
     issue_tracker.init_db()
     pipeline_db.init_db()          # 4층 파이프라인 테이블 초기화
     await tool_registry.initialize()
+    # 보관 파일 수를 시작 시 한 번 세고 넘친 만큼 정리 — 이후에는 저장 시 계수만 한다
+    await asyncio.to_thread(_prune_artifacts)
     yield
     await tool_registry.shutdown()
+    await close_http_clients()
+    graph_manager.close_all()
+    agent_config_manager.close_all()
 
 app = FastAPI(title="Multi-Provider Agent Orchestrator", lifespan=lifespan)
 
@@ -146,15 +625,7 @@ app.include_router(web_router)
 
 @app.exception_handler(Exception)
 async def _global_exception_handler(request, exc: Exception):
-    import traceback as _tb
-    issue_tracker.capture(
-        error_message=str(exc),
-        error_type=type(exc).__name__,
-        traceback=_tb.format_exc(),
-        context=f"{request.method} {request.url.path}",
-        source="api_server",
-        severity="error",
-    )
+    _capture_issue(exc, context=f"{request.method} {request.url.path}", source="api_server")
     return JSONResponse(status_code=500, content={"detail": f"내부 서버 오류: {type(exc).__name__}"})
 
 @app.post("/agent/decide_and_act", response_model=AgentResponse)
@@ -167,16 +638,19 @@ async def decide_and_act(request: AgentRequest):
     """
     token_tracker.begin_tracking()
 
-    data = history_manager.load_conversation(request.conversation_id)
+    # 저장된 대화가 없으면 빈 dict — 이후 조회는 기본값으로 한 번씩만 수행
+    data = await asyncio.to_thread(_load_conversation, request.conversation_id) or {}
     history = data.get("history", []) if data else request.history
-    convo_id = data.get("id", request.conversation_id) if data else request.conversation_id
+    convo_id = data.get("id", request.conversation_id)
+    current_title = data.get("title", "진행 중")
 
     # 페르소나 해석
     effective_system_prompts = request.system_prompts or []
     effective_allowed_skills = request.allowed_skills  # None = 필터 없음
 
     if not effective_system_prompts:
-        persona = agent_config_manager.get_effective_persona(
+        persona = await asyncio.to_thread(
+            agent_config_manager.get_effective_persona,
             query=request.user_input or "",
             explicit_name=request.persona,
         )
@@ -187,19 +661,32 @@ async def decide_and_act(request: AgentRequest):
 
     if request.user_input or not history:
         query = request.user_input or "무엇을 할까요?"
+        # 최초 요청 기록용 — 이미 기록된 대화에서는 DB가 기존 값을 유지한다
+        first_user_query = request.user_input or None
 
         if request.user_input:
-            history.append(f"사용자 요청: {query}")
+            history.append(f"{HISTORY_USER_REQ_PREFIX} {query}")
 
         # P3-C: IntentGate — chat/task 분류 후 chat이면 즉시 최종 답변 반환
         try:
             intent = await classify_intent(query, request.model_preference)
             if intent == "chat":
-                direct_answer = await generate_final_answer(history, request.model_preference)
-                history.append(f"최종 답변: {direct_answer}")
-                title_summary = await generate_title_for_conversation(history, request.model_preference)
-                history_manager.save_conversation(
-                    convo_id, history, title_summary, [], 0, is_final=True
+                title_task = _start_title_task(history, request.model_preference)
+                try:
+                    direct_answer = await generate_final_answer(history, request.model_preference)
+                except BaseException:
+                    if title_task is not None:
+                        title_task.cancel()
+                    raise
+                history.append(f"{HISTORY_FINAL_ANSWER_PREFIX} {direct_answer}")
+                if title_task is not None:
+                    title_summary = await title_task
+                else:
+                    title_summary = await generate_title_for_conversation(history, request.model_preference)
+                await asyncio.to_thread(
+                    _save_conversation,
+                    convo_id, history, title_summary, [], 0, is_final=True,
+                    first_user_query=first_user_query,
                 )
                 return _resp(
                     conversation_id=convo_id,
@@ -219,28 +706,24 @@ async def decide_and_act(request: AgentRequest):
             return await pipeline_endpoint(request)
 
         # P3-B: Planner 역할 프롬프트 주입
-        planner_prompts = [agent_config_manager.get_prompt("role_planner")] + effective_system_prompts
+        planner_prompts = (agent_config_manager.get_prompt("role_planner"), *effective_system_prompts)
 
-        # [B] 지식 로드 및 주입
+        # [B] 지식 로드 및 주입 — 턴마다 바뀌므로 system이 아닌 사용자 메시지 쪽 컨텍스트로 전달
+        #     (system_prompts를 고정 접두사로 유지해 LLM 프롬프트 캐시가 재사용되도록)
+        wisdom_context = ""
         try:
-            wisdom_entries = graph_manager.load_wisdom(convo_id)
+            wisdom_entries = await asyncio.to_thread(graph_manager.load_wisdom, convo_id)
             if wisdom_entries:
-                planner_prompts.append(_format_wisdom(wisdom_entries))
+                wisdom_context = _format_wisdom(wisdom_entries)
         except Exception:
             pass
 
         requirements_content = ""
         if request.requirement_paths:
             history.append(f"요구사항 파일 참조: {', '.join(request.requirement_paths)}")
-            for path in request.requirement_paths:
-                try:
-                    real_path = _validate_requirement_path(path)
-                    with open(real_path, 'r', encoding='utf-8') as f:
-                        requirements_content += f"--- {os.path.basename(real_path)} ---\n"
-                        requirements_content += f.read()
-                        requirements_content += "\n-----------------------------------\n\n"
-                except Exception as e:
-                    history.append(f"경고: 요구사항 파일 '{path}' 읽기 실패: {e}")
+            requirements_content = await _read_requirements(request.requirement_paths, history)
+        if wisdom_context:
+            requirements_content = f"{requirements_content}{wisdom_context}"
 
         try:
             plan_list = await generate_execution_plan(
@@ -299,9 +782,12 @@ async def decide_and_act(request: AgentRequest):
                 )
 
             history = _prune_history(history)
-            plan_dicts = [group.model_dump() for group in plan_list]
-            history_manager.save_conversation(
-                convo_id, history, f"계획: {plan_list[0].description[:20]}...", plan_dicts, 0, is_final=False
+            plan_dicts = _PLAN_ADAPTER.dump_python(plan_list)
+            await asyncio.to_thread(
+                _save_conversation,
+                convo_id, history, f"계획: {plan_list[0].description[:20]}...", plan_dicts, 0, is_final=False,
+                plan_groups=plan_list,
+                first_user_query=first_user_query,
             )
 
             first_group = plan_list[0]
@@ -314,13 +800,13 @@ async def decide_and_act(request: AgentRequest):
             )
 
         except Exception as e:
-            issue_tracker.capture_exception(
-                e, context=f"generate_execution_plan convo_id={convo_id}", source="agent"
-            )
+            _capture_issue(e, context=f"generate_execution_plan convo_id={convo_id}", source="agent")
             history.append(f"계획 수립 오류: {e}")
             # (수정 2) 누락된 인자 plan=[], current_group_index=0 추가
-            history_manager.save_conversation(
-                convo_id, history, "계획 실패", plan=[], current_group_index=0, is_final=False
+            await asyncio.to_thread(
+                _save_conversation,
+                convo_id, history, "계획 실패", plan=[], current_group_index=0, is_final=False,
+                first_user_query=first_user_query,
             )
             return _resp(
                 conversation_id=convo_id,
@@ -331,27 +817,60 @@ async def decide_and_act(request: AgentRequest):
 
     else:
         try:
-            first_query = _extract_first_query(history)
+            # 저장된 최초 요청 우선 — 컬럼 도입 이전 대화는 history를 한 번 스캔하고,
+            # 찾은 값은 이번 저장 때 함께 기록해 이후에는 스캔하지 않는다 (이력이 잘려도 유지)
+            first_query = data.get("first_user_query")
+            backfill_query = None
+            if not first_query:
+                first_query = _extract_first_query(history)
+                if first_query != _DEFAULT_QUERY:
+                    backfill_query = first_query
 
             # P3-B: Reviewer 역할 프롬프트 주입 (재계획 단계)
-            reviewer_prompts = [agent_config_manager.get_prompt("role_reviewer")] + effective_system_prompts
+            reviewer_prompts = (agent_config_manager.get_prompt("role_reviewer"), *effective_system_prompts)
 
-            # [B] 지식 로드 및 주입
+            # [B] 지식 로드 및 주입 — 신규 요청 분기와 같이 사용자 메시지 쪽 컨텍스트로 전달
+            wisdom_context = ""
             try:
-                wisdom_entries = graph_manager.load_wisdom(convo_id)
+                wisdom_entries = await asyncio.to_thread(graph_manager.load_wisdom, convo_id)
                 if wisdom_entries:
-                    reviewer_prompts.append(_format_wisdom(wisdom_entries))
+                    wisdom_context = _format_wisdom(wisdom_entries)
             except Exception:
                 pass
 
-            plan_list = await generate_execution_plan(
-                user_query=first_query,
-                requirements_content="",
-                history=history,
-                model_preference=request.model_preference,
-                system_prompts=reviewer_prompts,
-                allowed_skills=effective_allowed_skills,
+            # 같은 상태의 재요청이면 직전에 수립·검증한 계획을 그대로 사용
+            plan_key = (
+                convo_id, tuple(history), first_query, wisdom_context,
+                request.model_preference, reviewer_prompts,
+                tuple(effective_allowed_skills or ()),
             )
+            cached_plan = _get_cached_plan(plan_key)
+
+            # 마무리 단계로 보이면 최종 답변을 재계획과 동시에 선행 요청 (계획이 나오면 취소)
+            final_task = None
+            if cached_plan is None and _likely_final_turn(history):
+                final_task = asyncio.create_task(
+                    generate_final_answer(list(history), request.model_preference)
+                )
+            if cached_plan is not None:
+                plan_list = cached_plan
+            else:
+                try:
+                    plan_list = await generate_execution_plan(
+                        user_query=first_query,
+                        requirements_content=wisdom_context,
+                        history=history,
+                        model_preference=request.model_preference,
+                        system_prompts=reviewer_prompts,
+                        allowed_skills=effective_allowed_skills,
+                    )
+                except BaseException:
+                    if final_task is not None:
+                        final_task.cancel()
+                    raise
+            if plan_list and final_task is not None:
+                final_task.cancel()
+                final_task = None
 
             # [D] 카테고리 → model_preference 자동 적용
             if plan_list:
@@ -362,8 +881,8 @@ async def decide_and_act(request: AgentRequest):
                             if task.model_preference == "auto":
                                 task.model_preference = mp
 
-            # [E] 계획 검증 게이트
-            if plan_list:
+            # [E] 계획 검증 게이트 (캐시된 계획은 이미 통과함)
+            if plan_list and cached_plan is None:
                 try:
                     available = list(tool_registry.get_all_tool_descriptions().keys())
                     validation = await validate_execution_plan(plan_list, available)
@@ -375,7 +894,7 @@ async def decide_and_act(request: AgentRequest):
                         )
                         plan_list = await generate_execution_plan(
                             user_query=first_query,
-                            requirements_content="",
+                            requirements_content=wisdom_context,
                             history=history,
                             model_preference=request.model_preference,
                             system_prompts=reviewer_prompts,
@@ -385,30 +904,49 @@ async def decide_and_act(request: AgentRequest):
                     logging.debug(f"[E-PlanGate] 검증 생략: {val_e}")
 
             if not plan_list:
-                final_answer = await generate_final_answer(history, request.model_preference)
-                history.append(f"최종 답변: {final_answer}")
-
-                title_summary = await generate_title_for_conversation(history, request.model_preference)
+                title_task = _start_title_task(history, request.model_preference)
+                try:
+                    if final_task is not None:
+                        final_answer = await final_task
+                    else:
+                        final_answer = await generate_final_answer(history, request.model_preference)
+                except BaseException:
+                    if title_task is not None:
+                        title_task.cancel()
+                    raise
+                history.append(f"{HISTORY_FINAL_ANSWER_PREFIX} {final_answer}")
+
+                # 제목/키워드/주제 분리는 서로 독립 — 동시에 요청
+                title_summary, keywords, topic_split_info = await asyncio.gather(
+                    title_task or generate_title_for_conversation(history, request.model_preference),
+                    extract_keywords(history, request.model_preference),
+                    detect_topic_split(history, request.model_preference),
+                    return_exceptions=True,
+                )
+                if isinstance(title_summary, Exception):
+                    raise title_summary
 
-                history_manager.save_conversation(
+                await asyncio.to_thread(
+                    _save_conversation,
                     convo_id, history, title_summary, [], 0,
-                    is_final=True
+                    is_final=True, first_user_query=backfill_query,
                 )
 
                 # 키워드 추출 (실패 무시)
-                try:
-                    keywords = await extract_keywords(history, request.model_preference)
-                    if keywords:
-                        graph_manager.assign_keywords_to_conversation(convo_id, keywords)
-                except Exception as e:
-                    logging.warning(f"키워드 추출 실패: {e}")
+                if isinstance(keywords, Exception):
+                    logging.warning(f"키워드 추출 실패: {keywords}")
+                elif keywords:
+                    try:
+                        await asyncio.to_thread(
+                            graph_manager.assign_keywords_to_conversation, convo_id, keywords
+                        )
+                    except Exception as e:
+                        logging.warning(f"키워드 추출 실패: {e}")
 
                 # 주제 분리 감지 (실패 무시)
-                topic_split_info = None
-                try:
-                    topic_split_info = await detect_topic_split(history, request.model_preference)
-                except Exception as e:
-                    logging.warning(f"주제 분리 감지 실패: {e}")
+                if isinstance(topic_split_info, Exception):
+                    logging.warning(f"주제 분리 감지 실패: {topic_split_info}")
+                    topic_split_info = None
 
                 return _resp(
                     conversation_id=convo_id,
@@ -419,10 +957,13 @@ async def decide_and_act(request: AgentRequest):
                 )
             
             history = _prune_history(history)
-            plan_dicts = [group.model_dump() for group in plan_list]
-            history_manager.save_conversation(
-                convo_id, history, data.get("title", "진행 중"), plan_dicts, 0, is_final=False
+            plan_dicts = _PLAN_ADAPTER.dump_python(plan_list)
+            await asyncio.to_thread(
+                _save_conversation,
+                convo_id, history, current_title, plan_dicts, 0, is_final=False,
+                first_user_query=backfill_query, plan_groups=plan_list,
             )
+            _store_cached_plan(plan_key, plan_dicts)
             
             next_group = plan_list[0]
             return _resp(
@@ -434,12 +975,11 @@ async def decide_and_act(request: AgentRequest):
             )
         
         except Exception as e:
-             issue_tracker.capture_exception(
-                 e, context=f"re-plan convo_id={convo_id}", source="agent"
-             )
+             _capture_issue(e, context=f"re-plan convo_id={convo_id}", source="agent")
              history.append(f"다음 단계 계획 중 오류: {e}")
              # (수정 2) 누락된 인자 plan=[], current_group_index=0 추가
-             history_manager.save_conversation(
+             await asyncio.to_thread(
+                 _save_conversation,
                  convo_id, history, "계획 오류", plan=[], current_group_index=0, is_final=False
              )
              return _resp(
@@ -450,6 +990,51 @@ async def decide_and_act(request: AgentRequest):
              )
 
 
+@app.post("/agent/replan", response_model=AgentResponse)
+async def replan(request: ReplanRequest):
+    """그룹 실행 후 다음 단계를 계획합니다 (decide_and_act의 재계획 분기).
+
+    단계마다 전체 이력을 보내고 검증하지 않도록 재계획에 필요한 필드만 받는다.
+    """
+    return await decide_and_act(AgentRequest.model_construct(
+        conversation_id=request.conversation_id,
+        model_preference=request.model_preference,
+        system_prompts=request.system_prompts,
+        persona=request.persona,
+        allowed_skills=request.allowed_skills,
+    ))
+
+
+@app.post("/agent/batch", response_model=BatchAgentResponse)
+async def batch_decide_and_act(request: BatchAgentRequest):
+    """여러 대화의 decide_and_act를 한 번의 HTTP 요청으로 동시에 처리합니다.
+
+    응답은 요청 순서를 따르며, 항목별 실패는 status_code/detail로 돌려준다.
+    같은 대화를 동시에 갱신하지 않도록 conversation_id 중복은 거부한다.
+    """
+    convo_ids = [r.conversation_id for r in request.requests]
+    if len(set(convo_ids)) != len(convo_ids):
+        raise HTTPException(status_code=400, detail="배치 요청에 같은 대화 ID가 중복되었습니다.")
+
+    results = await asyncio.gather(
+        *(decide_and_act(r) for r in request.requests), return_exceptions=True
+    )
+    responses = []
+    for convo_id, result in zip(convo_ids, results):
+        if isinstance(result, HTTPException):
+            responses.append(BatchItemResponse(status_code=result.status_code, detail=str(result.detail)))
+        elif isinstance(result, Exception):
+            _capture_issue(result, context=f"POST /agent/batch convo_id={convo_id}", source="api_server")
+            responses.append(BatchItemResponse(
+                status_code=500, detail=f"내부 서버 오류: {type(result).__name__}"
+            ))
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            responses.append(BatchItemResponse(response=result))
+    return BatchAgentResponse(responses=responses)
+
+
 @app.post("/agent/execute_group", response_model=AgentResponse)
 async def execute_group(request: AgentRequest):
     """
@@ -458,109 +1043,128 @@ async def execute_group(request: AgentRequest):
     """
     token_tracker.begin_tracking()
 
-    data = history_manager.load_conversation(request.conversation_id)
+    data = await asyncio.to_thread(_load_conversation, request.conversation_id)
     if not data:
         raise HTTPException(status_code=404, detail="대화 ID를 찾을 수 없습니다.")
 
     history = data.get("history", [])
     plan_dicts = data.get("plan", [])
     convo_id = data.get("id", request.conversation_id)
+    current_title = data.get("title", "실행 중")
 
     if not plan_dicts:
         raise HTTPException(status_code=400, detail="실행할 계획이 없습니다.")
 
-    plan_list = [ExecutionGroup(**group) for group in plan_dicts]
+    # 직전 계획 저장 시 캐시에 남긴 객체가 있으면 그대로 사용 (실행 중에는 읽기만 함)
+    plan_groups = data.get("plan_groups")
+    plan_list = list(plan_groups) if plan_groups else [_construct_group(group) for group in plan_dicts]
 
-    async def _execute_single_task(task, session_id) -> tuple:
-        """단일 태스크를 실행하고 (tool_name, result_str, exc | None) 튜플을 반환."""
-        # P3-D: on-demand MCP 서버 지연 연결
-        await tool_registry.ensure_tool_server_connected(task.tool_name)
+    # 같은 도구가 여러 태스크에 반복되는 계획 대비 — 요청 단위로 조회 결과 재사용
+    tool_cache: dict = {}
+    providers_checked: set = set()
 
-        tool_function = tool_registry.get_tool(task.tool_name)
-        if not tool_function:
-            raise ValueError(f"'{task.tool_name}' 도구를 찾을 수 없습니다.")
+    async def _execute_single_task(task, session_id, pending_logs: list) -> tuple:
+        """단일 태스크를 실행하고 (tool_name, result_str, exc | None) 튜플을 반환.
 
-        providers = tool_registry.get_tool_providers(task.tool_name)
-        if len(providers) >= 2:
-            server_names = [p["server"] for p in providers]
-            logging.info(f"Tool '{task.tool_name}' has multiple providers: {server_names}")
-
-        _validate_tool_arguments(tool_function, task.tool_name, task.arguments)
+        사용 로그는 즉시 기록하지 않고 pending_logs에 모아 그룹 단위로 일괄 기록한다.
+        예외를 밖으로 던지지 않으므로 gather 결과는 항상 튜플이다.
+        """
+        try:
+            # P3-D: on-demand MCP 서버 지연 연결
+            await tool_registry.ensure_tool_server_connected(task.tool_name)
 
-        t_start = time.monotonic()
+            tool_function = tool_cache.get(task.tool_name)
+            if tool_function is None:
+                tool_function = tool_registry.get_tool(task.tool_name)
+                if not tool_function:
+                    raise ValueError(f"'{task.tool_name}' 도구를 찾을 수 없습니다.")
+                tool_cache[task.tool_name] = tool_function
+
+            if task.tool_name not in providers_checked:
+                providers_checked.add(task.tool_name)
+                # get_tool_providers는 레지스트리의 리스트를 그대로 돌려주는 O(1) 조회 —
+                # 서버 이름 목록은 INFO 로그가 실제로 출력될 때만 만든다
+                providers = tool_registry.get_tool_providers(task.tool_name)
+                if len(providers) >= 2 and logging.getLogger().isEnabledFor(logging.INFO):
+                    server_names = [p["server"] for p in providers]
+                    logging.info(f"Tool '{task.tool_name}' has multiple providers: {server_names}")
+
+            _validate_tool_arguments(tool_function, task.tool_name, task.arguments)
+        except Exception as setup_err:
+            # 도구 조회/인자 검증 실패 — 실행 전이므로 사용 로그는 남기지 않음
+            return task.tool_name, "", setup_err
+
+        args_summary = ",".join(task.arguments)
+        t_start = time.perf_counter_ns()
         try:
-            if inspect.iscoroutinefunction(tool_function):
+            if _is_coroutine_tool(tool_function):
                 result = await tool_function(**task.arguments)
             else:
-                result = tool_function(**task.arguments)
-            duration_ms = int((time.monotonic() - t_start) * 1000)
-            try:
-                mcp_db_manager.log_usage(
-                    task.tool_name, success=True, session_id=session_id,
-                    duration_ms=duration_ms, args_summary=",".join(task.arguments.keys()),
-                )
-            except Exception as log_err:
-                logging.warning(f"mcp_db_manager.log_usage 실패: {log_err}")
-            result_str = str(result)
-            if len(result_str) > MAX_TOOL_RESULT_LENGTH:
-                logging.warning(
-                    f"도구 '{task.tool_name}' 결과가 {MAX_TOOL_RESULT_LENGTH}자를 초과하여 잘렸습니다. "
-                    f"(원래 길이: {len(result_str)}자)"
-                )
-                result_str = result_str[:MAX_TOOL_RESULT_LENGTH] + "... (결과가 너무 길어 잘림)"
-            return task.tool_name, result_str, None
+                # 동기 도구는 스레드에서 실행 — 이벤트 루프(다른 요청) 블로킹 방지
+                result = await asyncio.to_thread(tool_function, **task.arguments)
+            duration_ms = (time.perf_counter_ns() - t_start) // 1_000_000
+            pending_logs.append({
+                "func_name": task.tool_name, "success": True, "session_id": session_id,
+                "duration_ms": duration_ms, "args_summary": args_summary,
+            })
+            return task.tool_name, await _summarize_or_spill(convo_id, task.tool_name, result), None
         except Exception as tool_err:
-            duration_ms = int((time.monotonic() - t_start) * 1000)
-            try:
-                mcp_db_manager.log_usage(
-                    task.tool_name, success=False, session_id=session_id,
-                    duration_ms=duration_ms, error_message=str(tool_err),
-                    args_summary=",".join(task.arguments.keys()),
-                )
-            except Exception as log_err:
-                logging.warning(f"mcp_db_manager.log_usage 실패: {log_err}")
+            duration_ms = (time.perf_counter_ns() - t_start) // 1_000_000
+            pending_logs.append({
+                "func_name": task.tool_name, "success": False, "session_id": session_id,
+                "duration_ms": duration_ms, "error_message": str(tool_err),
+                "args_summary": args_summary,
+            })
             return task.tool_name, "", tool_err
 
     async def _run_single_group(grp: ExecutionGroup) -> tuple:
         """단일 그룹의 모든 태스크를 실행합니다. (success: bool, exc: Exception|None) 반환."""
         sess_id = None
         try:
-            sess_id = mcp_db_manager.start_session(
+            sess_id = await asyncio.to_thread(
+                mcp_db_manager.start_session,
                 conversation_id=convo_id, group_id=grp.group_id
             )
         except Exception as e:
             logging.warning(f"mcp_db_manager.start_session 실패: {e}")
 
-        history.append(f"그룹 실행 시작: [{grp.group_id}] {grp.description}")
-        for task in grp.tasks:
-            history.append(f"  - 도구 실행: {task.tool_name} (인자: {task.arguments})")
+        history.append(f"{HISTORY_GROUP_START_PREFIX} [{grp.group_id}] {grp.description}")
+        history.extend(
+            f"{HISTORY_TOOL_RUN_PREFIX} {task.tool_name} (인자: {task.arguments})" for task in grp.tasks
+        )
 
         try:
             # P3-A: 그룹 내 태스크를 asyncio.gather로 병렬 실행
+            pending_logs: list = []
             results = await asyncio.gather(
-                *[_execute_single_task(task, sess_id) for task in grp.tasks],
-                return_exceptions=True,
+                *[_execute_single_task(task, sess_id, pending_logs) for task in grp.tasks]
             )
+            # 태스크별 사용 로그를 한 트랜잭션으로 기록 — 결과 반환은 DB 쓰기를 기다리지 않음
+            if pending_logs:
+                _run_in_background(mcp_db_manager.log_usage_bulk, pending_logs)
             first_exc = None
+            result_lines = []
             for tool_name, result_str, exc in results:
                 if exc is not None:
                     first_exc = exc
-                    history.append(f"  - 실행 오류 ({tool_name}): {exc}")
+                    result_lines.append(f"{HISTORY_ERROR_PREFIX} ({tool_name}): {exc}")
                 else:
-                    history.append(f"  - 실행 결과 ({tool_name}): {result_str}")
+                    result_lines.append(f"{HISTORY_RESULT_PREFIX} ({tool_name}): {result_str}")
+            # 병렬 그룹이 같은 history를 공유하므로 그룹 결과를 한 번에 추가
+            history.extend(result_lines)
 
             if first_exc is not None:
                 try:
                     if sess_id:
-                        mcp_db_manager.end_session(sess_id, overall_success=False)
+                        await asyncio.to_thread(mcp_db_manager.end_session, sess_id, overall_success=False)
                 except Exception:
                     pass
                 return False, first_exc
 
-            history.append(f"그룹 실행 완료: [{grp.group_id}]")
+            history.append(f"{HISTORY_GROUP_DONE_PREFIX} [{grp.group_id}]")
             try:
                 if sess_id:
-                    mcp_db_manager.end_session(sess_id, overall_success=True)
+                    await asyncio.to_thread(mcp_db_manager.end_session, sess_id, overall_success=True)
             except Exception as end_err:
                 logging.warning(f"mcp_db_manager.end_session 실패: {end_err}")
             return True, None
@@ -568,7 +1172,7 @@ async def execute_group(request: AgentRequest):
         except Exception as e:
             try:
                 if sess_id:
-                    mcp_db_manager.end_session(sess_id, overall_success=False)
+                    await asyncio.to_thread(mcp_db_manager.end_session, sess_id, overall_success=False)
             except Exception:
                 pass
             return False, e
@@ -605,11 +1209,14 @@ async def execute_group(request: AgentRequest):
         if is_validation_err:
             logging.warning(f"execute_group 검증 오류 [{failed_group_id}]: {overall_error}")
         else:
-            issue_tracker.capture_exception(
+            _capture_issue(
                 overall_error, context=f"execute_group group_id={failed_group_id}", source="tool"
             )
         history.append(f"그룹 실행 중 오류 발생: {overall_error}")
-        history_manager.save_conversation(convo_id, history, "실행 오류", plan_dicts, 0, is_final=False)
+        await asyncio.to_thread(
+            _save_conversation,
+            convo_id, history, HISTORY_ERROR_LABEL, plan_dicts, 0, is_final=False
+        )
         return _resp(
             conversation_id=convo_id,
             status="ERROR",
@@ -617,17 +1224,18 @@ async def execute_group(request: AgentRequest):
             message=f"그룹 '{failed_group_id}' 실행 중 오류: {overall_error}",
         )
 
-    history_manager.save_conversation(
-        convo_id, history, data.get("title", "실행 중"), [], 0, is_final=False
+    await asyncio.to_thread(
+        _save_conversation,
+        convo_id, history, current_title, [], 0, is_final=False
     )
 
     # [B] 실행 결과에서 지식 추출 (백그라운드식, 실패 무시)
     try:
-        result_lines = [h for h in history[-20:] if "실행 결과" in h]
+        result_lines = [h for h in history[-20:] if h.startswith(HISTORY_RESULT_PREFIX)]
         ctx = history[0] if history else ""
         wisdom = await extract_wisdom(result_lines, ctx)
         if wisdom:
-            graph_manager.save_wisdom(convo_id, wisdom)
+            await asyncio.to_thread(graph_manager.save_wisdom, convo_id, wisdom)
             executed_ids = [g.group_id for g in plan_list]
             logging.info(f"[B-Wisdom] {len(wisdom)}개 지식 저장 (그룹: {executed_ids})")
     except Exception as we:
@@ -654,16 +1262,17 @@ async def pipeline_endpoint(request: AgentRequest):
     """
     token_tracker.begin_tracking()
 
-    data = history_manager.load_conversation(request.conversation_id)
+    data = await asyncio.to_thread(_load_conversation, request.conversation_id) or {}
     history = data.get("history", []) if data else list(request.history)
-    convo_id = data.get("id", request.conversation_id) if data else request.conversation_id
+    convo_id = data.get("id", request.conversation_id)
 
     # 페르소나 해석 (기존 방식과 동일)
     persona_prompt = ""
     effective_allowed_skills = request.allowed_skills
 
     if not request.system_prompts:
-        persona = agent_config_manager.get_effective_persona(
+        persona = await asyncio.to_thread(
+            agent_config_manager.get_effective_persona,
             query=request.user_input or "",
             explicit_name=request.persona,
         )
@@ -675,7 +1284,7 @@ async def pipeline_endpoint(request: AgentRequest):
         persona_prompt = "\n".join(request.system_prompts)
 
     try:
-        cursor = pipeline_db.get_cursor(convo_id)
+        cursor = await asyncio.to_thread(pipeline_db.get_cursor, convo_id)
 
         # ── 설계 확인/거부 처리 ─────────────────────────────────────
         if request.pipeline_action == "reject_design":
@@ -683,10 +1292,14 @@ async def pipeline_endpoint(request: AgentRequest):
                 (request.pipeline_state or {}).get("design_id")
             )
             if design_id:
-                pipeline_db.reject_design(design_id)
+                await asyncio.to_thread(pipeline_db.reject_design, design_id)
                 history.append("설계 거부됨. 재설계 진행.")
             # 새 설계 생성 (user_input 없으면 원래 쿼리 재사용)
-            query = request.user_input or _extract_first_query(history)
+            query = (
+                request.user_input
+                or data.get("first_user_query")
+                or _extract_first_query(history)
+            )
             return await pipeline_manager.start_design_phase(
                 conversation_id=convo_id,
                 query=query,
@@ -728,11 +1341,12 @@ async def pipeline_endpoint(request: AgentRequest):
             try:
                 intent = await classify_intent(request.user_input, "standard")
                 if intent == "chat":
-                    history.append(f"사용자 요청: {request.user_input}")
+                    history.append(f"{HISTORY_USER_REQ_PREFIX} {request.user_input}")
                     direct = await generate_final_answer(history, request.model_preference)
-                    history.append(f"최종 답변: {direct}")
+                    history.append(f"{HISTORY_FINAL_ANSWER_PREFIX} {direct}")
                     title = await generate_title_for_conversation(history, request.model_preference)
-                    history_manager.save_conversation(
+                    await asyncio.to_thread(
+                        _save_conversation,
                         convo_id, history, title, [], 0, is_final=True
                     )
                     return _resp(
@@ -763,14 +1377,7 @@ async def pipeline_endpoint(request: AgentRequest):
     except HTTPException:
         raise
     except Exception as e:
-        import traceback as _tb
-        issue_tracker.capture(
-            error_message=str(e),
-            error_type=type(e).__name__,
-            traceback=_tb.format_exc(),
-            context=f"pipeline_endpoint convo_id={convo_id}",
-            source="pipeline",
-        )
+        _capture_issue(e, context=f"pipeline_endpoint convo_id={convo_id}", source="pipeline")
         return _resp(
             conversation_id=convo_id,
             status="ERROR",
@@ -779,6 +1386,21 @@ async def pipeline_endpoint(request: AgentRequest):
         )
 
 
+def _record_template_failures(convo_id: str, count: int) -> None:
+    """현재 파이프라인 계획의 템플릿 실패 횟수를 count만큼 올립니다 (동기, 스레드에서 실행)."""
+    cursor = pipeline_db.get_cursor(convo_id)
+    if not (cursor and cursor.get("plan_id")):
+        return
+    with pipeline_db.get_db() as conn:
+        row = conn.execute(
+            "SELECT template_id FROM task_plans WHERE id=?",
+            (cursor["plan_id"],)
+        ).fetchone()
+    if row and row["template_id"]:
+        for _ in range(count):
+            pipeline_db.increment_template_fail(row["template_id"])
+
+
 @app.post("/agent/pipeline/execute", response_model=AgentResponse)
 async def pipeline_execute(request: AgentRequest):
     """파이프라인 전용 그룹 실행 엔드포인트.
@@ -789,77 +1411,90 @@ async def pipeline_execute(request: AgentRequest):
     """
     token_tracker.begin_tracking()
 
-    data = history_manager.load_conversation(request.conversation_id)
+    data = await asyncio.to_thread(_load_conversation, request.conversation_id)
     if not data:
         raise HTTPException(status_code=404, detail="대화 ID를 찾을 수 없습니다.")
 
     history = data.get("history", [])
     plan_dicts = data.get("plan", [])
     convo_id = data.get("id", request.conversation_id)
+    current_title = data.get("title", "실행 중")
 
     if not plan_dicts:
         raise HTTPException(status_code=400, detail="실행할 계획이 없습니다.")
 
     group_dict = plan_dicts[0]
-    group_to_execute = ExecutionGroup(**group_dict)
-    history.append(f"그룹 실행 시작: [{group_to_execute.group_id}] {group_to_execute.description}")
+    group_to_execute = _construct_group(group_dict)
+    history.append(f"{HISTORY_GROUP_START_PREFIX} [{group_to_execute.group_id}] {group_to_execute.description}")
 
     session_id = None
     overall_success = True
     try:
-        session_id = mcp_db_manager.start_session(convo_id, group_to_execute.group_id)
+        session_id = await asyncio.to_thread(
+            mcp_db_manager.start_session, convo_id, group_to_execute.group_id
+        )
     except Exception as e:
         logging.warning(f"start_session 실패: {e}")
 
     # 기존 execute_group과 동일한 실행 로직 (tool_registry 호출)
-    results = []
-    for task in group_to_execute.tasks:
+    tool_cache: dict = {}
+    pending_logs: list = []
+
+    async def _run_task(task) -> tuple:
         try:
             await tool_registry.ensure_tool_server_connected(task.tool_name)
-            tool_fn = tool_registry.get_tool(task.tool_name)
-            if not tool_fn:
-                raise ValueError(f"'{task.tool_name}' 도구를 찾을 수 없습니다.")
+            tool_fn = tool_cache.get(task.tool_name)
+            if tool_fn is None:
+                tool_fn = tool_registry.get_tool(task.tool_name)
+                if not tool_fn:
+                    raise ValueError(f"'{task.tool_name}' 도구를 찾을 수 없습니다.")
+                tool_cache[task.tool_name] = tool_fn
             _validate_tool_arguments(tool_fn, task.tool_name, task.arguments)
-            t0 = time.monotonic()
-            if inspect.iscoroutinefunction(tool_fn):
+            t0 = time.perf_counter_ns()
+            if _is_coroutine_tool(tool_fn):
                 result = await tool_fn(**task.arguments)
             else:
-                result = tool_fn(**task.arguments)
-            dur = int((time.monotonic() - t0) * 1000)
-            result_str = str(result)[:MAX_TOOL_RESULT_LENGTH]
-            mcp_db_manager.log_usage(task.tool_name, success=True, session_id=session_id,
-                                     duration_ms=dur)
-            results.append((task.tool_name, result_str, None))
+                result = await asyncio.to_thread(tool_fn, **task.arguments)
+            dur = (time.perf_counter_ns() - t0) // 1_000_000
+            pending_logs.append({
+                "func_name": task.tool_name, "success": True,
+                "session_id": session_id, "duration_ms": dur,
+            })
+            return task.tool_name, await _summarize_or_spill(convo_id, task.tool_name, result), None
         except Exception as exc:
-            results.append((task.tool_name, "", exc))
-            overall_success = False
+            return task.tool_name, "", exc
 
-    has_error = False
+    # 그룹 내 태스크는 서로 독립 — execute_group과 같이 동시 실행 (결과 순서는 태스크 순서 유지)
+    results = await asyncio.gather(*[_run_task(t) for t in group_to_execute.tasks])
+    if pending_logs:
+        _run_in_background(mcp_db_manager.log_usage_bulk, pending_logs)
+    if any(exc is not None for _, _, exc in results):
+        overall_success = False
+
+    fail_count = 0
     for tool_name, result_str, exc in results:
         if exc is not None:
-            has_error = True
-            history.append(f"  - 실행 오류 ({tool_name}): {exc}")
-            # 파이프라인 템플릿 실패 카운트
-            cursor = pipeline_db.get_cursor(convo_id)
-            if cursor and cursor.get("plan_id"):
-                with pipeline_db.get_db() as conn:
-                    row = conn.execute(
-                        "SELECT template_id FROM task_plans WHERE id=?",
-                        (cursor["plan_id"],)
-                    ).fetchone()
-                    if row and row["template_id"]:
-                        pipeline_db.increment_template_fail(row["template_id"])
+            fail_count += 1
+            history.append(f"{HISTORY_ERROR_PREFIX} ({tool_name}): {exc}")
         else:
-            history.append(f"  - 실행 결과 ({tool_name}): {result_str}")
+            history.append(f"{HISTORY_RESULT_PREFIX} ({tool_name}): {result_str}")
+    has_error = fail_count > 0
+    if has_error:
+        # 파이프라인 템플릿 실패 카운트 (실패한 태스크 수만큼)
+        await asyncio.to_thread(_record_template_failures, convo_id, fail_count)
 
     try:
         if session_id:
-            mcp_db_manager.end_session(session_id, overall_success=overall_success)
+            await asyncio.to_thread(
+                mcp_db_manager.end_session, session_id, overall_success=overall_success
+            )
     except Exception as e:
         logging.warning(f"end_session 실패: {e}")
 
     if has_error:
-        history_manager.save_conversation(convo_id, history, "실행 오류", plan_dicts, 0, is_final=False)
+        await asyncio.to_thread(
+            _save_conversation, convo_id, history, HISTORY_ERROR_LABEL, plan_dicts, 0, is_final=False
+        )
         return _resp(
             conversation_id=convo_id,
             status="ERROR",
@@ -868,12 +1503,16 @@ async def pipeline_execute(request: AgentRequest):
         )
 
     # 성공 → 템플릿 학습
-    cursor = pipeline_db.get_cursor(convo_id)
+    cursor = await asyncio.to_thread(pipeline_db.get_cursor, convo_id)
     if cursor and cursor.get("plan_id"):
-        pipeline_manager.record_execution_success(cursor["plan_id"], group_dict)
+        await asyncio.to_thread(
+            pipeline_manager.record_execution_success, cursor["plan_id"], group_dict
+        )
 
-    history.append(f"그룹 실행 완료: [{group_to_execute.group_id}]")
-    history_manager.save_conversation(convo_id, history, data.get("title", "실행 중"), [], 0, is_final=False)
+    history.append(f"{HISTORY_GROUP_DONE_PREFIX} [{group_to_execute.group_id}]")
+    await asyncio.to_thread(
+        _save_conversation, convo_id, history, current_title, [], 0, is_final=False
+    )
 
     return _resp(
         conversation_id=convo_id,
@@ -885,7 +1524,6 @@ async def pipeline_execute(request: AgentRequest):
 
 
 # StaticFiles는 반드시 마지막에 마운트 (라우팅 우선순위)
-import os as _os
-_static_dir = _os.path.join(_os.path.dirname(_os.path.dirname(__file__)), "static")
-if _os.path.isdir(_static_dir):
+_static_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
+if os.path.isdir(_static_dir):
     app.mount("/", StaticFiles(directory=_static_dir, html=True), name="static")
@@ -6,12 +6,16 @@ import httpx
 import os
 import json
 import logging
+import re
 from dotenv import load_dotenv
 from .tool_registry import get_filtered_tool_descriptions
 from .models import ExecutionGroup
-from .constants import HISTORY_MAX_CHARS
+from .constants import HISTORY_RESULT_PREFIX
+from .http_client import get_http_client
+from .llm_client import truncate_history as _truncate_history
 from . import agent_config_manager as _acm
-from typing import Dict, Any, List, Literal, Optional
+from . import token_tracker
+from typing import Dict, Any, List, Literal, Optional, Sequence
 
 load_dotenv()
 
@@ -24,31 +28,13 @@ STANDARD_MODEL_NAME = os.getenv("CLAUDE_STANDARD_MODEL", "claude-haiku-4-5-20251
 
 ModelPreference = Literal["auto", "standard", "high"]
 
-DEFAULT_HISTORY_MAX_CHARS = HISTORY_MAX_CHARS  # constants.py에서 중앙 관리
+# 응답이 ```json ... ``` 코드 블록으로 감싸진 경우 본문 추출용
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
 
 
-def _truncate_history(history: list, max_chars: int = DEFAULT_HISTORY_MAX_CHARS) -> str:
-    """최근 대화 우선 보존하는 캐릭터 예산 기반 히스토리 truncation.
-
-    뒤(최신)부터 역순으로 항목을 추가하되, max_chars를 초과하면 중단합니다.
-    """
-    if not history:
-        return ""
-
-    selected = []
-    total = 0
-    for item in reversed(history):
-        item_len = len(item)
-        if total + item_len > max_chars and selected:
-            break
-        selected.append(item)
-        total += item_len
-
-    selected.reverse()
-
-    if len(selected) < len(history):
-        return "... (이전 기록 생략) ...\n" + "\n".join(selected)
-    return "\n".join(selected)
+def _http_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프의 공유 AsyncClient를 반환합니다."""
+    return get_http_client("claude", 120)
 
 
 def _get_model_name(
@@ -69,8 +55,13 @@ async def _call_claude(
     user: str,
     model: str,
     json_mode: bool = False,
+    cache_system: bool = False,
 ) -> str:
-    """Claude Messages API 호출 내부 헬퍼."""
+    """Claude Messages API 호출 내부 헬퍼.
+
+    cache_system=True이면 system 블록에 cache_control을 붙여 프롬프트 캐시 접두사로 사용한다.
+    (모델별 최소 길이 미만이면 API가 캐시 없이 처리)
+    """
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         raise RuntimeError("ANTHROPIC_API_KEY가 설정되지 않았습니다. .env 파일에 ANTHROPIC_API_KEY를 설정해주세요.")
@@ -78,7 +69,10 @@ async def _call_claude(
     payload: Dict[str, Any] = {
         "model": model,
         "max_tokens": 4096,
-        "system": system,
+        "system": (
+            [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+            if cache_system else system
+        ),
         "messages": [{"role": "user", "content": user}],
     }
 
@@ -88,18 +82,16 @@ async def _call_claude(
         "content-type": "application/json",
     }
 
-    async with httpx.AsyncClient(timeout=120) as client:
-        resp = await client.post(
-            "https://api.anthropic.com/v1/messages",
-            headers=headers,
-            json=payload,
-        )
-        resp.raise_for_status()
-        data = resp.json()
+    resp = await _http_client().post(
+        "https://api.anthropic.com/v1/messages",
+        headers=headers,
+        json=payload,
+    )
+    resp.raise_for_status()
+    data = resp.json()
 
     # 토큰 사용량 기록
     try:
-        from . import token_tracker
         _usage = data.get("usage", {})
         def _to_int(v):
             try:
@@ -133,7 +125,7 @@ async def generate_execution_plan(
     requirements_content: str,
     history: list,
     model_preference: ModelPreference = "auto",
-    system_prompts: List[str] = None,
+    system_prompts: Sequence[str] = None,
     allowed_skills: Optional[List[str]] = None,
 ) -> List[ExecutionGroup]:
     """
@@ -155,12 +147,14 @@ async def generate_execution_plan(
     )
 
     try:
-        text = await _call_claude(system=system, user=user, model=model_name, json_mode=True)
+        # system(페르소나 + 플래너 지시)은 턴 간 동일하므로 캐시 접두사로 표시
+        text = await _call_claude(
+            system=system, user=user, model=model_name, json_mode=True, cache_system=True,
+        )
 
         # JSON 블록 추출 (```json ... ``` 감싸진 경우 처리)
         if "```" in text:
-            import re
-            match = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
+            match = _JSON_FENCE_RE.search(text)
             if match:
                 text = match.group(1).strip()
 
@@ -197,7 +191,7 @@ async def generate_final_answer(
         return text.strip()
     except Exception as e:
         logging.error(f"Executor (generate_final_answer) 오류: {e}", exc_info=True)
-        last_result = next((item for item in reversed(history) if item.startswith("  - 실행 결과:")), None)
+        last_result = next((item for item in reversed(history) if item.startswith(HISTORY_RESULT_PREFIX)), None)
         if last_result:
             return f"최종 요약 생성에 실패했습니다 (서버 로그 참조). 마지막 실행 결과입니다:\n{last_result}"
         else:
@@ -220,8 +214,7 @@ async def extract_keywords(
     try:
         text = await _call_claude(system=system, user=user, model=model_name, json_mode=True)
         if "```" in text:
-            import re
-            match = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
+            match = _JSON_FENCE_RE.search(text)
             if match:
                 text = match.group(1).strip()
         parsed = json.loads(text)
@@ -251,8 +244,7 @@ async def detect_topic_split(
     try:
         text = await _call_claude(system=system, user=user, model=model_name, json_mode=True)
         if "```" in text:
-            import re
-            match = re.search(r"```(?:json)?\s*([\s\S]*?)```", text)
+            match = _JSON_FENCE_RE.search(text)
             if match:
                 text = match.group(1).strip()
         parsed = json.loads(text)
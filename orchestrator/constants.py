@@ -7,6 +7,7 @@
 값 변경 시 이 파일만 수정하면 됩니다.
 """
 
+import time
 from datetime import datetime, timezone
 from typing import Final
 
@@ -22,6 +23,9 @@ MAX_FUNC_NAMES_PER_SESSION: Final[int] = 1000
 # 도구 실행 결과 최대 문자 수 (초과 시 잘림 처리)
 MAX_TOOL_RESULT_LENGTH: Final[int] = 1000
 
+# artifacts/에 보관하는 잘린 도구 결과 파일 최대 개수 (초과 시 오래된 파일부터 삭제)
+ARTIFACTS_MAX_FILES: Final[int] = 500
+
 # 요구사항 파일 최대 크기 (1 MB)
 MAX_REQUIREMENT_FILE_SIZE: Final[int] = 1 * 1024 * 1024
 
@@ -36,7 +40,8 @@ def utcnow() -> str:
     issue_tracker.py 등 전 모듈에서 일관된 UTC 타임스탬프를 사용하기 위한
     중앙 헬퍼 함수입니다. naive datetime(timezone 없음) 대신 UTC 기준을 사용합니다.
     """
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+    # datetime 객체 생성 없이 time.gmtime()으로 동일 형식을 만든다
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
 
 
 def utcnow_timestamp() -> float:
@@ -60,3 +65,35 @@ PLAN_VALIDATION_MIN_SCORE: float = 0.6
 
 # 누적 지식 최대 항목 수 (대화당) [B]
 WISDOM_MAX_ENTRIES: int = 50
+
+# 최종 답변 선행 요청 기준 — 최근 이력의 성공 실행 결과가 이 개수 이상이면
+# 재계획과 동시에 최종 답변 생성을 시작한다
+SPECULATIVE_FINAL_MIN_RESULTS: int = 3
+
+# 의도 분류 결과 캐시 최대 항목 수 — 초과 시 가장 오래된 항목부터 제거
+INTENT_CACHE_MAX_ENTRIES: int = 512
+
+# 대화 이력 항목 접두어 — api.py/pipeline_manager.py가 기록하고,
+# 재계획 판단과 LLM 클라이언트의 이력 축약·실패 대체 응답이 같은 값으로 인식한다
+HISTORY_USER_REQ_PREFIX: str = "사용자 요청:"
+HISTORY_GROUP_START_PREFIX: str = "그룹 실행 시작:"
+HISTORY_GROUP_DONE_PREFIX: str = "그룹 실행 완료:"
+HISTORY_TOOL_RUN_PREFIX: str = "  - 도구 실행:"
+HISTORY_RESULT_PREFIX: str = "  - 실행 결과"
+HISTORY_ERROR_LABEL: str = "실행 오류"
+HISTORY_ERROR_PREFIX: str = "  - " + HISTORY_ERROR_LABEL
+HISTORY_FINAL_ANSWER_PREFIX: str = "최종 답변:"
+
+# 대화 로드 캐시 최대 항목 수 — 초과 시 가장 오래 갱신되지 않은 대화부터 제거
+CONV_CACHE_MAX_ENTRIES: int = 256
+
+# 재계획 결과 캐시 — 같은 대화 상태로 다시 요청(재시도/새로고침)하면 직전 계획을 재사용
+PLAN_CACHE_TTL_SEC: int = 300
+PLAN_CACHE_MAX_ENTRIES: int = 256
+
+# 설정 읽기 캐시의 config_version 재확인 간격 — 이 프로세스의 변경은 즉시 무효화되고,
+# 다른 프로세스(CLI 등)의 변경만 최대 이 시간만큼 늦게 반영된다
+CONFIG_VERSION_CHECK_SEC: float = 1.0
+
+# 백그라운드 이슈 기록 동시 대기 상한 — 오류가 몰리면 초과분은 로그만 남기고 버린다
+ISSUE_CAPTURE_MAX_PENDING: int = 64
@@ -10,9 +10,11 @@ import logging
 from dotenv import load_dotenv
 from .tool_registry import get_all_tool_descriptions, get_filtered_tool_descriptions
 from .models import ToolCall, ExecutionGroup
-from .constants import HISTORY_MAX_CHARS
+from .constants import HISTORY_RESULT_PREFIX
+from .llm_client import truncate_history as _truncate_history
 from . import agent_config_manager as _acm
-from typing import Dict, Any, List, Literal, Optional
+from . import token_tracker
+from typing import Dict, Any, List, Literal, Optional, Sequence
 
 load_dotenv()
 
@@ -29,13 +31,9 @@ STANDARD_MODEL_NAME = os.getenv("GEMINI_STANDARD_MODEL", "gemini-2.0-flash-lite-
 ModelPreference = Literal["auto", "standard", "high"]
 
 
-DEFAULT_HISTORY_MAX_CHARS = HISTORY_MAX_CHARS  # constants.py에서 중앙 관리
-
-
 def _record_usage(response, model_name: str) -> None:
     """Gemini 응답의 usage_metadata를 token_tracker에 기록합니다. 실패는 무시."""
     try:
-        from . import token_tracker
         um = response.usage_metadata
         token_tracker.record(
             provider="gemini",
@@ -47,29 +45,6 @@ def _record_usage(response, model_name: str) -> None:
         pass
 
 
-def _truncate_history(history: list, max_chars: int = DEFAULT_HISTORY_MAX_CHARS) -> str:
-    """최근 대화 우선 보존하는 캐릭터 예산 기반 히스토리 truncation.
-
-    뒤(최신)부터 역순으로 항목을 추가하되, max_chars를 초과하면 중단합니다.
-    """
-    if not history:
-        return ""
-
-    selected = []
-    total = 0
-    for item in reversed(history):
-        item_len = len(item)
-        if total + item_len > max_chars and selected:
-            break
-        selected.append(item)
-        total += item_len
-
-    selected.reverse()
-
-    if len(selected) < len(history):
-        return "... (이전 기록 생략) ...\n" + "\n".join(selected)
-    return "\n".join(selected)
-
 JSON_CONFIG = types.GenerateContentConfig(
     response_mime_type="application/json",
 )
@@ -102,7 +77,7 @@ async def generate_execution_plan(
     requirements_content: str,
     history: list,
     model_preference: ModelPreference = "auto",
-    system_prompts: List[str] = None,
+    system_prompts: Sequence[str] = None,
     allowed_skills: Optional[List[str]] = None,
 ) -> List[ExecutionGroup]:
     """
@@ -186,7 +161,7 @@ async def generate_final_answer(
     except Exception as e:
         logging.error(f"Executor (generate_final_answer) 오류: {e}", exc_info=True)
 
-        last_result = next((item for item in reversed(history) if item.startswith("  - 실행 결과:")), None)
+        last_result = next((item for item in reversed(history) if item.startswith(HISTORY_RESULT_PREFIX)), None)
 
         if last_result:
             return f"최종 요약 생성에 실패했습니다 (서버 로그 참조). 마지막 실행 결과입니다:\n{last_result}"
@@ -6,6 +6,7 @@
 import json
 import logging
 import sqlite3
+import threading
 import uuid
 from contextlib import contextmanager
 from datetime import datetime
@@ -17,6 +18,8 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
+from .json_codec import dumps as _dumps, loads as _loads
+
 _BASE_DIR = Path(__file__).parent.parent
 HISTORY_DIR = _BASE_DIR / "history"
 HISTORY_DIR.mkdir(exist_ok=True)
@@ -26,13 +29,41 @@ console = Console()
 
 
 # ── DB 연결 / 초기화 ─────────────────────────────────────────────
-
-@contextmanager
-def get_db(path: Path = DB_PATH):
-    conn = sqlite3.connect(str(path))
+# 연결 열기/닫기가 조회 자체보다 비싸므로 스레드별·경로별로 연결 1개를 재사용한다.
+# 사용 중인 연결은 풀에서 꺼내 두므로, 같은 스레드의 중첩 get_db는 기존처럼 별도 연결을 연다.
+# 스레드당 경로 수는 _POOL_MAX_PER_THREAD로 제한하고(넘치면 가장 오래된 연결을 닫음),
+# 쉬고 있는 연결은 _IDLE_CONNS에도 등록해 close_all()이 다른 스레드의 연결까지 닫을 수 있게 한다.
+_LOCAL = threading.local()
+_POOL_MAX_PER_THREAD = 4
+_POOL_LOCK = threading.Lock()
+_IDLE_CONNS: set = set()
+
+
+def _connect(key: str) -> sqlite3.Connection:
+    # 한 번에 한 스레드만 쓰지만, close_all()이 종료 시 다른 스레드에서 닫을 수 있도록 허용
+    conn = sqlite3.connect(key, check_same_thread=False)
     conn.execute("PRAGMA journal_mode=WAL")
+    # WAL에서는 NORMAL로도 커밋 내구성(크래시 시 DB 손상 없음)이 유지되며 커밋당 fsync가 줄어든다
+    conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA temp_store=MEMORY")
     conn.row_factory = sqlite3.Row
+    return conn
+
+
+@contextmanager
+def get_db(path: Path = DB_PATH):
+    key = str(path)
+    pool = getattr(_LOCAL, "conns", None)
+    if pool is None:
+        pool = _LOCAL.conns = {}
+    with _POOL_LOCK:
+        conn = pool.pop(key, None)
+        if conn is not None and conn not in _IDLE_CONNS:
+            conn = None  # close_all()로 이미 닫힘
+        _IDLE_CONNS.discard(conn)
+    if conn is None:
+        conn = _connect(key)
     try:
         yield conn
         conn.commit()
@@ -40,7 +71,34 @@ def get_db(path: Path = DB_PATH):
         conn.rollback()
         raise
     finally:
-        conn.close()
+        evicted = None
+        with _POOL_LOCK:
+            if key in pool:
+                # 중첩 호출이 먼저 반납함 — 풀에는 하나만 유지
+                evicted = conn
+            else:
+                if len(pool) >= _POOL_MAX_PER_THREAD:
+                    evicted = pool.pop(next(iter(pool)))
+                    _IDLE_CONNS.discard(evicted)
+                pool[key] = conn
+                _IDLE_CONNS.add(conn)
+        if evicted is not None:
+            evicted.close()
+
+
+def close_all() -> None:
+    """풀에서 쉬고 있는 모든 스레드의 연결을 닫습니다 (서버 종료 시 호출).
+
+    각 스레드의 풀에 남은 참조는 다음 get_db에서 버려지고 새 연결로 대체된다.
+    """
+    with _POOL_LOCK:
+        conns = list(_IDLE_CONNS)
+        _IDLE_CONNS.clear()
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
 
 
 def init_db(path: Path = DB_PATH) -> None:
@@ -138,6 +196,20 @@ def init_db(path: Path = DB_PATH) -> None:
         );
         CREATE INDEX IF NOT EXISTS idx_wisdom_convo ON session_wisdom(conversation_id);
         """)
+        # revision 컬럼 마이그레이션 (이미 존재하면 무시) — 저장마다 1씩 증가
+        try:
+            conn.execute(
+                "ALTER TABLE conversations ADD COLUMN revision INTEGER NOT NULL DEFAULT 0"
+            )
+        except sqlite3.OperationalError:
+            pass
+        # first_user_query 컬럼 마이그레이션 — 최초 사용자 요청을 history 스캔 없이 조회
+        try:
+            conn.execute(
+                "ALTER TABLE conversations ADD COLUMN first_user_query TEXT DEFAULT NULL"
+            )
+        except sqlite3.OperationalError:
+            pass
 
 
 # ── 자동 초기화 ──────────────────────────────────────────────────
@@ -227,39 +299,38 @@ def save_conversation(
     current_group_index: int = 0,
     is_final: bool = False,
     db_path: Path = DB_PATH,
+    first_user_query: Optional[str] = None,
 ) -> str:
-    """Upsert 대화. UUID 그대로 유지. convo_id 반환."""
+    """Upsert 대화. UUID 그대로 유지. convo_id 반환.
+
+    first_user_query는 최초 1회만 기록되며 이후 저장에서는 기존 값을 유지한다.
+    """
     status = "final" if is_final else "active"
     now = utcnow()
-    history_json = json.dumps(history, ensure_ascii=False)
-    plan_json = json.dumps(plan or [], ensure_ascii=False)
+    history_json = _dumps(history)
+    plan_json = _dumps(plan or [])
 
+    # 존재 확인 SELECT 없이 단일 UPSERT — created_at은 최초 INSERT 값 유지
     with get_db(db_path) as conn:
-        existing = conn.execute(
-            "SELECT id FROM conversations WHERE id=?", (convo_id,)
-        ).fetchone()
-        if existing:
-            conn.execute(
-                """
-                UPDATE conversations
-                SET title=?, last_updated=?, history=?, plan=?,
-                    current_group_index=?, status=?
-                WHERE id=?
-                """,
-                (title, now, history_json, plan_json,
-                 current_group_index, status, convo_id),
-            )
-        else:
-            conn.execute(
-                """
-                INSERT INTO conversations
-                    (id, title, created_at, last_updated, history, plan,
-                     current_group_index, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (convo_id, title, now, now, history_json, plan_json,
-                 current_group_index, status),
-            )
+        conn.execute(
+            """
+            INSERT INTO conversations
+                (id, title, created_at, last_updated, history, plan,
+                 current_group_index, status, first_user_query)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                title=excluded.title,
+                last_updated=excluded.last_updated,
+                history=excluded.history,
+                plan=excluded.plan,
+                current_group_index=excluded.current_group_index,
+                status=excluded.status,
+                revision=revision+1,
+                first_user_query=COALESCE(first_user_query, excluded.first_user_query)
+            """,
+            (convo_id, title, now, now, history_json, plan_json,
+             current_group_index, status, first_user_query),
+        )
     return convo_id
 
 
@@ -273,12 +344,27 @@ def load_conversation(
         if not row:
             return None
         data = dict(row)
-        data["history"] = json.loads(data["history"])
-        data["plan"] = json.loads(data["plan"])
+        data["history"] = _loads(data["history"])
+        data["plan"] = _loads(data["plan"])
         data["keywords"] = _fetch_keywords(conn, convo_id)
         return data
 
 
+def get_conversation_revision(
+    convo_id: str, db_path: Path = DB_PATH
+) -> Optional[Tuple[int, str]]:
+    """(revision, created_at)을 반환합니다. 대화가 없으면 None.
+
+    본문 JSON을 읽지 않는 가벼운 조회로, 캐시된 대화의 최신 여부 확인용.
+    created_at을 함께 반환하여 삭제 후 같은 ID로 재생성된 경우도 구분한다.
+    """
+    with get_db(db_path) as conn:
+        row = conn.execute(
+            "SELECT revision, created_at FROM conversations WHERE id=?", (convo_id,)
+        ).fetchone()
+        return (row["revision"], row["created_at"]) if row else None
+
+
 def list_conversations(
     group_id: Optional[int] = None,
     keyword: Optional[str] = None,
@@ -617,9 +703,9 @@ def split_conversation(
     with get_db(db_path) as conn:
         # 원본 축소
         conn.execute(
-            "UPDATE conversations SET history=?, last_updated=?, status='split' "
-            "WHERE id=?",
-            (json.dumps(history_a, ensure_ascii=False), now, original_id),
+            "UPDATE conversations SET history=?, last_updated=?, status='split', "
+            "revision=revision+1 WHERE id=?",
+            (_dumps(history_a), now, original_id),
         )
         # 신규 생성
         conn.execute(
@@ -634,7 +720,7 @@ def split_conversation(
                 data.get("title", "Untitled") + " (분리)",
                 now,
                 now,
-                json.dumps(history_b, ensure_ascii=False),
+                _dumps(history_b),
                 "[]",
                 0,
                 "active",
@@ -24,10 +24,12 @@ def save_conversation(
     plan: Optional[List[Dict]] = None,
     current_group_index: int = 0,
     is_final: bool = False,
+    first_user_query: Optional[str] = None,
 ) -> str:
     """대화를 SQLite에 저장합니다. convo_id(UUID) 그대로 반환."""
     return graph_manager.save_conversation(
-        convo_id, history, title, plan, current_group_index, is_final
+        convo_id, history, title, plan, current_group_index, is_final,
+        first_user_query=first_user_query,
     )
 
 
@@ -36,6 +38,11 @@ def load_conversation(convo_id: str) -> Optional[Dict[str, Any]]:
     return graph_manager.load_conversation(convo_id)
 
 
+def get_revision(convo_id: str) -> Optional[Tuple[int, str]]:
+    """대화의 (revision, created_at)을 반환합니다. 없으면 None."""
+    return graph_manager.get_conversation_revision(convo_id)
+
+
 def list_conversations(
     group_id: Optional[int] = None,
     keyword: Optional[str] = None,
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# orchestrator/http_client.py
+"""프로바이더 클라이언트가 공유하는 이벤트 루프별 httpx.AsyncClient 캐시.
+
+호출마다 새 연결(TLS 핸드셰이크 포함)을 맺지 않도록 클라이언트를 재사용합니다.
+연결 풀은 생성한 루프에 묶이므로 루프를 키로 둡니다 (CLI의 asyncio.run 반복 호출 대비).
+api.py lifespan 종료 시 close_http_clients()로 모두 닫습니다.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Dict
+
+import httpx
+
+# 루프 → {프로바이더 이름: 클라이언트}. 프로바이더마다 타임아웃이 달라 이름별로 구분한다.
+_HTTP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_client(name: str, timeout) -> httpx.AsyncClient:
+    """현재 이벤트 루프에서 name별 공유 AsyncClient를 반환합니다. 닫혀 있으면 새로 만든다."""
+    loop = asyncio.get_running_loop()
+    clients = _HTTP_CLIENTS.get(loop)
+    if clients is None:
+        clients = _HTTP_CLIENTS[loop] = {}
+    client = clients.get(name)
+    if client is None or client.is_closed:
+        client = clients[name] = httpx.AsyncClient(timeout=timeout)
+    return client
+
+
+async def close_http_clients() -> None:
+    """모든 이벤트 루프의 공유 AsyncClient를 닫습니다 (앱 종료 시 호출)."""
+    clients = [c for per_loop in list(_HTTP_CLIENTS.values()) for c in per_loop.values()]
+    _HTTP_CLIENTS.clear()
+    for client in clients:
+        if client.is_closed:
+            continue
+        try:
+            await client.aclose()
+        except Exception as e:
+            # 다른(이미 종료된) 루프에 묶인 클라이언트는 정리 실패를 무시
+            logging.warning(f"HTTP 클라이언트 종료 실패: {e}")
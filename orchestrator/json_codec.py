@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# orchestrator/json_codec.py
+"""SQLite JSON 컬럼 (역)직렬화 헬퍼.
+
+graph_manager(history/plan)와 agent_config_manager(설정 JSON 컬럼)가 함께 사용합니다.
+orjson이 설치되어 있으면 C 구현을, 없으면 표준 json을 사용합니다.
+"""
+
+import json
+from types import MappingProxyType
+from typing import Any
+
+try:  # 선택 의존성 — 설치 시 JSON 컬럼 (역)직렬화를 C 구현으로 처리
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """설정 읽기 캐시가 돌려준 읽기 전용 매핑(MappingProxyType)을 dict로 직렬화."""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"JSON 직렬화 불가 타입: {type(obj).__name__}")
+
+
+def loads(text: str) -> Any:
+    """JSON 컬럼 역직렬화 (orjson 우선, 없으면 표준 json)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def dumps(obj: Any) -> str:
+    """JSON 컬럼 직렬화 (orjson 우선). TEXT 컬럼이므로 bytes가 아닌 str로 반환.
+
+    orjson이 거부하는 값(비문자열 키 등)은 표준 json으로 처리한다.
+    """
+    if obj == []:
+        # 가장 흔한 값 — 직렬화 없이 컬럼 기본값과 같은 상수를 바인딩
+        return "[]"
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, default=_default)
@@ -7,15 +7,62 @@
 import logging
 import json
 import re
-from typing import Dict, Any, List, Literal, Optional
+from typing import Dict, Any, List, Literal, Optional, Sequence
 from . import agent_config_manager as _acm
 from .models import WisdomEntry, PlanValidation
+from .constants import (
+    CATEGORY_MODEL_MAP,
+    HISTORY_MAX_CHARS,
+    HISTORY_TOOL_RUN_PREFIX,
+    HISTORY_USER_REQ_PREFIX,
+    INTENT_CACHE_MAX_ENTRIES,
+)
 
 logger = logging.getLogger(__name__)
 
 ModelPreference = Literal["auto", "standard", "high"]
 
 
+# ── 이력 축약 (모든 프로바이더 공통) ──────────────────────────────
+
+def truncate_history(history: list, max_chars: int = HISTORY_MAX_CHARS) -> str:
+    """최근 대화 우선 보존하는 캐릭터 예산 기반 히스토리 truncation.
+
+    뒤(최신)부터 역순으로 항목을 추가하되, max_chars를 초과하면 중단합니다.
+    예산을 넘는 경우 최초 사용자 요청 항목은 맨 앞에 고정하고,
+    도구 실행 에코 줄은 건너뜁니다.
+    """
+    if not history:
+        return ""
+    if sum(len(item) for item in history) <= max_chars:
+        return "\n".join(history)
+
+    # 최초 사용자 요청은 목표 자체이므로 예산과 무관하게 맨 앞에 고정
+    anchor_idx = next(
+        (i for i, item in enumerate(history) if item.startswith(HISTORY_USER_REQ_PREFIX)), -1
+    )
+    anchor = history[anchor_idx] if anchor_idx >= 0 else None
+    budget = max_chars - (len(anchor) if anchor else 0)
+
+    selected = []
+    total = 0
+    for item in reversed(history[anchor_idx + 1:]):
+        # 도구 호출 에코 줄은 결과 줄과 중복되므로 예산 초과 시 생략
+        if item.startswith(HISTORY_TOOL_RUN_PREFIX):
+            continue
+        item_len = len(item)
+        if total + item_len > budget and selected:
+            break
+        selected.append(item)
+        total += item_len
+
+    selected.reverse()
+
+    if anchor:
+        return anchor + "\n... (이전 기록 생략) ...\n" + "\n".join(selected)
+    return "... (이전 기록 생략) ...\n" + "\n".join(selected)
+
+
 def _get_client_module(provider: str):
     """프로바이더 이름으로 클라이언트 모듈을 반환."""
     if provider == "claude":
@@ -71,7 +118,7 @@ async def generate_execution_plan(
     requirements_content: str,
     history: list,
     model_preference: ModelPreference = "auto",
-    system_prompts: List[str] = None,
+    system_prompts: Sequence[str] = None,
     allowed_skills: Optional[List[str]] = None,
 ):
     return await _call_with_fallback(
@@ -146,7 +193,6 @@ async def generate_clarifying_questions(
 
     for provider in chain:
         try:
-            import json, re
             module = _get_client_module(provider)
             # generate_final_answer를 재사용해 단순 텍스트 응답 획득
             raw = await module.generate_final_answer(
@@ -195,6 +241,22 @@ async def summarize_history(
 
 
 # P3-C: IntentGate — 도구 실행 필요 여부 사전 분류
+# 정규화된 쿼리 → 'chat'/'task'. 같은 문장이 반복되면 LLM 왕복을 생략한다.
+_INTENT_CACHE: Dict[str, str] = {}
+
+
+def _intent_cache_key(user_query: str) -> str:
+    """대소문자와 공백 차이를 무시한 캐시 키를 반환합니다."""
+    return " ".join(user_query.split()).lower()
+
+
+def _remember_intent(key: str, intent: str) -> str:
+    if len(_INTENT_CACHE) >= INTENT_CACHE_MAX_ENTRIES:
+        _INTENT_CACHE.pop(next(iter(_INTENT_CACHE)))
+    _INTENT_CACHE[key] = intent
+    return intent
+
+
 async def classify_intent(
     user_query: str,
     model_preference: ModelPreference = "standard",
@@ -204,7 +266,13 @@ async def classify_intent(
     'chat': 단순 질문/대화 (도구 사용 불필요, 직접 답변 가능)
     'task': 파일 생성/수정/실행 등 도구가 필요한 작업
     실패 시 'task'를 반환합니다 (보수적 기본값).
+    LLM이 응답한 분류만 캐시하며, 폴백 기본값은 캐시하지 않습니다.
     """
+    key = _intent_cache_key(user_query)
+    cached = _INTENT_CACHE.get(key)
+    if cached is not None:
+        return cached
+
     prompt = _acm.render_prompt("classify_intent_user", user_query=user_query)
 
     for provider in _get_fallback_chain():
@@ -215,8 +283,8 @@ async def classify_intent(
                 model_preference=model_preference,
             )
             if "chat" in raw.strip().lower()[:20]:
-                return "chat"
-            return "task"
+                return _remember_intent(key, "chat")
+            return _remember_intent(key, "task")
         except Exception as exc:
             logger.warning(f"[IntentGate] provider={provider} 실패: {exc}")
 
@@ -244,7 +312,6 @@ async def generate_design(
       }
     실패 시 기본 구조를 반환합니다.
     """
-    import json, re
     system_ctx = persona_prompt + "\n\n" if persona_prompt else ""
     history_ctx = ""
     if history:
@@ -292,7 +359,6 @@ async def decompose_tasks(
     최대 10개 태스크.
     실패 시 단일 태스크 목록을 반환합니다.
     """
-    import json, re
     design_text = (
         f"목표: {design.get('goal', '')}\n"
         f"접근법: {design.get('approach', '')}\n"
@@ -339,7 +405,6 @@ async def map_plans(
       [{"action": "수행 동작 설명", "tool_hints": ["예상도구1", "예상도구2"]}, ...]
     실패 시 단일 단계를 반환합니다.
     """
-    import json, re
     tools_str = ", ".join(available_tools[:30]) if available_tools else "없음"
     prompt = _acm.render_prompt(
         "map_plans_user",
@@ -389,7 +454,6 @@ async def build_execution_group_for_step(
 
     반환 형식: ExecutionGroup.model_dump() 호환 dict
     """
-    import json, re
 
     tools_desc = "\n".join(f"- {t}" for t in available_tools[:20])
     history_ctx = ""
@@ -575,7 +639,6 @@ async def classify_task_category(user_query: str) -> str:
 
 def _get_model_for_category(category: Optional[str]) -> str:
     """카테고리에 맞는 model_preference 문자열을 반환합니다."""
-    from .constants import CATEGORY_MODEL_MAP
     return CATEGORY_MODEL_MAP.get(category or "", "auto")
 
 
@@ -594,7 +657,6 @@ async def adapt_template_arguments(
     - 실패 시 원본 template_group을 그대로 반환합니다.
     - standard 티어 이하로 처리 (비용 최소화).
     """
-    import json, re
 
     template_json = json.dumps(template_group, ensure_ascii=False, indent=2)
     history_ctx = ""
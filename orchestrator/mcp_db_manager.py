@@ -405,46 +405,84 @@ def log_usage(
     db_path=DB_PATH,
 ) -> None:
     """함수 실행 로그를 기록합니다."""
+    log_usage_bulk(
+        [{
+            "func_name": func_name,
+            "success": success,
+            "session_id": session_id,
+            "duration_ms": duration_ms,
+            "error_message": error_message,
+            "args_summary": args_summary,
+        }],
+        db_path=db_path,
+    )
+
+
+def log_usage_bulk(entries: List[Dict], db_path=DB_PATH) -> None:
+    """여러 실행 로그를 단일 트랜잭션으로 기록합니다.
+
+    각 항목은 log_usage의 키워드 인자와 같은 키(func_name, success, session_id,
+    duration_ms, error_message, args_summary)를 가진다. func_name/success 외에는 생략 가능.
+    """
+    if not entries:
+        return
     now = utcnow()
+    names = list({e["func_name"] for e in entries})
     with get_db(db_path) as conn:
-        row = conn.execute(
-            "SELECT version, module_group FROM mcp_functions "
-            "WHERE func_name = ? AND is_active = 1",
-            (func_name,),
-        ).fetchone()
-        func_version = row[0] if row else 0
-        module_group = row[1] if row else ""
+        placeholders = ",".join("?" * len(names))
+        active = {
+            r[0]: (r[1], r[2])
+            for r in conn.execute(
+                f"SELECT func_name, version, module_group FROM mcp_functions "
+                f"WHERE is_active = 1 AND func_name IN ({placeholders})",
+                names,
+            )
+        }
 
-        conn.execute(
+        rows = []
+        session_funcs: Dict[str, List[str]] = {}
+        for e in entries:
+            func_name = e["func_name"]
+            func_version, module_group = active.get(func_name, (0, ""))
+            session_id = e.get("session_id")
+            rows.append((
+                session_id, func_name, func_version, module_group, now,
+                e.get("duration_ms"), 1 if e["success"] else 0,
+                e.get("error_message", ""), e.get("args_summary", ""),
+            ))
+            if session_id:
+                session_funcs.setdefault(session_id, []).append(func_name)
+
+        conn.executemany(
             """INSERT INTO mcp_usage_log
                (session_id, func_name, func_version, module_group, called_at,
                 duration_ms, success, error_message, args_summary)
                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                session_id, func_name, func_version, module_group, now,
-                duration_ms, 1 if success else 0, error_message, args_summary,
-            ),
+            rows,
         )
 
-        if session_id:
+        for session_id, called in session_funcs.items():
             sess_row = conn.execute(
                 "SELECT func_names FROM mcp_session_log WHERE id = ?",
                 (session_id,),
             ).fetchone()
-            if sess_row:
-                func_names = json.loads(sess_row[0])
-                if func_name not in func_names:
-                    if len(func_names) >= MAX_FUNC_NAMES_PER_SESSION:
-                        logging.warning(
-                            f"세션 '{session_id}'의 func_names가 {MAX_FUNC_NAMES_PER_SESSION}개 "
-                            f"한도에 도달했습니다. '{func_name}'을 추가하지 않습니다."
-                        )
-                    else:
-                        func_names.append(func_name)
-                conn.execute(
-                    "UPDATE mcp_session_log SET func_names = ? WHERE id = ?",
-                    (json.dumps(func_names), session_id),
-                )
+            if not sess_row:
+                continue
+            func_names = json.loads(sess_row[0])
+            for func_name in called:
+                if func_name in func_names:
+                    continue
+                if len(func_names) >= MAX_FUNC_NAMES_PER_SESSION:
+                    logging.warning(
+                        f"세션 '{session_id}'의 func_names가 {MAX_FUNC_NAMES_PER_SESSION}개 "
+                        f"한도에 도달했습니다. '{func_name}'을 추가하지 않습니다."
+                    )
+                    continue
+                func_names.append(func_name)
+            conn.execute(
+                "UPDATE mcp_session_log SET func_names = ? WHERE id = ?",
+                (json.dumps(func_names), session_id),
+            )
 
 
 def get_usage_stats(
@@ -35,6 +35,14 @@ class AgentRequest(BaseModel):
     )
     force_react: bool = Field(default=False, description="3-tier 자동 라우팅 우회, 항상 ReAct 모드 사용")
 
+class ReplanRequest(BaseModel):
+    """그룹 실행 후 재계획 요청 모델 — 이력은 서버 저장본을 사용하므로 받지 않는다"""
+    conversation_id: str = Field(..., description="대화 세션 식별자")
+    model_preference: str = Field(default="auto", description="사용할 모델 등급 (standard, high, auto)")
+    system_prompts: Optional[List[str]] = None
+    persona: Optional[str] = None
+    allowed_skills: Optional[List[str]] = None
+
 class ToolCall(BaseModel):
     """단일 도구 호출(MCP)을 정의하는 모델"""
     tool_name: str = Field(..., max_length=100, description="도구 이름")
@@ -111,3 +119,22 @@ class AgentResponse(BaseModel):
     topic_split_info: Optional[Dict[str, Any]] = None  # 주제 분리 감지 결과
     token_usage: Optional[Dict[str, Any]] = None  # LLM 토큰 사용량 (provider/model/input/output/cost)
     pipeline_state: Optional[Dict[str, Any]] = None  # {design_id, task_id, plan_id, phase}
+
+
+class BatchAgentRequest(BaseModel):
+    """여러 대화의 decide_and_act 요청을 한 번에 보내는 배치 요청"""
+    requests: List[AgentRequest] = Field(
+        ..., min_length=1, max_length=20, description="처리할 요청 목록 (대화 ID 중복 불가)"
+    )
+
+
+class BatchItemResponse(BaseModel):
+    """배치 항목별 결과 — 실패한 항목은 status_code와 detail만 채운다"""
+    status_code: int = 200
+    response: Optional[AgentResponse] = None
+    detail: Optional[str] = None
+
+
+class BatchAgentResponse(BaseModel):
+    """배치 응답 — 요청과 같은 순서"""
+    responses: List[BatchItemResponse]
@@ -13,15 +13,18 @@ Gemini/Claude 클라이언트와 동일한 함수 인터페이스를 제공합
 import json
 import logging
 import os
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Sequence
 
 import httpx
 from dotenv import load_dotenv
 
 from .models import ExecutionGroup
 from .tool_registry import get_filtered_tool_descriptions
-from .constants import HISTORY_MAX_CHARS
+from .constants import HISTORY_RESULT_PREFIX
+from .http_client import get_http_client
+from .llm_client import truncate_history as _truncate_history
 from . import agent_config_manager as _acm
+from . import token_tracker
 
 load_dotenv()
 
@@ -34,28 +37,10 @@ _TIMEOUT = httpx.Timeout(300.0, connect=10.0)
 
 ModelPreference = Literal["auto", "standard", "high"]
 
-DEFAULT_HISTORY_MAX_CHARS = HISTORY_MAX_CHARS  # constants.py에서 중앙 관리
 
-
-def _truncate_history(history: list, max_chars: int = DEFAULT_HISTORY_MAX_CHARS) -> str:
-    """최근 대화 우선 보존하는 캐릭터 예산 기반 히스토리 truncation."""
-    if not history:
-        return ""
-
-    selected = []
-    total = 0
-    for item in reversed(history):
-        item_len = len(item)
-        if total + item_len > max_chars and selected:
-            break
-        selected.append(item)
-        total += item_len
-
-    selected.reverse()
-
-    if len(selected) < len(history):
-        return "... (이전 기록 생략) ...\n" + "\n".join(selected)
-    return "\n".join(selected)
+def _http_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프의 공유 AsyncClient를 반환합니다."""
+    return get_http_client("ollama", _TIMEOUT)
 
 
 def _get_model_name(
@@ -85,14 +70,12 @@ async def _ollama_chat(
     if json_format:
         payload["format"] = "json"
 
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        resp = await client.post(f"{OLLAMA_BASE_URL}/api/chat", json=payload)
-        resp.raise_for_status()
-        data = resp.json()
+    resp = await _http_client().post(f"{OLLAMA_BASE_URL}/api/chat", json=payload)
+    resp.raise_for_status()
+    data = resp.json()
 
     # 토큰 사용량 기록 (로컬/무료, 비용 없음)
     try:
-        from . import token_tracker
         token_tracker.record(
             provider="ollama",
             model=model,
@@ -110,7 +93,7 @@ async def generate_execution_plan(
     requirements_content: str,
     history: list,
     model_preference: ModelPreference = "auto",
-    system_prompts: List[str] = None,
+    system_prompts: Sequence[str] = None,
     allowed_skills: Optional[List[str]] = None,
 ) -> List[ExecutionGroup]:
     """ReAct 플래너: 다음 1개 실행 그룹을 생성합니다. 완료 시 [] 반환."""
@@ -192,7 +175,7 @@ async def generate_final_answer(
     except Exception as e:
         logging.error(f"generate_final_answer 오류: {e}", exc_info=True)
         last_result = next(
-            (item for item in reversed(history) if item.startswith("  - 실행 결과:")), None
+            (item for item in reversed(history) if item.startswith(HISTORY_RESULT_PREFIX)), None
         )
         if last_result:
             return f"최종 요약 생성에 실패했습니다. 마지막 실행 결과입니다:\n{last_result}"
@@ -25,6 +25,7 @@ import json
 import logging
 from typing import Any, Dict, List, Optional
 
+from .constants import HISTORY_FINAL_ANSWER_PREFIX, HISTORY_USER_REQ_PREFIX
 from .models import AgentResponse, ExecutionGroup, ToolCall
 from . import pipeline_db
 from . import template_engine
@@ -144,7 +145,7 @@ async def start_design_phase(
 ) -> AgentResponse:
     """사용자 쿼리로부터 설계를 생성하고 DESIGN_CONFIRMATION을 반환합니다."""
 
-    history.append(f"사용자 요청: {query}")
+    history.append(f"{HISTORY_USER_REQ_PREFIX} {query}")
 
     # Phase 4: 설계는 항상 high (복잡도 추정 전이므로 쿼리 기반)
     inferred_complexity = llm_router.infer_complexity_from_query(query)
@@ -516,7 +517,7 @@ async def _finish_pipeline(
         logger.error(f"최종 답변 생성 실패: {e}")
         final_answer = "모든 작업이 완료되었습니다."
 
-    history.append(f"최종 답변: {final_answer}")
+    history.append(f"{HISTORY_FINAL_ANSWER_PREFIX} {final_answer}")
 
     try:
         title = await generate_title_for_conversation(history, model_preference)
@@ -4,6 +4,7 @@
 """agent_config_manager 단위 테스트."""
 
 import json
+import sqlite3
 import tempfile
 from pathlib import Path
 
@@ -12,6 +13,13 @@ import pytest
 from . import agent_config_manager as acm
 
 
+@pytest.fixture(autouse=True)
+def close_connections():
+    """테스트마다 tmp_path별로 열린 연결을 닫아 누적되지 않게 한다."""
+    yield
+    acm.close_all()
+
+
 @pytest.fixture
 def tmp_db(tmp_path):
     """임시 DB 경로 픽스처."""
@@ -57,6 +65,13 @@ class TestSystemPrompts:
         prompts = acm.list_system_prompts(db_path=tmp_db)
         assert len(prompts) == 2
 
+    def test_list_without_content(self, tmp_db):
+        acm.create_system_prompt("big", "x" * 10000, "설명", db_path=tmp_db)
+        prompts = acm.list_system_prompts(db_path=tmp_db, include_content=False)
+        big = next(p for p in prompts if p["name"] == "big")
+        assert "content" not in big
+        assert big["description"] == "설명"
+
     def test_update(self, tmp_db):
         acm.create_system_prompt("upd", "원본", db_path=tmp_db)
         result = acm.update_system_prompt("upd", content="수정됨", db_path=tmp_db)
@@ -64,6 +79,13 @@ class TestSystemPrompts:
         p = acm.get_system_prompt("upd", db_path=tmp_db)
         assert p["content"] == "수정됨"
 
+    def test_update_without_fields_is_noop(self, tmp_db):
+        acm.create_system_prompt("noop", "내용", db_path=tmp_db)
+        before = acm.get_system_prompt("noop", db_path=tmp_db)["updated_at"]
+        assert acm.update_system_prompt("noop", db_path=tmp_db) is True
+        assert acm.get_system_prompt("noop", db_path=tmp_db)["updated_at"] == before
+        assert acm.update_system_prompt("없는거", db_path=tmp_db) is False
+
     def test_update_nonexistent(self, tmp_db):
         result = acm.update_system_prompt("없는거", content="x", db_path=tmp_db)
         assert result is False
@@ -90,6 +112,16 @@ class TestSystemPrompts:
         assert default_p["name"] == "default"
         assert default_p["content"] == "기본 프롬프트"
 
+    def test_migrate_skips_dirs_and_bad_files(self, tmp_db, tmp_path):
+        prompts_dir = tmp_path / "prompts"
+        prompts_dir.mkdir()
+        (prompts_dir / "dir.txt").mkdir()
+        (prompts_dir / "bad.txt").write_bytes(b"\xff\xfe")
+        (prompts_dir / "note.md").write_text("무시", encoding="utf-8")
+        (prompts_dir / "ok.txt").write_text("정상", encoding="utf-8")
+        assert acm.migrate_prompts_from_files(str(prompts_dir), db_path=tmp_db) == 1
+        assert acm.get_system_prompt("ok", db_path=tmp_db)["content"] == "정상"
+
     def test_migrate_idempotent(self, tmp_db, tmp_path):
         prompts_dir = tmp_path / "prompts"
         prompts_dir.mkdir()
@@ -179,7 +211,7 @@ class TestSkillMacros:
     def test_explicit_variables(self, tmp_db):
         acm.create_macro("explicit", "{{x}} + {{y}}", variables=["x"], db_path=tmp_db)
         m = acm.get_macro("explicit", db_path=tmp_db)
-        assert m["variables"] == ["x"]
+        assert m["variables"] == ("x",)
 
     def test_list_macros(self, tmp_db):
         acm.create_macro("m1", "{{a}}", db_path=tmp_db)
@@ -204,6 +236,11 @@ class TestSkillMacros:
         rendered = acm.render_macro("render_test", {"name": "Alice", "action": "run"}, db_path=tmp_db)
         assert rendered == "Hello Alice! Action: run"
 
+    def test_render_macro_keeps_unbound_placeholder(self, tmp_db):
+        acm.create_macro("partial", "{{a}} {{b}}", variables=["a"], db_path=tmp_db)
+        rendered = acm.render_macro("partial", {"a": "{{b}}"}, db_path=tmp_db)
+        assert rendered == "{{b}} {{b}}"
+
     def test_render_macro_missing_var(self, tmp_db):
         acm.create_macro("missing_var", "{{a}} {{b}}", db_path=tmp_db)
         with pytest.raises(KeyError):
@@ -362,6 +399,23 @@ class TestGetEffectivePersona:
         result = acm.get_effective_persona(query="test", db_path=tmp_db)
         assert result is None
 
+    def test_updated_keywords_used_for_detection(self, tmp_db):
+        acm.create_persona("kw_p", "키워드", keywords=["old"], db_path=tmp_db)
+        acm.update_persona("kw_p", keywords=["NewWord"], db_path=tmp_db)
+        assert acm.get_effective_persona(query="old 작업", db_path=tmp_db) is None
+        result = acm.get_effective_persona(query="newword 작업", db_path=tmp_db)
+        assert result["name"] == "kw_p"
+
+    def test_init_db_backfills_keyword_table(self, tmp_db):
+        """persona_keywords 도입 전 데이터도 init_db 후 감지된다."""
+        acm.create_persona("legacy", "레거시", keywords=["legacy"], db_path=tmp_db)
+        from .graph_manager import get_db
+        with get_db(tmp_db) as conn:
+            conn.execute("DELETE FROM persona_keywords")
+        acm.init_db(tmp_db)
+        result = acm.get_effective_persona(query="legacy 코드", db_path=tmp_db)
+        assert result["name"] == "legacy"
+
 
 # ── TestSyncSkillsLogging ─────────────────────────────────────────
 
@@ -414,3 +468,174 @@ class TestSyncSkillsLogging:
         assert "1개 추가" in log_messages[0]
         # 두 번째 호출: 갱신 1개
         assert "1개 갱신" in log_messages[1]
+
+
+# ── 읽기 캐시 테스트 ─────────────────────────────────────────────
+
+class TestReadCache:
+    def test_cached_value_is_read_only(self, tmp_db):
+        """캐시 값은 읽기 전용이라 호출자가 수정해 캐시를 오염시킬 수 없다."""
+        acm.create_persona("cached_p", "내용", keywords=["a"], db_path=tmp_db)
+        p = acm.get_persona("cached_p", db_path=tmp_db)
+        with pytest.raises(AttributeError):
+            p["keywords"].append("오염")
+        with pytest.raises(TypeError):
+            acm.list_personas(db_path=tmp_db)[0]["name"] = "오염"
+        assert acm.get_persona("cached_p", db_path=tmp_db)["keywords"] == ("a",)
+        assert acm.list_personas(db_path=tmp_db)[0]["name"] == "cached_p"
+
+    def test_hit_issues_no_sql(self, tmp_db):
+        """캐시 적중 시에는 버전 확인을 포함해 SQL을 실행하지 않는다."""
+        acm.create_persona("p", "내용", keywords=["a"], db_path=tmp_db)
+        first = acm.get_persona("p", db_path=tmp_db)
+        statements = []
+        conn = acm._conn(tmp_db)
+        conn.set_trace_callback(statements.append)
+        try:
+            assert acm.get_persona("p", db_path=tmp_db) is first
+        finally:
+            conn.set_trace_callback(None)
+        assert statements == []
+
+    def test_frozen_value_can_be_written_back(self, tmp_db):
+        """캐시에서 받은 스텝을 그대로 update_workflow에 넘길 수 있다."""
+        acm.create_workflow("wf", [{"order": 1, "args": {"k": "v"}}], db_path=tmp_db)
+        steps = list(acm.get_workflow("wf", db_path=tmp_db)["steps"])
+        steps.append({"order": 2})
+        acm.update_workflow("wf", steps=steps, db_path=tmp_db)
+        assert acm.get_workflow("wf", db_path=tmp_db)["steps"][0]["args"]["k"] == "v"
+        assert len(acm.get_workflow("wf", db_path=tmp_db)["steps"]) == 2
+
+    def test_mutation_invalidates(self, tmp_db):
+        acm.create_macro("cm", "{{x}}", db_path=tmp_db)
+        assert acm.get_macro("cm", db_path=tmp_db)["template"] == "{{x}}"
+        acm.update_macro("cm", template="{{y}}", db_path=tmp_db)
+        assert acm.get_macro("cm", db_path=tmp_db)["variables"] == ("y",)
+        acm.delete_macro("cm", db_path=tmp_db)
+        assert acm.get_macro("cm", db_path=tmp_db) is None
+
+    def test_external_write_invalidates(self, tmp_db, monkeypatch):
+        """다른 연결에서 커밋한 변경도 버전 재확인 시점의 조회에 반영된다."""
+        monkeypatch.setattr(acm, "CONFIG_VERSION_CHECK_SEC", 0.0)
+        acm.create_workflow("wf", [{"step": 1}], db_path=tmp_db)
+        assert acm.get_workflow("wf", db_path=tmp_db)["description"] == ""
+        from .graph_manager import get_db
+        with get_db(tmp_db) as conn:
+            conn.execute("UPDATE workflows SET description='외부' WHERE name='wf'")
+        assert acm.get_workflow("wf", db_path=tmp_db)["description"] == "외부"
+
+    def test_unrelated_write_keeps_cache(self, tmp_db, monkeypatch):
+        """같은 DB의 대화 저장은 설정 읽기 캐시(오토마톤 포함)를 비우지 않는다."""
+        from .graph_manager import init_db as graph_init_db, save_conversation
+        graph_init_db(tmp_db)
+        acm.create_persona("p", "내용", keywords=["deploy"], db_path=tmp_db)
+        calls = []
+        original = acm._parse_persona_row
+        monkeypatch.setattr(acm, "_parse_persona_row", lambda row: calls.append(1) or original(row))
+        acm.get_persona("p", db_path=tmp_db)
+        save_conversation("c1", ["msg"], "t", [], 0, False, tmp_db)
+        acm.get_persona("p", db_path=tmp_db)
+        assert len(calls) == 1
+
+    def test_effective_persona_decision_invalidated_on_change(self, tmp_db):
+        acm.create_persona("first", "1", keywords=["deploy"], db_path=tmp_db)
+        assert acm.get_effective_persona("deploy 해줘", db_path=tmp_db)["name"] == "first"
+        acm.create_persona("second", "2", keywords=["deploy", "해줘"], db_path=tmp_db)
+        assert acm.get_effective_persona("deploy 해줘", db_path=tmp_db)["name"] == "second"
+
+    def test_sql_fallback_without_ahocorasick(self, tmp_db, monkeypatch):
+        monkeypatch.setattr(acm, "ahocorasick", None)
+        acm.create_persona("generic", "일반", keywords=["python"], db_path=tmp_db)
+        acm.create_persona("specific", "구체", keywords=["python", "debug", "testing"], db_path=tmp_db)
+        result = acm.get_effective_persona(query="python 작업", db_path=tmp_db)
+        assert result["name"] == "specific"
+
+
+# ── 기본값 전환 테스트 ───────────────────────────────────────────
+
+class TestDefaultFlip:
+    def test_update_prompt_default_flip(self, tmp_db):
+        acm.create_system_prompt("old_def", "A", is_default=True, db_path=tmp_db)
+        acm.create_system_prompt("new_def", "B", db_path=tmp_db)
+        assert acm.update_system_prompt("new_def", is_default=True, db_path=tmp_db) is True
+        assert acm.get_default_system_prompt(db_path=tmp_db)["name"] == "new_def"
+        assert acm.get_system_prompt("old_def", db_path=tmp_db)["is_default"] == 0
+
+    def test_update_persona_default_flip(self, tmp_db):
+        acm.create_persona("p_old", "A", is_default=True, db_path=tmp_db)
+        acm.create_persona("p_new", "B", db_path=tmp_db)
+        acm.update_persona("p_new", is_default=True, db_path=tmp_db)
+        defaults = [p["name"] for p in acm.list_personas(db_path=tmp_db) if p["is_default"]]
+        assert defaults == ["p_new"]
+        acm.update_persona("p_new", is_default=False, db_path=tmp_db)
+        assert not any(p["is_default"] for p in acm.list_personas(db_path=tmp_db))
+
+    def test_flip_to_older_row(self, tmp_db):
+        """먼저 생성된(낮은 id) 행으로 기본값을 옮겨도 UNIQUE 인덱스와 충돌하지 않는다."""
+        acm.create_persona("a", "A", db_path=tmp_db)
+        acm.create_persona("b", "B", is_default=True, db_path=tmp_db)
+        assert acm.update_persona("a", is_default=True, db_path=tmp_db) is True
+        assert acm.get_persona("a", db_path=tmp_db)["is_default"] == 1
+        assert acm.get_persona("b", db_path=tmp_db)["is_default"] == 0
+
+    def test_init_db_dedupes_existing_defaults(self, tmp_db):
+        from .graph_manager import get_db
+        with get_db(tmp_db) as conn:
+            conn.execute("DROP INDEX idx_system_prompts_default")
+            for n in ("d1", "d2"):
+                conn.execute(
+                    "INSERT INTO system_prompts (name, content, is_default, created_at, updated_at)"
+                    " VALUES (?, 'x', 1, '', '')",
+                    (n,),
+                )
+        acm.init_db(tmp_db)
+        defaults = [p for p in acm.list_system_prompts(db_path=tmp_db) if p["is_default"]]
+        assert [p["name"] for p in defaults] == ["d1"]
+
+
+# ── 지연 초기화 테스트 ───────────────────────────────────────────
+
+class TestLazySchema:
+    def test_first_use_creates_schema(self, tmp_path):
+        db_path = tmp_path / "lazy.db"
+        assert acm.list_personas(db_path=db_path) == ()
+        acm.create_persona("lazy", "지연", keywords=["k"], db_path=db_path)
+        assert acm.get_effective_persona("k", db_path=db_path)["name"] == "lazy"
+
+    def test_failed_init_retried_on_next_use(self, tmp_path, monkeypatch):
+        """자동 초기화가 일시적으로 실패해도 다음 호출에서 다시 시도한다."""
+        db_path = tmp_path / "retry.db"
+        original = acm.init_db
+        calls = []
+
+        def flaky_init(path):
+            calls.append(path)
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            original(path)
+
+        monkeypatch.setattr(acm, "init_db", flaky_init)
+        with pytest.raises(sqlite3.OperationalError):
+            acm.list_personas(db_path=db_path)
+        assert str(db_path) not in acm._SCHEMA_READY
+        assert acm.list_personas(db_path=db_path) == ()
+        assert len(calls) == 2
+
+    def test_close_all_releases_path_state(self, tmp_db):
+        acm.create_persona("p", "내용", db_path=tmp_db)
+        acm.get_persona("p", db_path=tmp_db)
+        conn = acm._conn(tmp_db)
+        key = str(tmp_db)
+        acm.close_all()
+        assert key not in acm._CONN_CACHE and key not in acm._CONN_LOCKS
+        assert key not in acm._READ_CACHE and key not in acm._SCHEMA_READY
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        # 닫힌 뒤에도 다음 호출은 새 연결로 동작
+        assert acm.get_persona("p", db_path=tmp_db)["name"] == "p"
+
+    def test_connection_pragmas(self, tmp_db):
+        with acm._get_db(tmp_db) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
@@ -14,11 +14,38 @@ from .api import (
     _validate_tool_arguments,
     _prune_history,
     _extract_first_query,
+    _construct_group,
+    _likely_final_turn,
+    _stringify_result,
+    _summarize_tool_result,
+    _is_coroutine_tool,
+    _COROUTINE_CACHE,
+    _get_tool_spec,
+    _TOOL_SPEC_CACHE,
+    _PLAN_ADAPTER,
+    _PLAN_CACHE,
 )
 from .models import AgentRequest, ExecutionGroup, ToolCall
 from .constants import MAX_HISTORY_ENTRIES
 
 
+@pytest.fixture(autouse=True)
+def artifacts_dir(tmp_path):
+    """잘린 도구 결과 파일이 저장소에 쌓이지 않도록 임시 디렉토리로 보관 위치 변경"""
+    with patch("orchestrator.api._BASE_DIR", str(tmp_path)), \
+         patch("orchestrator.api._ARTIFACTS_DIR", str(tmp_path / "artifacts")), \
+         patch("orchestrator.api._ARTIFACT_COUNT", None):
+        yield tmp_path / "artifacts"
+
+
+@pytest.fixture(autouse=True)
+def clear_plan_cache():
+    """여러 테스트가 같은 대화 상태를 쓰므로 재계획 캐시를 매번 비움"""
+    _PLAN_CACHE.clear()
+    yield
+    _PLAN_CACHE.clear()
+
+
 @pytest.fixture
 def sample_group():
     return ExecutionGroup(
@@ -79,6 +106,374 @@ class TestDecideAndAct:
             assert resp.status_code == 200
             assert resp.json()["status"] == "FINAL_ANSWER"
 
+    @pytest.mark.asyncio
+    async def test_replan_backfills_first_user_query(self, sample_group):
+        """first_user_query가 없는 기존 대화는 스캔한 최초 요청을 저장 시 채워 넣음"""
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm, \
+             patch("orchestrator.api.graph_manager") as mock_gm, \
+             patch("orchestrator.api.generate_execution_plan", new_callable=AsyncMock) as mock_plan, \
+             patch("orchestrator.api.validate_execution_plan", side_effect=RuntimeError("skip")):
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_hm.load_conversation.return_value = {
+                "id": "c1", "history": ["사용자 요청: 작업", "그룹 실행 완료: g1"],
+                "title": "t", "plan": [],
+            }
+            mock_gm.load_wisdom.return_value = []
+            mock_plan.return_value = [sample_group]
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                await ac.post("/agent/replan", json={"conversation_id": "c1"})
+            assert mock_hm.save_conversation.call_args.kwargs["first_user_query"] == "작업"
+
+    @pytest.mark.asyncio
+    async def test_replan_endpoint_uses_stored_history(self, sample_group):
+        """/agent/replan은 이력 없이 재계획 분기를 실행"""
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm, \
+             patch("orchestrator.api.graph_manager") as mock_gm, \
+             patch("orchestrator.api.generate_execution_plan", new_callable=AsyncMock) as mock_plan, \
+             patch("orchestrator.api.validate_execution_plan", side_effect=RuntimeError("skip")), \
+             patch("orchestrator.api.classify_intent", new_callable=AsyncMock) as mock_intent:
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_hm.load_conversation.return_value = {
+                "id": "c1", "history": ["사용자 요청: 작업", "그룹 실행 완료: g1"],
+                "title": "t", "plan": [],
+            }
+            mock_gm.load_wisdom.return_value = []
+            mock_plan.return_value = [sample_group]
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/replan", json={"conversation_id": "c1"})
+            assert resp.json()["status"] == "PLAN_CONFIRMATION"
+            assert mock_plan.call_args.kwargs["user_query"] == "작업"
+            mock_intent.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_replan_reuses_cached_plan_for_same_state(self, sample_group):
+        """같은 대화 상태로 재계획을 다시 요청하면 LLM 호출 없이 직전 계획을 반환"""
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm, \
+             patch("orchestrator.api.graph_manager") as mock_gm, \
+             patch("orchestrator.api.generate_execution_plan", new_callable=AsyncMock) as mock_plan, \
+             patch("orchestrator.api.validate_execution_plan", side_effect=RuntimeError("skip")):
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_hm.load_conversation.return_value = {
+                "id": "c1", "history": ["사용자 요청: 작업", "그룹 실행 완료: g1"],
+                "title": "t", "plan": [],
+            }
+            mock_gm.load_wisdom.return_value = []
+            mock_plan.return_value = [sample_group]
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                first = await ac.post("/agent/replan", json={"conversation_id": "c1"})
+                second = await ac.post("/agent/replan", json={"conversation_id": "c1"})
+                other = await ac.post(
+                    "/agent/replan", json={"conversation_id": "c1", "model_preference": "high"}
+                )
+            assert first.json()["execution_group"] == second.json()["execution_group"]
+            assert other.json()["status"] == "PLAN_CONFIRMATION"
+            # 모델 선호가 다르면 키가 달라 다시 계획
+            assert mock_plan.call_count == 2
+
+
+class TestBatchEndpoint:
+    @pytest.mark.asyncio
+    async def test_batch_preserves_order_and_item_errors(self):
+        """항목별 결과를 요청 순서대로 반환하고, 실패 항목은 status_code/detail로 표시"""
+        from fastapi import HTTPException
+        from orchestrator.models import AgentResponse
+
+        async def _fake(request):
+            if request.conversation_id == "missing":
+                raise HTTPException(status_code=404, detail="없음")
+            return AgentResponse(
+                conversation_id=request.conversation_id, status="FINAL_ANSWER",
+                history=[], message="ok",
+            )
+
+        with patch("orchestrator.api.decide_and_act", side_effect=_fake), \
+             patch("orchestrator.api.tool_registry") as mock_tr:
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/batch", json={"requests": [
+                    {"conversation_id": "a"}, {"conversation_id": "missing"}, {"conversation_id": "b"},
+                ]})
+        items = resp.json()["responses"]
+        assert [i["status_code"] for i in items] == [200, 404, 200]
+        assert items[0]["response"]["conversation_id"] == "a"
+        assert items[1]["detail"] == "없음"
+        assert items[2]["response"]["conversation_id"] == "b"
+
+    @pytest.mark.asyncio
+    async def test_batch_rejects_duplicate_conversation(self):
+        """같은 대화 ID가 두 번 들어오면 400"""
+        with patch("orchestrator.api.decide_and_act", new_callable=AsyncMock) as mock_da, \
+             patch("orchestrator.api.tool_registry") as mock_tr:
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/batch", json={"requests": [
+                    {"conversation_id": "a"}, {"conversation_id": "a"},
+                ]})
+        assert resp.status_code == 400
+        mock_da.assert_not_called()
+
+
+class TestFinalAnswerTail:
+    @pytest.mark.asyncio
+    async def test_tail_calls_run_concurrently_and_failures_ignored(self):
+        """재계획이 빈 계획이면 제목/키워드/주제 분리를 병렬 호출하고, 부가 호출 실패는 무시"""
+        import asyncio
+        started = []
+
+        def _slow(name, result=None, exc=None):
+            async def _fn(*args, **kwargs):
+                started.append(name)
+                await asyncio.sleep(0.05)
+                if exc:
+                    raise exc
+                return result
+            return _fn
+
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm, \
+             patch("orchestrator.api.graph_manager") as mock_gm, \
+             patch("orchestrator.api.generate_execution_plan", new_callable=AsyncMock) as mock_plan, \
+             patch("orchestrator.api.generate_final_answer", new_callable=AsyncMock) as mock_final, \
+             patch("orchestrator.api.generate_title_for_conversation", new=_slow("title", "제목")), \
+             patch("orchestrator.api.extract_keywords", new=_slow("kw", exc=RuntimeError("kw down"))), \
+             patch("orchestrator.api.detect_topic_split", new=_slow("topic", {"detected": False})):
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_hm.load_conversation.return_value = {
+                "id": "c1", "history": ["사용자 요청: 작업"], "title": "t", "plan": [],
+            }
+            mock_gm.load_wisdom.return_value = []
+            mock_plan.return_value = []
+            mock_final.return_value = "끝"
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/decide_and_act", json={
+                    "conversation_id": "c1", "history": [],
+                })
+            data = resp.json()
+            assert data["status"] == "FINAL_ANSWER"
+            assert data["topic_split_info"] == {"detected": False}
+            assert sorted(started) == ["kw", "title", "topic"]
+            assert mock_hm.save_conversation.call_args[0][2] == "제목"
+            mock_gm.assign_keywords_to_conversation.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_title_starts_with_final_answer(self):
+        """이력 앞 두 항목이 있으면 제목 생성이 최종 답변과 동시에 시작"""
+        import asyncio
+        order = []
+
+        async def _final(history, mp):
+            order.append("final-start")
+            await asyncio.sleep(0.05)
+            order.append("final-end")
+            return "끝"
+
+        async def _title(history, mp):
+            order.append(("title", len(history)))
+            return "제목"
+
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm, \
+             patch("orchestrator.api.graph_manager") as mock_gm, \
+             patch("orchestrator.api.generate_execution_plan", new_callable=AsyncMock) as mock_plan, \
+             patch("orchestrator.api.generate_final_answer", new=_final), \
+             patch("orchestrator.api.generate_title_for_conversation", new=_title), \
+             patch("orchestrator.api.extract_keywords", new_callable=AsyncMock) as mock_kw, \
+             patch("orchestrator.api.detect_topic_split", new_callable=AsyncMock) as mock_topic:
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_hm.load_conversation.return_value = {
+                "id": "c1", "history": ["사용자 요청: 작업", "그룹 실행 완료: g1"],
+                "title": "t", "plan": [],
+            }
+            mock_gm.load_wisdom.return_value = []
+            mock_plan.return_value = []
+            mock_kw.return_value = []
+            mock_topic.return_value = None
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/decide_and_act", json={
+                    "conversation_id": "c1", "history": [],
+                })
+            assert resp.json()["status"] == "FINAL_ANSWER"
+            assert order.index(("title", 2)) < order.index("final-end")
+            assert mock_hm.save_conversation.call_args[0][2] == "제목"
+
+
+class TestSpeculativeFinalAnswer:
+    DONE_HISTORY = [
+        "사용자 요청: 작업",
+        "그룹 실행 시작: [g1] 설명",
+        "  - 실행 결과 (a): 1",
+        "  - 실행 결과 (b): 2",
+        "  - 실행 결과 (c): 3",
+        "그룹 실행 완료: [g1]",
+    ]
+
+    def test_heuristic(self):
+        assert _likely_final_turn(self.DONE_HISTORY)
+        assert not _likely_final_turn(self.DONE_HISTORY[:-2] + ["그룹 실행 완료: [g1]"])
+        assert not _likely_final_turn(self.DONE_HISTORY[:-1])
+        assert not _likely_final_turn(
+            self.DONE_HISTORY[:-1] + ["  - 실행 오류 (d): x", "그룹 실행 완료: [g1]"]
+        )
+        assert not _likely_final_turn([])
+
+    def test_heuristic_ignores_error_label_in_result_body(self):
+        """결과 본문에 '실행 오류'가 들어 있어도 오류 줄로 보지 않음"""
+        history = self.DONE_HISTORY[:-1] + [
+            "  - 실행 결과 (grep): 로그에서 '실행 오류' 2건 발견",
+            "그룹 실행 완료: [g1]",
+        ]
+        assert _likely_final_turn(history)
+
+    def test_heuristic_only_looks_at_last_group(self):
+        """직전 그룹 구간만 본다 — 앞 그룹의 오류·결과는 세지 않음"""
+        earlier = [
+            "사용자 요청: 작업",
+            "그룹 실행 시작: [g0] 준비",
+            "  - 실행 오류 (x): 실패",
+            "  - 실행 결과 (y): 1",
+            "  - 실행 결과 (z): 2",
+            "그룹 실행 완료: [g0]",
+        ]
+        assert _likely_final_turn(earlier + self.DONE_HISTORY[1:])
+        assert not _likely_final_turn(earlier + [
+            "그룹 실행 시작: [g1] 설명",
+            "  - 실행 결과 (a): 1",
+            "그룹 실행 완료: [g1]",
+        ])
+
+    @pytest.mark.asyncio
+    async def test_speculative_answer_cancelled_when_plan_continues(self, sample_group):
+        """선행 요청한 최종 답변은 계획이 남아 있으면 취소된다"""
+        import asyncio
+        events = []
+
+        async def _final(*args, **kwargs):
+            events.append("final_start")
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                events.append("final_cancelled")
+                raise
+            return "끝"
+
+        async def _plan(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return [sample_group]
+
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm, \
+             patch("orchestrator.api.graph_manager") as mock_gm, \
+             patch("orchestrator.api.generate_execution_plan", new=_plan), \
+             patch("orchestrator.api.generate_final_answer", new=_final), \
+             patch("orchestrator.api.validate_execution_plan", side_effect=RuntimeError("skip")):
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_hm.load_conversation.return_value = {
+                "id": "c1", "history": list(self.DONE_HISTORY), "title": "t", "plan": [],
+            }
+            mock_gm.load_wisdom.return_value = []
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/decide_and_act", json={
+                    "conversation_id": "c1", "history": [],
+                })
+            await asyncio.sleep(0)
+            assert resp.json()["status"] == "PLAN_CONFIRMATION"
+            assert events == ["final_start", "final_cancelled"]
+
+    @pytest.mark.asyncio
+    async def test_speculative_answer_reused_when_plan_empty(self):
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm, \
+             patch("orchestrator.api.graph_manager") as mock_gm, \
+             patch("orchestrator.api.generate_execution_plan", new_callable=AsyncMock) as mock_plan, \
+             patch("orchestrator.api.generate_final_answer", new_callable=AsyncMock) as mock_final, \
+             patch("orchestrator.api.generate_title_for_conversation", new_callable=AsyncMock) as mock_title, \
+             patch("orchestrator.api.extract_keywords", new_callable=AsyncMock) as mock_kw, \
+             patch("orchestrator.api.detect_topic_split", new_callable=AsyncMock) as mock_topic:
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_hm.load_conversation.return_value = {
+                "id": "c1", "history": list(self.DONE_HISTORY), "title": "t", "plan": [],
+            }
+            mock_gm.load_wisdom.return_value = []
+            mock_plan.return_value = []
+            mock_final.return_value = "끝"
+            mock_title.return_value = "제목"
+            mock_kw.return_value = []
+            mock_topic.return_value = None
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/decide_and_act", json={
+                    "conversation_id": "c1", "history": [],
+                })
+            data = resp.json()
+            assert data["status"] == "FINAL_ANSWER"
+            assert data["message"] == "끝"
+            mock_final.assert_awaited_once()
+
+
+class TestWisdomContext:
+    @pytest.mark.asyncio
+    async def test_wisdom_sent_as_context_not_system_prompt(self, sample_group):
+        """누적 지식은 system_prompts가 아니라 requirements_content로 전달"""
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm, \
+             patch("orchestrator.api.graph_manager") as mock_gm, \
+             patch("orchestrator.api.generate_execution_plan", new_callable=AsyncMock) as mock_plan, \
+             patch("orchestrator.api.validate_execution_plan", side_effect=RuntimeError("skip")):
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_hm.load_conversation.return_value = {
+                "id": "c1", "history": ["사용자 요청: 작업"], "title": "t", "plan": [],
+            }
+            mock_gm.load_wisdom.return_value = [{"category": "tip", "content": "캐시 사용"}]
+            mock_plan.return_value = [sample_group]
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/decide_and_act", json={
+                    "conversation_id": "c1", "history": [],
+                })
+            assert resp.json()["status"] == "PLAN_CONFIRMATION"
+            kwargs = mock_plan.call_args.kwargs
+            assert "캐시 사용" in kwargs["requirements_content"]
+            assert not any("캐시 사용" in p for p in kwargs["system_prompts"])
+
 
 class TestExecuteGroup:
     @pytest.mark.asyncio
@@ -126,6 +521,150 @@ class TestExecuteGroup:
             assert resp.status_code == 200
             assert resp.json()["status"] == "STEP_EXECUTED"
 
+    @pytest.mark.asyncio
+    async def test_sync_tool_runs_off_event_loop_thread(self, sample_group):
+        """동기 도구는 이벤트 루프 스레드가 아닌 워커 스레드에서 실행"""
+        import threading
+        loop_thread = threading.get_ident()
+        seen = []
+
+        def _tool(**kwargs):
+            seen.append(threading.get_ident())
+            return "ok"
+
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm:
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_tr.ensure_tool_server_connected = AsyncMock()
+            mock_hm.load_conversation.return_value = {
+                "id": "test-id",
+                "history": ["사용자 요청: test"],
+                "plan": [sample_group.model_dump()],
+                "title": "test"
+            }
+            mock_tr.get_tool.return_value = _tool
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/execute_group", json={
+                    "conversation_id": "test-id",
+                    "history": []
+                })
+            assert resp.json()["status"] == "STEP_EXECUTED"
+            assert seen and seen[0] != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_repeated_tool_looked_up_once(self):
+        """같은 도구가 반복되면 레지스트리 조회는 1회"""
+        group = ExecutionGroup(
+            group_id="g1", description="반복",
+            tasks=[ToolCall(tool_name="echo", arguments={"text": str(i)}) for i in range(3)],
+        )
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm:
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_tr.ensure_tool_server_connected = AsyncMock()
+            mock_tr.get_tool_providers.return_value = []
+            mock_hm.load_conversation.return_value = {
+                "id": "test-id", "history": [], "plan": [group.model_dump()], "title": "test",
+            }
+            mock_tr.get_tool.return_value = lambda **kwargs: kwargs["text"]
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/execute_group", json={
+                    "conversation_id": "test-id", "history": [],
+                })
+            assert resp.json()["status"] == "STEP_EXECUTED"
+            assert mock_tr.get_tool.call_count == 1
+            assert mock_tr.get_tool_providers.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_validation_error_reported_as_is(self):
+        """인자 검증 실패는 원래 ValueError 메시지로 이력에 기록"""
+        group = ExecutionGroup(
+            group_id="g1", description="검증",
+            tasks=[ToolCall(tool_name="echo", arguments={"text": "hi", "bad": 1})],
+        )
+
+        def echo(text: str):
+            return text
+
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm, \
+             patch("orchestrator.api.issue_tracker") as mock_it:
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_tr.ensure_tool_server_connected = AsyncMock()
+            mock_tr.get_tool_providers.return_value = []
+            mock_tr.get_tool.return_value = echo
+            mock_hm.load_conversation.return_value = {
+                "id": "test-id", "history": [], "plan": [group.model_dump()], "title": "test",
+            }
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/execute_group", json={
+                    "conversation_id": "test-id", "history": [],
+                })
+            data = resp.json()
+            assert data["status"] == "ERROR"
+            assert any("실행 오류 (echo)" in h and "허용되지 않은 인자" in h for h in data["history"])
+            # 검증 오류는 이슈로 수집하지 않음
+            mock_it.capture_exception.assert_not_called()
+            mock_it.capture.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_tool_error_captured_with_traceback(self, sample_group):
+        """도구 예외는 traceback과 함께 백그라운드로 이슈 기록"""
+        import asyncio
+        from orchestrator.api import _BACKGROUND_TASKS
+
+        def _boom(**kwargs):
+            raise RuntimeError("boom")
+
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm, \
+             patch("orchestrator.api.issue_tracker") as mock_it:
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_tr.ensure_tool_server_connected = AsyncMock()
+            mock_tr.get_tool_providers.return_value = []
+            mock_tr.get_tool.return_value = _boom
+            mock_hm.load_conversation.return_value = {
+                "id": "test-id", "history": [], "plan": [sample_group.model_dump()], "title": "test",
+            }
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/execute_group", json={
+                    "conversation_id": "test-id", "history": [],
+                })
+            assert resp.json()["status"] == "ERROR"
+            await asyncio.gather(*list(_BACKGROUND_TASKS))
+            kwargs = mock_it.capture.call_args.kwargs
+            assert kwargs["error_type"] == "RuntimeError"
+            assert "_boom" in kwargs["traceback"]
+
+    @pytest.mark.asyncio
+    async def test_issue_capture_dropped_when_backlog_full(self, caplog):
+        """대기 중인 이슈 기록이 상한에 도달하면 새 이슈는 기록하지 않고 경고만 남김"""
+        from orchestrator import api
+
+        with patch("orchestrator.api.issue_tracker") as mock_it, \
+             patch.object(api, "ISSUE_CAPTURE_MAX_PENDING", 0), \
+             caplog.at_level(logging.WARNING):
+            api._capture_issue(RuntimeError("boom"), context="ctx", source="test")
+        assert not api._PENDING_ISSUES
+        mock_it.capture.assert_not_called()
+        assert "이슈 기록 대기열" in caplog.text
+
     @pytest.mark.asyncio
     async def test_missing_tool_returns_error(self, sample_group):
         """도구를 찾을 수 없을 때 ERROR 반환"""
@@ -177,6 +716,89 @@ class TestExecuteGroup:
             assert resp.status_code == 400
 
 
+class TestPipelineExecute:
+    @pytest.mark.asyncio
+    async def test_tasks_run_concurrently_in_order(self):
+        """그룹 내 태스크는 동시에 실행되고 이력은 태스크 순서대로 기록"""
+        import asyncio
+        running = []
+        peak = []
+
+        def _tool(name):
+            async def _fn(**kwargs):
+                running.append(name)
+                peak.append(len(running))
+                await asyncio.sleep(0.05)
+                running.remove(name)
+                return name
+            return _fn
+
+        group = ExecutionGroup(
+            group_id="g1", description="병렬",
+            tasks=[ToolCall(tool_name="a", arguments={}), ToolCall(tool_name="b", arguments={})],
+        )
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm, \
+             patch("orchestrator.api.mcp_db_manager"), \
+             patch("orchestrator.api.pipeline_manager"), \
+             patch("orchestrator.api.pipeline_db") as mock_pdb:
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_tr.ensure_tool_server_connected = AsyncMock()
+            tools = {"a": _tool("a"), "b": _tool("b")}
+            mock_tr.get_tool.side_effect = tools.get
+            mock_hm.load_conversation.return_value = {
+                "id": "p1", "history": [], "plan": [group.model_dump()], "title": "t",
+            }
+            mock_pdb.get_cursor.return_value = None
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/pipeline/execute", json={
+                    "conversation_id": "p1", "history": [],
+                })
+            data = resp.json()
+            assert data["status"] == "STEP_EXECUTED"
+            assert max(peak) == 2
+            results = [h for h in data["history"] if "실행 결과" in h]
+            assert results == ["  - 실행 결과 (a): a", "  - 실행 결과 (b): b"]
+
+    @pytest.mark.asyncio
+    async def test_template_fail_counted_per_failed_task(self):
+        """실패한 태스크 수만큼 템플릿 실패 횟수 증가, 커서는 한 번만 조회"""
+        def _boom(**kwargs):
+            raise RuntimeError("boom")
+
+        group = ExecutionGroup(
+            group_id="g1", description="실패",
+            tasks=[ToolCall(tool_name="x", arguments={}), ToolCall(tool_name="x", arguments={})],
+        )
+        with patch("orchestrator.api.tool_registry") as mock_tr, \
+             patch("orchestrator.api.history_manager") as mock_hm, \
+             patch("orchestrator.api.mcp_db_manager"), \
+             patch("orchestrator.api.pipeline_manager"), \
+             patch("orchestrator.api.pipeline_db") as mock_pdb:
+
+            mock_tr.initialize = AsyncMock()
+            mock_tr.shutdown = AsyncMock()
+            mock_tr.ensure_tool_server_connected = AsyncMock()
+            mock_tr.get_tool.return_value = _boom
+            mock_hm.load_conversation.return_value = {
+                "id": "p1", "history": [], "plan": [group.model_dump()], "title": "t",
+            }
+            mock_pdb.get_cursor.return_value = {"plan_id": 7}
+
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                resp = await ac.post("/agent/pipeline/execute", json={
+                    "conversation_id": "p1", "history": [],
+                })
+            assert resp.json()["status"] == "ERROR"
+            assert mock_pdb.increment_template_fail.call_count == 2
+            assert mock_pdb.get_cursor.call_count == 1
+
+
 # ── TestValidateRequirementPath ───────────────────────────────────
 
 class TestValidateRequirementPath:
@@ -218,6 +840,123 @@ class TestValidateRequirementPath:
 
 # ── TestValidateToolArguments ─────────────────────────────────────
 
+class TestConversationCache:
+    def test_hit_when_revision_unchanged_and_write_through(self):
+        from . import api
+        api._CONV_CACHE.pop("cc", None)
+        with patch("orchestrator.api.history_manager") as mock_hm:
+            mock_hm.get_revision.return_value = (3, "t0")
+            mock_hm.load_conversation.return_value = {
+                "id": "cc", "history": ["a"], "plan": [], "title": "T",
+                "revision": 3, "created_at": "t0",
+            }
+            first = api._load_conversation("cc")
+            first["history"].append("수정")  # 호출자 수정이 캐시에 반영되면 안 됨
+            second = api._load_conversation("cc")
+            assert second["history"] == ["a"]
+            assert mock_hm.load_conversation.call_count == 1
+
+            # 저장 후 DB revision이 4가 되면 저장 내용이 그대로 적중
+            api._save_conversation("cc", ["a", "b"], "T2", [], 0, is_final=False)
+            mock_hm.get_revision.return_value = (4, "t0")
+            third = api._load_conversation("cc")
+            assert third["history"] == ["a", "b"]
+            assert third["title"] == "T2"
+            assert mock_hm.load_conversation.call_count == 1
+
+            # 다른 경로의 저장이 끼어들어 revision이 건너뛰면 다시 읽는다
+            mock_hm.get_revision.return_value = (6, "t0")
+            api._load_conversation("cc")
+            assert mock_hm.load_conversation.call_count == 2
+        api._CONV_CACHE.pop("cc", None)
+
+    def test_plan_groups_kept_with_plan_and_cleared_on_next_save(self, sample_group):
+        from . import api
+        api._CONV_CACHE.pop("pg", None)
+        with patch("orchestrator.api.history_manager") as mock_hm:
+            mock_hm.get_revision.return_value = (1, "t0")
+            mock_hm.load_conversation.return_value = {
+                "id": "pg", "history": [], "plan": [], "title": "T",
+                "revision": 1, "created_at": "t0",
+            }
+            api._load_conversation("pg")
+            api._save_conversation(
+                "pg", [], "T", [sample_group.model_dump()], 0, plan_groups=[sample_group],
+            )
+            mock_hm.get_revision.return_value = (2, "t0")
+            assert api._load_conversation("pg")["plan_groups"][0] is sample_group
+
+            api._save_conversation("pg", [], "T", [], 0)
+            mock_hm.get_revision.return_value = (3, "t0")
+            assert api._load_conversation("pg")["plan_groups"] is None
+        api._CONV_CACHE.pop("pg", None)
+
+
+    def test_bounded_and_evicted_entry_rereads_db(self):
+        """상한을 넘으면 가장 오래 쓰이지 않은 대화를 버리고, 다음 로드는 DB에서 다시 읽음"""
+        from . import api
+        with patch("orchestrator.api.history_manager") as mock_hm, \
+             patch.dict(api._CONV_CACHE, clear=True), \
+             patch.object(api, "CONV_CACHE_MAX_ENTRIES", 2):
+            mock_hm.get_revision.return_value = (1, "t0")
+            mock_hm.load_conversation.side_effect = lambda cid: {
+                "id": cid, "history": [], "plan": [], "title": "T",
+                "revision": 1, "created_at": "t0",
+            }
+            api._load_conversation("a")
+            api._load_conversation("b")
+            api._load_conversation("a")  # 적중 — a가 가장 최근으로 이동
+            assert mock_hm.load_conversation.call_count == 2
+            api._load_conversation("c")  # b 제거
+            assert list(api._CONV_CACHE) == ["a", "c"]
+
+            # 제거된 b는 revision 확인 후 DB에서 다시 읽어 캐시에 들어감
+            assert api._load_conversation("b")["id"] == "b"
+            assert mock_hm.load_conversation.call_count == 4
+            assert list(api._CONV_CACHE) == ["c", "b"]
+
+    def test_concurrent_loads_and_saves_stay_bounded(self):
+        """여러 워커 스레드가 동시에 로드/저장해도 예외 없이 상한을 지킴"""
+        from concurrent.futures import ThreadPoolExecutor
+        from . import api
+        with patch("orchestrator.api.history_manager") as mock_hm, \
+             patch.dict(api._CONV_CACHE, clear=True), \
+             patch.object(api, "CONV_CACHE_MAX_ENTRIES", 4):
+            mock_hm.get_revision.side_effect = lambda cid: (1, "t0")
+            mock_hm.load_conversation.side_effect = lambda cid: {
+                "id": cid, "history": [], "plan": [], "title": "T",
+                "revision": 1, "created_at": "t0",
+            }
+            mock_hm.save_conversation.side_effect = lambda cid, *a, **k: cid
+
+            def work(i):
+                cid = f"c{i % 16}"
+                api._load_conversation(cid)
+                api._save_conversation(cid, ["h"], "T", [], 0)
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(work, range(400)))
+            assert len(api._CONV_CACHE) <= 4
+
+
+class TestReadRequirements:
+    @pytest.mark.asyncio
+    async def test_reads_in_order_and_warns_on_failure(self, tmp_path):
+        from .api import _read_requirements
+        a = tmp_path / "a.md"
+        a.write_text("AAA", encoding="utf-8")
+        b = tmp_path / "b.md"
+        b.write_text("BBB", encoding="utf-8")
+        history = []
+        content = await _read_requirements(
+            [str(a), str(tmp_path / "missing.md"), str(b)], history
+        )
+        assert content.index("AAA") < content.index("BBB")
+        assert content.startswith("--- a.md ---\n")
+        assert len(history) == 1
+        assert "missing.md" in history[0]
+
+
 class TestValidateToolArguments:
     def test_valid_args_pass(self):
         def my_tool(path: str, recursive: bool = False):
@@ -240,6 +979,18 @@ class TestValidateToolArguments:
             pass
         _validate_tool_arguments(my_tool, "my_tool", {"a": "x", "b": 1, "c": 2.0})
 
+    def test_spec_cached_and_kwargs_skipped(self):
+        def my_tool(path: str):
+            pass
+
+        def kw_tool(**kwargs):
+            pass
+
+        assert _get_tool_spec(my_tool) == frozenset({"path"})
+        assert _TOOL_SPEC_CACHE[my_tool] == frozenset({"path"})
+        assert _get_tool_spec(kw_tool) is None
+        _validate_tool_arguments(kw_tool, "kw_tool", {"anything": 1})
+
     def test_invalid_args_blocked_in_execute_group(self, sample_group):
         """execute_group에서 허용되지 않은 인자 사용 시 ERROR 반환"""
         injected_group = ExecutionGroup(
@@ -301,6 +1052,12 @@ class TestPruneHistory:
         assert result[-1] == f"항목 {MAX_HISTORY_ENTRIES + 9}"
         assert result[0] == f"항목 10"
 
+    def test_prunes_in_place(self):
+        history = [f"항목 {i}" for i in range(MAX_HISTORY_ENTRIES + 5)]
+        result = _prune_history(history)
+        assert result is history
+        assert len(history) == MAX_HISTORY_ENTRIES
+
     def test_empty_history_unchanged(self):
         assert _prune_history([]) == []
 
@@ -338,9 +1095,76 @@ class TestExtractFirstQuery:
         assert _extract_first_query(history) == "유효한 요청"
 
 
+# ── TestConstructGroup ────────────────────────────────────────────
+
+class TestConstructGroup:
+    def test_round_trip_matches_validated_model(self, sample_group):
+        dumped = _PLAN_ADAPTER.dump_python([sample_group])
+        assert dumped == [sample_group.model_dump()]
+        rebuilt = _construct_group(dumped[0])
+        assert rebuilt.group_id == "group_1"
+        assert isinstance(rebuilt.tasks[0], ToolCall)
+        assert rebuilt.tasks[0].arguments == {"text": "hi"}
+        assert rebuilt.model_dump() == sample_group.model_dump()
+
+
+# ── TestStringifyResult ───────────────────────────────────────────
+
+class TestStringifyResult:
+    def test_str_returned_as_is(self):
+        assert _stringify_result("abc") == "abc"
+
+    def test_dict_and_list_as_compact_json(self):
+        assert _stringify_result({"a": [1, "한"]}) == '{"a":[1,"한"]}'
+        assert _stringify_result({1: "x"}) == '{"1":"x"}'
+
+    def test_unserializable_falls_back_to_str(self):
+        assert _stringify_result([{1, 2}]) == str([{1, 2}])
+        assert _stringify_result(42) == "42"
+
+    def test_limit_caps_output_at_limit_plus_one(self):
+        assert _stringify_result("abcdef", 3) == "abcd"
+        assert _stringify_result({"a": [1, "한"]}, 100) == '{"a":[1,"한"]}'
+        assert _stringify_result(b"abcdef", 3) == "b'ab"
+        assert _stringify_result(123456, 3) == "1234"
+
+    def test_limit_stops_serializing_before_tail(self):
+        """상한 이후 요소는 직렬화하지 않음 — 뒤쪽의 직렬화 불가 값도 건드리지 않는다"""
+        result = ["x" * 50, {1, 2}]
+        assert _stringify_result(result, 10) == '["xxxxxxxxx'
+
+
+# ── TestIsCoroutineTool ───────────────────────────────────────────
+
+class TestIsCoroutineTool:
+    def test_result_cached_per_function(self):
+        async def a_tool():
+            return 1
+
+        def s_tool():
+            return 1
+
+        assert _is_coroutine_tool(a_tool) is True
+        assert _is_coroutine_tool(s_tool) is False
+        assert _COROUTINE_CACHE[a_tool] is True
+        assert _COROUTINE_CACHE[s_tool] is False
+
+    def test_non_weakrefable_callable_not_cached(self):
+        assert _is_coroutine_tool(len) is False
+
+
 # ── TestResultTruncationWarning ───────────────────────────────────
 
 class TestResultTruncationWarning:
+    def test_summarize_marks_truncation(self, caplog):
+        from .constants import MAX_TOOL_RESULT_LENGTH
+        assert _summarize_tool_result("t", "짧음") == "짧음"
+        with caplog.at_level(logging.WARNING):
+            out = _summarize_tool_result("t", {"k": "x" * (MAX_TOOL_RESULT_LENGTH * 5)})
+        assert out.endswith("... (결과가 너무 길어 잘림)")
+        assert len(out) == MAX_TOOL_RESULT_LENGTH + len("... (결과가 너무 길어 잘림)")
+        assert any("알 수 없음" in r.message for r in caplog.records)
+
     @pytest.mark.asyncio
     async def test_truncation_logs_warning(self, sample_group, caplog):
         """도구 결과가 1000자 초과 시 WARNING 로그 발생"""
@@ -381,3 +1205,59 @@ class TestResultTruncationWarning:
         assert resp.status_code == 200
         assert resp.json()["status"] == "STEP_EXECUTED"
         assert any("1500자" in r.message for r in caplog.records)
+
+    @pytest.mark.asyncio
+    async def test_truncated_result_spilled_to_file(self, artifacts_dir, tmp_path):
+        """잘린 결과는 전체 내용을 파일로 보관하고 이력에 상대 경로를 남김"""
+        from orchestrator.api import _summarize_or_spill
+        from .constants import MAX_TOOL_RESULT_LENGTH
+
+        assert await _summarize_or_spill("c/../1", "t", "짧음") == "짧음"
+        assert not artifacts_dir.exists()
+
+        full = "가" * (MAX_TOOL_RESULT_LENGTH * 3)
+        out = await _summarize_or_spill("c/../1", "big/tool", full)
+        assert "... (결과가 너무 길어 잘림) (전체 결과: artifacts" in out
+        rel_path = out.rsplit("(전체 결과: ", 1)[1].rstrip(")")
+        saved = tmp_path / rel_path
+        # 경로 구분자가 들어간 ID도 artifacts 밖으로 나가지 않음
+        assert saved.parent.parent == artifacts_dir
+        assert saved.read_text(encoding="utf-8") == full
+
+    def test_spill_prunes_oldest_artifacts(self, artifacts_dir):
+        """보관 파일 수가 상한을 넘으면 오래된 파일과 빈 대화 디렉토리를 삭제"""
+        from orchestrator.api import _spill_tool_result
+
+        old_dir = artifacts_dir / "old"
+        old_dir.mkdir(parents=True)
+        for i in range(3):
+            f = old_dir / f"t_{i}.txt"
+            f.write_text("x")
+            os.utime(f, (1000 + i, 1000 + i))
+
+        with patch("orchestrator.api.ARTIFACTS_MAX_FILES", 2):
+            rel = _spill_tool_result("new", "t", "전체")
+        assert rel is not None
+        remaining = sorted(p.name for p in artifacts_dir.rglob("*.txt"))
+        assert len(remaining) == 2
+        assert "t_2.txt" in remaining
+        assert (artifacts_dir / "new").exists()
+
+        with patch("orchestrator.api.ARTIFACTS_MAX_FILES", 1):
+            _spill_tool_result("new", "t", "전체")
+        assert not old_dir.exists()
+
+    def test_spill_below_cap_does_not_walk(self, artifacts_dir):
+        """처음 한 번 센 뒤에는 상한을 넘기 전까지 디렉토리를 다시 훑지 않음"""
+        from orchestrator import api
+
+        with patch("orchestrator.api.ARTIFACTS_MAX_FILES", 3), \
+             patch("orchestrator.api.os.walk", wraps=os.walk) as walk:
+            for _ in range(3):
+                api._spill_tool_result("c", "t", "전체")
+            assert walk.call_count == 1
+            assert api._ARTIFACT_COUNT == 3
+            # 상한 초과 시에만 다시 훑어 정리
+            api._spill_tool_result("c", "t", "전체")
+            assert walk.call_count == 2
+        assert len(list(artifacts_dir.rglob("*.txt"))) == 3
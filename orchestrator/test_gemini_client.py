@@ -34,9 +34,36 @@ class TestTruncateHistory:
         result = gc._truncate_history(history, max_chars=100)
         assert "a" in result
 
+    def test_first_user_request_pinned_when_truncated(self):
+        """예산 초과 시에도 최초 사용자 요청은 맨 앞에 유지"""
+        history = ["사용자 요청: 목표"] + [f"  - 실행 결과 (t): {'x' * 90}" for _ in range(20)]
+        result = gc._truncate_history(history, max_chars=500)
+        assert result.startswith("사용자 요청: 목표\n... (이전 기록 생략) ...")
+        assert result.endswith(history[-1])
+
+    def test_tool_echo_lines_dropped_when_truncated(self):
+        """예산 초과 시 '  - 도구 실행:' 줄은 생략"""
+        history = ["사용자 요청: 목표"]
+        for i in range(10):
+            history += [f"  - 도구 실행: t{i} (인자: {{}})", f"  - 실행 결과 (t{i}): {'y' * 50}"]
+        result = gc._truncate_history(history, max_chars=300)
+        assert "도구 실행" not in result
+        assert "실행 결과 (t9)" in result
+
+    def test_shared_across_providers(self):
+        """세 프로바이더가 같은 축약 함수를 사용"""
+        from . import claude_client, ollama_client, llm_client
+        assert gc._truncate_history is llm_client.truncate_history
+        assert claude_client._truncate_history is llm_client.truncate_history
+        assert ollama_client._truncate_history is llm_client.truncate_history
+
     def test_default_max_chars_is_constant(self):
-        """기본 max_chars가 DEFAULT_HISTORY_MAX_CHARS 상수와 일치"""
-        assert gc.DEFAULT_HISTORY_MAX_CHARS == 6000
+        """기본 max_chars가 constants.HISTORY_MAX_CHARS와 일치"""
+        import inspect
+        from .constants import HISTORY_MAX_CHARS
+        assert HISTORY_MAX_CHARS == 6000
+        default = inspect.signature(gc._truncate_history).parameters["max_chars"].default
+        assert default == HISTORY_MAX_CHARS
 
 
 class TestGetModelName:
@@ -18,6 +18,8 @@ from orchestrator.graph_manager import (
     delete_conversation,
     delete_group,
     delete_topic,
+    get_conversation_revision,
+    get_db,
     get_linked_conversations,
     get_or_create_keyword,
     init_db,
@@ -144,6 +146,64 @@ class TestConversationCRUD:
     def test_delete_nonexistent_returns_false(self, db):
         assert not delete_conversation("ghost", db)
 
+    def test_revision_bumps_on_save(self, db):
+        assert get_conversation_revision("rev", db) is None
+        save_conversation("rev", ["a"], "T", [], 0, False, db)
+        rev0, created = get_conversation_revision("rev", db)
+        save_conversation("rev", ["a", "b"], "T", [], 0, False, db)
+        assert get_conversation_revision("rev", db) == (rev0 + 1, created)
+        assert load_conversation("rev", db)["revision"] == rev0 + 1
+
+    def test_get_db_reuses_connection_per_thread(self, tmp_path):
+        """같은 스레드는 연결을 재사용하고, 중첩 호출은 별도 연결을 사용"""
+        db = tmp_path / "pool.db"
+        with get_db(db) as outer:
+            with get_db(db) as inner:
+                assert inner is not outer
+        with get_db(db) as again:
+            assert again is inner  # 먼저 반납된 연결을 재사용
+
+    def test_pool_bounded_and_close_all(self, tmp_path):
+        """스레드당 경로 수를 넘으면 오래된 연결을 닫고, close_all 이후에는 새 연결을 사용"""
+        import sqlite3
+        import orchestrator.graph_manager as gm
+        conns = []
+        for i in range(gm._POOL_MAX_PER_THREAD + 1):
+            with get_db(tmp_path / f"p{i}.db") as conn:
+                conns.append(conn)
+        with pytest.raises(sqlite3.ProgrammingError):
+            conns[0].execute("SELECT 1")
+
+        last = conns[-1]
+        gm.close_all()
+        with pytest.raises(sqlite3.ProgrammingError):
+            last.execute("SELECT 1")
+        with get_db(tmp_path / f"p{gm._POOL_MAX_PER_THREAD}.db") as conn:
+            assert conn is not last
+            assert conn.execute("SELECT 1").fetchone()[0] == 1
+
+    def test_history_stored_as_json_text(self, db):
+        history = ["사용자 요청: 한글", "  - 실행 결과 (t): {'a': 1}"]
+        plan = [{"group_id": "g", "tasks": [{"arguments": {"k": "값"}}]}]
+        save_conversation("js", history, "T", plan, 0, False, db)
+        import sqlite3
+        conn = sqlite3.connect(str(db))
+        row = conn.execute(
+            "SELECT typeof(history), history, typeof(plan), plan FROM conversations WHERE id='js'"
+        ).fetchone()
+        conn.close()
+        assert row[0] == "text" and row[2] == "text"
+        assert json.loads(row[1]) == history
+        assert json.loads(row[3]) == plan
+        loaded = load_conversation("js", db)
+        assert loaded["history"] == history and loaded["plan"] == plan
+
+    def test_first_user_query_kept_after_first_save(self, db):
+        save_conversation("fq", ["a"], "T", [], 0, False, db, first_user_query="처음 요청")
+        save_conversation("fq", ["a", "b"], "T", [], 0, False, db, first_user_query="두번째")
+        save_conversation("fq", ["a", "b", "c"], "T", [], 0, False, db)
+        assert load_conversation("fq", db)["first_user_query"] == "처음 요청"
+
 
 # ─────────────────────────────────────────────────────────────────
 class TestGroupCRUD:
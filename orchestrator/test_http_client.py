@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# orchestrator/test_http_client.py
+"""http_client 단위 테스트."""
+
+import pytest
+
+from . import http_client
+
+
+class TestHttpClientCache:
+    @pytest.mark.asyncio
+    async def test_separate_client_per_name(self):
+        a = http_client.get_http_client("a", 10)
+        b = http_client.get_http_client("b", 20)
+        assert a is not b
+        assert http_client.get_http_client("a", 10) is a
+        await http_client.close_http_clients()
+
+    @pytest.mark.asyncio
+    async def test_close_http_clients_closes_all_providers(self):
+        from . import claude_client, ollama_client
+        claude = claude_client._http_client()
+        ollama = ollama_client._http_client()
+        await http_client.close_http_clients()
+        assert claude.is_closed and ollama.is_closed
+        assert len(http_client._HTTP_CLIENTS) == 0
+        # 종료 후 다시 호출하면 새 클라이언트를 만든다
+        again = ollama_client._http_client()
+        assert again is not ollama
+        await again.aclose()
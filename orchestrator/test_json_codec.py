@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# orchestrator/test_json_codec.py
+"""json_codec 단위 테스트."""
+
+from types import MappingProxyType
+
+from . import json_codec
+
+
+class TestJsonCodec:
+    def test_roundtrip_unicode(self):
+        data = [{"step": "한글", "n": 1}]
+        assert json_codec.loads(json_codec.dumps(data)) == data
+        assert "한글" in json_codec.dumps(data)
+
+    def test_non_str_keys_fall_back_to_stdlib(self):
+        assert json_codec.loads(json_codec.dumps({1: "a"})) == {"1": "a"}
+
+    def test_stdlib_only(self, monkeypatch):
+        monkeypatch.setattr(json_codec, "orjson", None)
+        assert json_codec.dumps(["가"]) == '["가"]'
+        assert json_codec.loads('["가"]') == ["가"]
+
+    def test_empty_list_shortcut(self):
+        assert json_codec.dumps([]) == "[]"
+
+    def test_read_only_mapping(self, monkeypatch):
+        frozen = (MappingProxyType({"k": ("v",)}),)
+        assert json_codec.loads(json_codec.dumps(frozen)) == [{"k": ["v"]}]
+        monkeypatch.setattr(json_codec, "orjson", None)
+        assert json_codec.loads(json_codec.dumps(frozen)) == [{"k": ["v"]}]
+
+    def test_shared_by_both_managers(self):
+        from . import agent_config_manager, graph_manager
+        assert agent_config_manager._dumps is json_codec.dumps
+        assert graph_manager._dumps is json_codec.dumps
+        assert graph_manager._loads is json_codec.loads
@@ -24,6 +24,7 @@ from orchestrator.mcp_db_manager import (
     list_functions,
     load_module_in_memory,
     log_usage,
+    log_usage_bulk,
     register_function,
     run_function_tests,
     update_function_test_code,
@@ -299,6 +300,34 @@ class TestLogUsage:
         assert func_names.count("dupfunc") == 1
 
 
+    def test_bulk_records_all_in_order(self, db):
+        register_function("bulk_a", "g", "def bulk_a(): pass", db_path=db)
+        sid = start_session(db_path=db)
+        log_usage_bulk([
+            {"func_name": "bulk_a", "success": True, "session_id": sid, "duration_ms": 5},
+            {"func_name": "bulk_b", "success": False, "session_id": sid,
+             "error_message": "boom", "args_summary": "x,y"},
+            {"func_name": "bulk_a", "success": True, "session_id": sid},
+        ], db_path=db)
+
+        conn = sqlite3.connect(str(db))
+        rows = conn.execute(
+            "SELECT func_name, func_version, success, error_message, args_summary "
+            "FROM mcp_usage_log WHERE session_id = ? ORDER BY id", (sid,)
+        ).fetchall()
+        names = json.loads(conn.execute(
+            "SELECT func_names FROM mcp_session_log WHERE id = ?", (sid,)
+        ).fetchone()[0])
+        conn.close()
+        assert [r[0] for r in rows] == ["bulk_a", "bulk_b", "bulk_a"]
+        assert rows[0][1] == 1 and rows[1][1] == 0
+        assert rows[1][2:] == (0, "boom", "x,y")
+        assert names == ["bulk_a", "bulk_b"]
+
+    def test_bulk_empty_is_noop(self, db):
+        log_usage_bulk([], db_path=db)
+
+
 # ── TestGetUsageStats ─────────────────────────────────────────────
 
 class TestGetUsageStats:
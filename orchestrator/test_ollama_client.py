@@ -18,6 +18,30 @@ def _patch_chat(content: str):
     )
 
 
+# ── _http_client ──────────────────────────────────────────────────
+
+class TestHttpClient:
+    @pytest.mark.asyncio
+    async def test_reused_within_loop(self):
+        first = ollama_client._http_client()
+        assert ollama_client._http_client() is first
+        await first.aclose()
+        # 닫힌 클라이언트는 새로 만든다
+        second = ollama_client._http_client()
+        assert second is not first
+        await second.aclose()
+
+    def test_separate_client_per_loop(self):
+        import asyncio
+
+        async def _get():
+            client = ollama_client._http_client()
+            await client.aclose()
+            return client
+
+        assert asyncio.run(_get()) is not asyncio.run(_get())
+
+
 # ── generate_execution_plan ───────────────────────────────────────
 
 class TestGenerateExecutionPlan:
@@ -415,6 +415,35 @@ class TestClassifyIntent:
             )
         assert result == "task"
 
+    @pytest.mark.asyncio
+    async def test_repeated_query_served_from_cache(self):
+        """공백/대소문자만 다른 반복 쿼리는 LLM을 다시 호출하지 않음."""
+        from orchestrator import llm_client
+
+        mock_module = MagicMock()
+        mock_module.generate_final_answer = AsyncMock(return_value="chat")
+
+        with patch.dict(llm_client._INTENT_CACHE, clear=True), \
+             patch("orchestrator.llm_client._get_fallback_chain", return_value=["gemini"]), \
+             patch("orchestrator.llm_client._get_client_module", return_value=mock_module):
+            assert await llm_client.classify_intent("Hello  there") == "chat"
+            assert await llm_client.classify_intent(" hello there ") == "chat"
+        assert mock_module.generate_final_answer.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_fallback_default_not_cached(self):
+        """모든 provider 실패로 얻은 기본값은 캐시하지 않음."""
+        from orchestrator import llm_client
+
+        mock_module = MagicMock()
+        mock_module.generate_final_answer = AsyncMock(side_effect=RuntimeError("down"))
+
+        with patch.dict(llm_client._INTENT_CACHE, clear=True), \
+             patch("orchestrator.llm_client._get_fallback_chain", return_value=["gemini"]), \
+             patch("orchestrator.llm_client._get_client_module", return_value=mock_module):
+            assert await llm_client.classify_intent("hi") == "task"
+            assert llm_client._INTENT_CACHE == {}
+
 
 # ── P3-D: 온디맨드 MCP ──────────────────────────────────────────────────────
 
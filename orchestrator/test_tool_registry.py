@@ -45,6 +45,7 @@ class TestGetTool:
         tr.TOOLS.clear()
         tr.TOOL_DESCRIPTIONS.clear()
         tr._mcp_tools.clear()
+        tr._mcp_wrappers.clear()
 
     def test_local_tool(self):
         """로컬 도구 이름으로 함수 반환"""
@@ -66,6 +67,17 @@ class TestGetTool:
         assert result is not None
         assert callable(result)
 
+    def test_mcp_wrapper_reused_until_session_changes(self):
+        """같은 세션이면 wrapper를 재사용하고, 세션이 바뀌면 새로 만듦"""
+        s1, s2 = MagicMock(), MagicMock()
+        tr._mcp_tools["read_file"] = {
+            "session": s1, "server": "fs1", "description": "read", "input_schema": {},
+        }
+        first = tr.get_tool("read_file")
+        assert tr.get_tool("read_file") is first
+        tr._mcp_tools["read_file"]["session"] = s2
+        assert tr.get_tool("read_file") is not first
+
     def test_nonexistent_tool(self):
         """존재하지 않는 도구는 None 반환"""
         assert tr.get_tool("no_such_tool_xyz") is None
@@ -78,6 +90,7 @@ class TestToolProviders:
         tr._mcp_tools.clear()
         tr._tool_providers.clear()
         tr._tool_server_preferences.clear()
+        tr._mcp_wrappers.clear()
 
     def test_get_tool_providers_empty(self):
         """제공자가 없으면 빈 리스트"""
@@ -27,6 +27,8 @@ _mcp_tools: Dict[str, dict] = {}  # tool_name -> {"session": session, "descripti
 # 다중 제공자 추적
 _tool_providers: Dict[str, List[dict]] = {}  # tool_name -> [{"server": name, "session": session, "description": str}]
 _tool_server_preferences: Dict[str, str] = {}  # tool_name -> preferred server_name
+# MCP 호출 wrapper 캐시 — 호출마다 클로저를 새로 만들지 않고, 세션이 바뀌면(선호 서버 변경·재연결) 다시 생성
+_mcp_wrappers: Dict[str, tuple] = {}  # tool_name -> (session, wrapper)
 
 # P3-D: 온디맨드 MCP — 미연결 서버 설정 캐시 (server_name -> config)
 _on_demand_configs: Dict[str, dict] = {}
@@ -174,6 +176,7 @@ async def shutdown():
     _mcp_tools.clear()
     _tool_providers.clear()
     _tool_server_preferences.clear()
+    _mcp_wrappers.clear()
     _on_demand_configs.clear()
     _on_demand_tool_map.clear()
     logging.info("Tool registry shutdown complete")
@@ -243,6 +246,10 @@ def get_tool(name: str) -> Optional[Callable]:
         if session is None:
             session = _mcp_tools[resolved_name]["session"]
 
+        cached = _mcp_wrappers.get(resolved_name)
+        if cached is not None and cached[0] is session:
+            return cached[1]
+
         async def mcp_tool_wrapper(**kwargs):
             result = await session.call_tool(resolved_name, arguments=kwargs)
             # MCP 결과에서 텍스트 컨텐츠 추출
@@ -254,6 +261,7 @@ def get_tool(name: str) -> Optional[Callable]:
                 return "\n".join(texts) if texts else str(result.content)
             return str(result)
 
+        _mcp_wrappers[resolved_name] = (session, mcp_tool_wrapper)
         return mcp_tool_wrapper
 
     return None